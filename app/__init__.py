@@ -1,5 +1,7 @@
 # app/__init__.py
-from flask import Flask
+import hmac
+import random
+from flask import Flask, Response, g, request
 from app.config.config import Config
 from app.static_routes import static_bp
 import os
@@ -16,6 +18,7 @@ def create_app():
     from app.api.v1.ecs.routes import ecs_bp
     from app.api.v1.ebs.routes import ebs_bp
     from app.api.v1.dashboard.routes import dashboard_bp
+    from app.api.v1.jobs.routes import jobs_bp
     from app.static_routes import static_bp  # Add static routes blueprint
 
     # Register blueprints
@@ -24,8 +27,125 @@ def create_app():
     app.register_blueprint(ecs_bp, url_prefix='/api/v1/ecs')
     app.register_blueprint(ebs_bp, url_prefix='/api/v1/ebs')
     app.register_blueprint(dashboard_bp, url_prefix='/api/v1/dashboard')
+    app.register_blueprint(jobs_bp, url_prefix='/api/v1/jobs')
     app.register_blueprint(static_bp)  # Register static routes blueprint
     
+    # Strong ETags on API reads, so unchanged payloads are answered with 304
+    from app.utils.etag import make_conditional
+
+    @app.after_request
+    def add_etag(response):
+        if request.path.startswith('/api/v1/'):
+            return make_conditional(request, response)
+        return response
+
+    # Start the background inventory crawler
+    if app.config['CRAWLER_ENABLED']:
+        from app.services.inventory_crawler import inventory_crawler
+        inventory_crawler.start()
+
+    # Coordinate AWS calls of concurrent requests per account, region and service
+    if app.config['AWS_RATE_LIMIT_ENABLED']:
+        from app.utils.client_pool import client_pool
+        from app.utils.rate_limiter import aws_rate_limiter
+        client_pool.add_client_hook(aws_rate_limiter.attach)
+
+    # AWS API call metrics per route, served at /metrics and summarized per
+    # request in the X-AWS-Calls and X-AWS-Time-Ms headers
+    if app.config['METRICS_ENABLED']:
+        from app.utils import aws_call_metrics
+        from app.utils.client_pool import client_pool
+        from app.utils.prometheus import registry, CONTENT_TYPE
+        aws_call_metrics.install(client_pool)
+
+        @app.before_request
+        def begin_aws_call_metrics():
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            g.aws_call_metrics_token = aws_call_metrics.begin_request(route)
+
+        @app.after_request
+        def add_aws_call_headers(response):
+            stats = aws_call_metrics.current_request_stats()
+            if stats is not None:
+                response.headers['X-AWS-Calls'] = str(stats.calls)
+                response.headers['X-AWS-Time-Ms'] = f"{stats.time_ms:.1f}"
+            return response
+
+        @app.teardown_request
+        def end_aws_call_metrics(exc):
+            token = g.pop('aws_call_metrics_token', None)
+            if token is not None:
+                aws_call_metrics.end_request(token)
+
+        @app.route('/metrics')
+        def metrics():
+            return Response(registry.render(), content_type=CONTENT_TYPE)
+
+    # On-demand profiling of API requests
+    from app.utils.profiling import profile_store
+
+    def is_profiling_admin():
+        admin_token = app.config['PROFILING_ADMIN_TOKEN']
+        header = request.headers.get('X-Debug-Profile')
+        return bool(admin_token and header and hmac.compare_digest(header, admin_token))
+
+    @app.before_request
+    def begin_profile():
+        if not request.path.startswith('/api/'):
+            return
+        if is_profiling_admin():
+            trigger = 'header'
+        elif random.random() < app.config['PROFILING_SAMPLE_RATE']:
+            trigger = 'sample'
+        else:
+            return
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        g.profile = profile_store.begin(request.method, request.path, route, trigger)
+
+    def end_profile(status_code):
+        profile, token = g.pop('profile')
+        aws_stats = None
+        if app.config['METRICS_ENABLED']:
+            from app.utils.aws_call_metrics import current_request_stats
+            aws_stats = current_request_stats()
+        return profile_store.end(profile, token, status_code, aws_stats)
+
+    @app.after_request
+    def add_profile_header(response):
+        if 'profile' in g:
+            response.headers['X-Profile-Id'] = end_profile(response.status_code)
+        return response
+
+    @app.teardown_request
+    def end_failed_profile(exc):
+        # after_request does not run when the view raised
+        if 'profile' in g:
+            end_profile(500)
+
+    @app.route('/debug/profiles')
+    def list_profiles():
+        if not is_profiling_admin():
+            return {'error': 'Profiling admin token required'}, 403
+        return {'profiles': profile_store.list()}
+
+    @app.route('/debug/profiles/<profile_id>')
+    def get_profile(profile_id):
+        if not is_profiling_admin():
+            return {'error': 'Profiling admin token required'}, 403
+        report = profile_store.get(profile_id)
+        if report is None:
+            return {'error': 'Profile not found'}, 404
+
+        output_format = request.args.get('format', 'json')
+        if output_format == 'pstats':
+            return Response(
+                report['pstats'],
+                content_type='application/octet-stream',
+                headers={'Content-Disposition': f'attachment; filename=profile-{profile_id}.pstats'}
+            )
+        if output_format == 'text':
+            return Response(report['cpu_profile'], content_type='text/plain; charset=utf-8')
+        return {key: value for key, value in report.items() if key != 'pstats'}
 
     # Route debugging helper
     @app.route('/debug/routes')
@@ -2,6 +2,13 @@
 from flask import Blueprint, request, jsonify
 from flask_restful import Api, Resource
 from app.utils.auth_utils import AuthUtils
+from app.utils.session_store import session_store
+from app.services.s3_service import S3Service
+from app.services.ecs_service import ECSService
+from app.services.ebs_service import EBSService
+from app.services.inventory_crawler import inventory_crawler
+from app.services.account_fanout import validate_role_arns
+from app.config.config import Config
 
 auth_bp = Blueprint('auth', __name__)
 api = Api(auth_bp)
@@ -19,16 +26,52 @@ class LoginResource(Resource):
         aws_secret_access_key = data['aws_secret_access_key']
         aws_region = data.get('aws_region', 'us-west-2')  # Default to us-west-2 if not provided
         
+        # Optional roles in other accounts for multi-account views
         try:
-            # Generate token with all required parameters
+            role_arns = validate_role_arns(data.get('role_arns', []))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        
+        try:
+            # Create a session for the credentials and a token that only carries its ID;
+            # the inventory services are built now so the first request finds them ready
             token_info = AuthUtils.generate_token(
                 aws_access_key_id=aws_access_key_id,
                 aws_secret_access_key=aws_secret_access_key,
-                aws_region=aws_region
+                aws_region=aws_region,
+                prebuild=(S3Service, ECSService, EBSService),
+                role_arns=role_arns
             )
+            # Crawl this account in the background for as long as the token is valid
+            if Config.CRAWLER_ENABLED:
+                inventory_crawler.register(
+                    aws_access_key_id,
+                    aws_secret_access_key,
+                    aws_region,
+                    ttl_seconds=Config.TOKEN_EXPIRATION_MINUTES * 60
+                )
+            
             # Return dictionary directly, not wrapped in jsonify
             return token_info, 200
         except ValueError as e:
             return {'error': str(e)}, 401
 
-api.add_resource(LoginResource, '/login')
\ No newline at end of file
+class LogoutResource(Resource):
+    def post(self):
+        token = request.headers.get('Authorization')
+        
+        try:
+            # End the session; the token stops working immediately
+            session = AuthUtils.revoke_token(token)
+            
+            # Stop crawling with the credentials once no session uses them
+            aws_access_key_id = session.payload['aws_access_key_id']
+            aws_region = session.payload['aws_region']
+            if Config.CRAWLER_ENABLED and not session_store.has_sessions(aws_access_key_id, aws_region):
+                inventory_crawler.unregister(aws_access_key_id, aws_region)
+            return {'message': 'Logged out'}, 200
+        except ValueError as e:
+            return {'error': str(e)}, 401
+
+api.add_resource(LoginResource, '/login')
+api.add_resource(LogoutResource, '/logout')
\ No newline at end of file
@@ -1,62 +1,65 @@
 # app/api/v1/dashboard/routes.py
 
+import asyncio
 from flask import Blueprint, request
 from flask_restful import Api, Resource
 from app.services.s3_service import S3Service
 from app.services.ecs_service import ECSService
 from app.services.ebs_service import EBSService
 from app.services.dashboard_service import DashboardService
+from app.services.region_fanout import resolve_regions
+from app.services.account_fanout import get_accounts_summary
+from app.utils.async_views import AsyncResource
 from app.utils.auth_utils import AuthUtils
+from app.utils.concurrency import map_blocking, run_blocking
+from app.utils.cache import response_cache, cache_key, is_error_response
+from app.config.config import Config
 
 dashboard_bp = Blueprint('dashboard', __name__)
 api = Api(dashboard_bp)
 
-class DashboardOverviewResource(Resource):
-    def get(self):
+class DashboardOverviewResource(AsyncResource):
+    async def get(self):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
-            
-            # Create service clients with credentials from token
-            s3_service = S3Service(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
-            )
-            
-            ecs_service = ECSService(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            
+            # Reuse the session's services
+            s3_service = session.service(S3Service)
+            ecs_service = session.service(ECSService)
+            ebs_service = session.service(EBSService)
+            
+            # Gather S3, ECS and EBS inventory concurrently
+            s3_buckets, ecs_clusters, ebs_volumes = await asyncio.gather(
+                run_blocking(s3_service.list_buckets),
+                run_blocking(ecs_service.list_clusters),
+                run_blocking(ebs_service.list_volumes)
             )
             
-            ebs_service = EBSService(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
+            buckets = s3_buckets.get('buckets', [])
+            cluster_names = [cluster['cluster_name'] for cluster in ecs_clusters.get('clusters', [])]
+            
+            # Then the per-bucket and per-cluster details, with bounded concurrency;
+            # bucket details reuse the creation date and region already listed
+            s3_details, ecs_cluster_details = await asyncio.gather(
+                map_blocking(
+                    lambda bucket: s3_service.get_bucket_details(bucket['name'], bucket_info=bucket),
+                    buckets,
+                    Config.S3_BUCKET_CONCURRENCY
+                ),
+                map_blocking(ecs_service.get_cluster_details, cluster_names, Config.ECS_CLUSTER_CONCURRENCY)
             )
             
-            # Gather S3 insights
-            s3_buckets = s3_service.list_buckets()
-            s3_details = [s3_service.get_bucket_details(bucket) for bucket in s3_buckets]
-            
-            # Gather ECS insights
-            ecs_clusters = ecs_service.list_clusters()
-            ecs_cluster_details = [ecs_service.get_cluster_details(cluster) for cluster in ecs_clusters]
-            
-            # Gather EBS insights
-            ebs_volumes = ebs_service.list_volumes()
-            
             # Return dashboard data directly, no jsonify
             return {
                 's3': {
-                    'total_buckets': len(s3_buckets),
+                    'total_buckets': len(buckets),
                     'bucket_details': s3_details
                 },
                 'ecs': {
-                    'total_clusters': len(ecs_clusters),
+                    'total_clusters': len(cluster_names),
                     'cluster_details': ecs_cluster_details
                 },
                 'ebs': {
@@ -68,41 +71,41 @@ class DashboardOverviewResource(Resource):
         except ValueError as e:
             return {'error': str(e)}, 401
 
-class SecurityInsightsResource(Resource):
-    def get(self):
+class SecurityInsightsResource(AsyncResource):
+    async def get(self):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
-            
-            # Create service clients with credentials from token
-            s3_service = S3Service(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
-            )
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            
+            # Reuse the session's services
+            s3_service = session.service(S3Service)
+            ebs_service = session.service(EBSService)
             
-            ebs_service = EBSService(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
+            # List buckets and volumes concurrently, then fetch bucket details concurrently
+            s3_buckets, ebs_volumes = await asyncio.gather(
+                run_blocking(s3_service.list_buckets),
+                run_blocking(ebs_service.list_volumes)
+            )
+            buckets = s3_buckets.get('buckets', [])
+            all_bucket_details = await map_blocking(
+                lambda bucket: s3_service.get_bucket_details(bucket['name'], bucket_info=bucket),
+                buckets,
+                Config.S3_BUCKET_CONCURRENCY
             )
             
             # Analyze S3 bucket security
-            s3_buckets = s3_service.list_buckets()
             s3_security_analysis = []
             
-            for bucket in s3_buckets:
-                bucket_details = s3_service.get_bucket_details(bucket)
+            for bucket, bucket_details in zip(buckets, all_bucket_details):
                 security_status = {
-                    'bucket_name': bucket,
+                    'bucket_name': bucket['name'],
                     'encryption_status': 'Encrypted' if bucket_details.get('encryption', {}).get('enabled', False) else 'Not Encrypted',
                 }
                 s3_security_analysis.append(security_status)
             
             # Analyze EBS volume security
-            ebs_volumes = ebs_service.list_volumes()
             ebs_security_analysis = []
             
             for volume in ebs_volumes.get('volumes', []):
@@ -123,25 +126,55 @@ class SecurityInsightsResource(Resource):
         except ValueError as e:
             return {'error': str(e)}, 401
 
+def _is_complete_summary(summary):
+    """Return True if every section of a dashboard summary completed"""
+    if is_error_response(summary):
+        return False
+    sections = summary.get('sections', {})
+    return all(section.get('status') == 'completed' for section in sections.values())
+
 class DashboardSummaryResource(Resource):
     def get(self):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
-            
-            # Create dashboard service
-            dashboard_service = DashboardService(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            payload = session.payload
+            
+            # Reuse the session's dashboard service
+            dashboard_service = session.service(DashboardService)
+            
+            # regions=all|a,b,c adds up ECS and EBS across regions
+            regions = None
+            if request.args.get('regions'):
+                try:
+                    regions = resolve_regions(session, request.args.get('regions'))
+                except ValueError as e:
+                    return {'error': str(e)}, 400
+            
+            if session.role_arns:
+                # Sessions with role ARNs add up every account
+                key = cache_key(payload, 'dashboard.summary', regions=regions, role_arns=sorted(session.role_arns))
+                load = lambda: get_accounts_summary(session, regions)
+            elif regions:
+                regional_services = {region: session.service(DashboardService, region) for region in regions}
+                key = cache_key(payload, 'dashboard.summary', regions=regions)
+                load = lambda: dashboard_service.get_multi_region_summary(regional_services)
+            else:
+                key = cache_key(payload, 'dashboard.summary')
+                load = dashboard_service.get_summary
+            
+            # Get summary through the response cache; partial summaries are
+            # never stored so a timed-out section is retried on the next poll
+            result = response_cache.get_or_load(
+                key,
+                load,
+                ttl=Config.CACHE_TTLS['dashboard.summary'],
+                cacheable=_is_complete_summary
             )
             
-            # Get summary
-            summary = dashboard_service.get_summary()
-            
-            return summary, 200
+            return result.value, 200, result.headers()
         
         except ValueError as e:
             return {'error': str(e)}, 401
@@ -1,8 +1,11 @@
 # app/api/v1/ebs/routes.py
-from flask import Blueprint, request
+import json
+from flask import Blueprint, Response, request, stream_with_context
 from flask_restful import Api, Resource
 from app.services.ebs_service import EBSService
+from app.services.region_fanout import resolve_regions, fan_out_regions, merge_region_items
 from app.utils.auth_utils import AuthUtils
+from app.utils.cache import fetch_inventory
 from datetime import datetime, timedelta
 
 ebs_bp = Blueprint('ebs', __name__)
@@ -13,24 +16,57 @@ class EBSVolumesResource(Resource):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
-            
-            # Create EBS Service with credentials from token
-            ebs_service = EBSService(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
-            )
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            payload = session.payload
+            
+            # Reuse the session's EBS Service
+            ebs_service = session.service(EBSService)
+            
+            # Pagination and filters are passed straight through to DescribeVolumes
+            arguments = {}
+            filters = {
+                name: request.args.get(name)
+                for name in ('state', 'volume_type', 'availability_zone', 'encrypted', 'tag')
+                if request.args.get(name)
+            }
+            if filters:
+                arguments['filters'] = filters
+            limit = request.args.get('limit', type=int)
+            if limit is not None:
+                arguments['limit'] = limit
+                arguments['cursor'] = request.args.get('cursor')
+            
+            # regions=all|a,b,c lists every region concurrently and merges the volumes
+            if request.args.get('regions'):
+                if limit is not None:
+                    return {'error': 'limit and cursor cannot be combined with regions'}, 400
+                try:
+                    regions = resolve_regions(session, request.args.get('regions'))
+                except ValueError as e:
+                    return {'error': str(e)}, 400
+                
+                results, region_status = fan_out_regions(
+                    regions,
+                    lambda region: fetch_inventory(
+                        dict(payload, aws_region=region),
+                        'ebs.list_volumes',
+                        session.service(EBSService, region).list_volumes,
+                        arguments
+                    ).value
+                )
+                volumes = {'volumes': merge_region_items(results, 'volumes'), 'next_cursor': None}
+                return {'volumes': volumes, 'regions': region_status}, 200
             
-            # List EBS Volumes
-            volumes = ebs_service.list_volumes()
+            # List EBS Volumes from the latest snapshot or the response cache
+            result = fetch_inventory(payload, 'ebs.list_volumes', ebs_service.list_volumes, arguments)
+            volumes = result.value
             
             # Check if an error occurred
             if isinstance(volumes, dict) and 'error' in volumes:
                 return volumes, 400
                 
-            return {'volumes': volumes}, 200
+            return {'volumes': volumes}, 200, result.headers()
         
         except ValueError as e:
             return {'error': str(e)}, 401
@@ -40,8 +76,8 @@ class EBSVolumeMetricsResource(Resource):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
             
             # Parse query parameters with defaults
             period = request.args.get('period', default=3600, type=int)
@@ -53,19 +89,19 @@ class EBSVolumeMetricsResource(Resource):
             start_time = request.args.get('start_time', default=default_start)
             end_time = request.args.get('end_time', default=now.isoformat())
             
-            # Create EBS Service with credentials from token
-            ebs_service = EBSService(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
-            )
+            # Reuse the session's EBS Service
+            ebs_service = session.service(EBSService)
+            
+            # Optional comma-separated list of statistics, e.g. Average,Maximum,p99
+            stats = request.args.get('stats')
             
             # Get volume metrics
             metrics = ebs_service.get_volume_metrics(
                 volume_id=volume_id,
                 period=period,
                 start_time=start_time,
-                end_time=end_time
+                end_time=end_time,
+                stats=stats.split(',') if stats else None
             )
             
             # Check if an error occurred
@@ -77,6 +113,59 @@ class EBSVolumeMetricsResource(Resource):
         except ValueError as e:
             return {'error': str(e)}, 401
 
+class EBSFleetMetricsResource(Resource):
+    def get(self):
+        token = request.headers.get('Authorization')
+        
+        try:
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            
+            # Parse query parameters with defaults
+            period = request.args.get('period', default=3600, type=int)
+            stat = request.args.get('stat', default='Average')
+            include_datapoints = request.args.get('datapoints', default='false').lower() == 'true'
+            
+            # Handle time parameters
+            now = datetime.utcnow()
+            default_start = (now - timedelta(hours=24)).isoformat()
+            
+            start_time = request.args.get('start_time', default=default_start)
+            end_time = request.args.get('end_time', default=now.isoformat())
+            
+            # Either an explicit list of volumes or the list_volumes filters
+            volume_ids = request.args.get('volume_ids')
+            filters = {
+                name: request.args.get(name)
+                for name in ('state', 'volume_type', 'availability_zone', 'encrypted', 'tag')
+                if request.args.get(name)
+            }
+            
+            # Reuse the session's EBS Service
+            ebs_service = session.service(EBSService)
+            
+            results = ebs_service.iter_fleet_metrics(
+                volume_ids=volume_ids.split(',') if volume_ids else None,
+                filters=filters,
+                period=period,
+                start_time=start_time,
+                end_time=end_time,
+                stat=stat,
+                include_datapoints=include_datapoints
+            )
+            
+            # Invalid arguments are reported before the stream starts
+            if isinstance(results, dict):
+                return results, 400
+            
+            # Stream one JSON document per volume as each batch completes
+            lines = (json.dumps(result) + '\n' for result in results)
+            return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+        
+        except ValueError as e:
+            return {'error': str(e)}, 401
+
 # Register resources with API endpoints
 api.add_resource(EBSVolumesResource, '/volumes')
-api.add_resource(EBSVolumeMetricsResource, '/volumes/<string:volume_id>/metrics')
\ No newline at end of file
+api.add_resource(EBSVolumeMetricsResource, '/volumes/<string:volume_id>/metrics')
+api.add_resource(EBSFleetMetricsResource, '/metrics')
\ No newline at end of file
@@ -1,8 +1,11 @@
 # app/api/v1/ecs/routes.py
-from flask import Blueprint, request
+import json
+from flask import Blueprint, Response, request, stream_with_context
 from flask_restful import Api, Resource
 from app.services.ecs_service import ECSService
+from app.services.region_fanout import resolve_regions, fan_out_regions, merge_region_items
 from app.utils.auth_utils import AuthUtils
+from app.utils.cache import fetch_inventory
 
 ecs_bp = Blueprint('ecs', __name__)
 api = Api(ecs_bp)
@@ -12,19 +15,39 @@ class ECSClustersResource(Resource):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            payload = session.payload
             
-            # Create ECS Service with credentials from token
-            ecs_service = ECSService(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
-            )
+            # Reuse the session's ECS Service
+            ecs_service = session.service(ECSService)
             
-            # List ECS Clusters - return directly, no jsonify
-            clusters = ecs_service.list_clusters()
-            return {'clusters': clusters}, 200
+            # List ECS Clusters from the latest snapshot or the response cache - return directly, no jsonify
+            arguments = {}
+            if request.args.get('exact_counts', 'false').lower() == 'true':
+                arguments['exact_counts'] = True
+            
+            # regions=all|a,b,c lists every region concurrently and merges the clusters
+            if request.args.get('regions'):
+                try:
+                    regions = resolve_regions(session, request.args.get('regions'))
+                except ValueError as e:
+                    return {'error': str(e)}, 400
+                
+                results, region_status = fan_out_regions(
+                    regions,
+                    lambda region: fetch_inventory(
+                        dict(payload, aws_region=region),
+                        'ecs.list_clusters',
+                        session.service(ECSService, region).list_clusters,
+                        arguments
+                    ).value
+                )
+                clusters = {'clusters': merge_region_items(results, 'clusters')}
+                return {'clusters': clusters, 'regions': region_status}, 200
+            
+            result = fetch_inventory(payload, 'ecs.list_clusters', ecs_service.list_clusters, arguments)
+            return {'clusters': result.value}, 200, result.headers()
         
         except ValueError as e:
             return {'error': str(e)}, 401
@@ -34,15 +57,16 @@ class ECSClusterServicesResource(Resource):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            
+            # Reuse the session's ECS Service
+            ecs_service = session.service(ECSService)
             
-            # Create ECS Service with credentials from token
-            ecs_service = ECSService(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
-            )
+            # Stream services as newline-delimited JSON for very large clusters
+            if request.args.get('stream', 'false').lower() == 'true':
+                lines = (json.dumps(service) + '\n' for service in ecs_service.iter_services(cluster_name))
+                return Response(stream_with_context(lines), mimetype='application/x-ndjson')
             
             # List Services for specific cluster - return directly, no jsonify
             services = ecs_service.list_services(cluster_name)
@@ -56,15 +80,11 @@ class ECSClusterDetailsResource(Resource):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
             
-            # Create ECS Service with credentials from token
-            ecs_service = ECSService(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
-            )
+            # Reuse the session's ECS Service
+            ecs_service = session.service(ECSService)
             
             # Get detailed cluster information - return directly, no jsonify
             cluster_details = ecs_service.get_cluster_details(cluster_name)
@@ -0,0 +1,2 @@
+# This file can be left empty to mark the directory as a Python package
+
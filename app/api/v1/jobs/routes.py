@@ -0,0 +1,28 @@
+# app/api/v1/jobs/routes.py
+from flask import Blueprint, request
+from flask_restful import Api, Resource
+from app.utils.auth_utils import AuthUtils
+from app.utils.jobs import job_manager
+
+jobs_bp = Blueprint('jobs', __name__)
+api = Api(jobs_bp)
+
+class JobResource(Resource):
+    def get(self, job_id):
+        token = request.headers.get('Authorization')
+        
+        try:
+            # Validate the token
+            payload = AuthUtils.validate_token(token)
+            
+            # Jobs are only visible to the access key that started them
+            job = job_manager.get(job_id, payload['aws_access_key_id'])
+            if job is None:
+                return {'error': f"Job {job_id} not found"}, 404
+            return job.to_dict(), 200
+        
+        except ValueError as e:
+            return {'error': str(e)}, 401
+
+# Register resources with API endpoints
+api.add_resource(JobResource, '/<string:job_id>')
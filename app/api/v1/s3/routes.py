@@ -2,7 +2,11 @@
 from flask import Blueprint, request
 from flask_restful import Api, Resource
 from app.services.s3_service import S3Service
+from app.services.s3_bucket_scanner import S3BucketScanner
+from app.services.s3_inventory_service import S3InventoryService
 from app.utils.auth_utils import AuthUtils
+from app.utils.cache import fetch_inventory, is_error_response
+from app.utils.jobs import job_manager
 
 s3_bp = Blueprint('s3', __name__)
 api = Api(s3_bp)
@@ -12,19 +16,19 @@ class S3BucketsResource(Resource):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
-            
-            # Create S3 Service with credentials from token
-            s3_service = S3Service(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
-            )
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            payload = session.payload
+            
+            # Reuse the session's S3 Service
+            s3_service = session.service(S3Service)
             
-            # List S3 Buckets - return directly, no jsonify
-            buckets = s3_service.list_buckets()
-            return {'buckets': buckets}, 200
+            # List S3 Buckets from the latest snapshot or the response cache - return directly, no jsonify
+            arguments = {}
+            if request.args.get('size_source'):
+                arguments['size_source'] = request.args.get('size_source')
+            result = fetch_inventory(payload, 's3.list_buckets', s3_service.list_buckets, arguments)
+            return {'buckets': result.value}, 200, result.headers()
         
         except ValueError as e:
             return {'error': str(e)}, 401
@@ -34,23 +38,110 @@ class S3BucketDetailsResource(Resource):
         token = request.headers.get('Authorization')
         
         try:
-            # Validate the token
-            payload = AuthUtils.validate_token(token)
-            
-            # Create S3 Service with credentials from token
-            s3_service = S3Service(
-                aws_access_key_id=payload['aws_access_key_id'],
-                aws_secret_access_key=payload['aws_secret_access_key'],
-                region=payload.get('aws_region', 'us-west-2')
-            )
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            
+            # Reuse the session's S3 Service
+            s3_service = session.service(S3Service)
             
             # Get Bucket Details - return directly, no jsonify
-            bucket_details = s3_service.get_bucket_details(bucket_name)
+            bucket_details = s3_service.get_bucket_details(
+                bucket_name,
+                size_source=request.args.get('size_source')
+            )
             return bucket_details, 200
         
         except ValueError as e:
             return {'error': str(e)}, 401
 
+class S3BucketInventoryResource(Resource):
+    def get(self, bucket_name):
+        token = request.headers.get('Authorization')
+        
+        try:
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            
+            inventory_service = session.service(S3InventoryService)
+            
+            # Latest ingested inventory totals
+            inventory = inventory_service.get_latest(bucket_name)
+            if inventory is None:
+                return {'error': f"No inventory has been ingested for bucket {bucket_name}"}, 404
+            return inventory, 200
+        
+        except ValueError as e:
+            return {'error': str(e)}, 401
+    
+    def post(self, bucket_name):
+        token = request.headers.get('Authorization')
+        
+        try:
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            payload = session.payload
+            
+            inventory_service = session.service(S3InventoryService)
+            
+            # Optional manifest location; defaults to the newest report of the bucket
+            data = request.get_json(silent=True) or {}
+            manifest_bucket = data.get('manifest_bucket')
+            manifest_key = data.get('manifest_key')
+            if bool(manifest_bucket) != bool(manifest_key):
+                return {'error': 'manifest_bucket and manifest_key must be given together'}, 400
+            
+            # Ingestion can take minutes, so it runs as a background job
+            job = job_manager.submit(
+                f"s3.inventory:{bucket_name}",
+                payload['aws_access_key_id'],
+                lambda job: _raise_on_error(inventory_service.ingest(
+                    bucket_name,
+                    manifest_bucket=manifest_bucket,
+                    manifest_key=manifest_key,
+                    progress=job.update
+                ))
+            )
+            return job.to_dict(), 202, {'Location': f"/api/v1/jobs/{job.id}"}
+        
+        except ValueError as e:
+            return {'error': str(e)}, 401
+
+class S3BucketScanResource(Resource):
+    def post(self, bucket_name):
+        token = request.headers.get('Authorization')
+        
+        try:
+            # Validate the token and look up its session
+            session = AuthUtils.get_session(token)
+            payload = session.payload
+            
+            # Reuse the session's S3 Service
+            s3_service = session.service(S3Service)
+            scanner = S3BucketScanner(s3_service)
+            
+            # Unfinished scans resume from their last checkpoint unless asked not to
+            data = request.get_json(silent=True) or {}
+            resume = data.get('resume', True) is not False
+            
+            # Listing every object can take hours, so it runs as a background job
+            job = job_manager.submit(
+                f"s3.scan:{bucket_name}",
+                payload['aws_access_key_id'],
+                lambda job: _raise_on_error(scanner.scan(bucket_name, resume=resume, progress=job.update))
+            )
+            return job.to_dict(), 202, {'Location': f"/api/v1/jobs/{job.id}"}
+        
+        except ValueError as e:
+            return {'error': str(e)}, 401
+
+def _raise_on_error(result):
+    """Turn a service error response into a job failure"""
+    if is_error_response(result):
+        raise RuntimeError(result['error'])
+    return result
+
 # Register resources with API endpoints
 api.add_resource(S3BucketsResource, '/buckets')
-api.add_resource(S3BucketDetailsResource, '/buckets/<string:bucket_name>/details')
\ No newline at end of file
+api.add_resource(S3BucketDetailsResource, '/buckets/<string:bucket_name>/details')
+api.add_resource(S3BucketInventoryResource, '/buckets/<string:bucket_name>/inventory')
+api.add_resource(S3BucketScanResource, '/buckets/<string:bucket_name>/scan')
\ No newline at end of file
@@ -6,4 +6,111 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
-    TOKEN_EXPIRATION_MINUTES = int(os.getenv('TOKEN_EXPIRATION_MINUTES', 60))
\ No newline at end of file
+    TOKEN_EXPIRATION_MINUTES = int(os.getenv('TOKEN_EXPIRATION_MINUTES', 60))
+
+    # Shared boto3 client pool
+    CLIENT_POOL_MAX_SIZE = int(os.getenv('CLIENT_POOL_MAX_SIZE', 64))
+    CLIENT_POOL_IDLE_TIMEOUT_SECONDS = int(os.getenv('CLIENT_POOL_IDLE_TIMEOUT_SECONDS', 900))
+    AWS_MAX_POOL_CONNECTIONS = int(os.getenv('AWS_MAX_POOL_CONNECTIONS', 10))
+
+    # Concurrency for fan-out AWS calls
+    AWS_EXECUTOR_MAX_WORKERS = int(os.getenv('AWS_EXECUTOR_MAX_WORKERS', 32))
+    S3_BUCKET_CONCURRENCY = int(os.getenv('S3_BUCKET_CONCURRENCY', 16))
+    SECTION_EXECUTOR_MAX_WORKERS = int(os.getenv('SECTION_EXECUTOR_MAX_WORKERS', 16))
+    ECS_CLUSTER_CONCURRENCY = int(os.getenv('ECS_CLUSTER_CONCURRENCY', 8))
+    ECS_DESCRIBE_CONCURRENCY = int(os.getenv('ECS_DESCRIBE_CONCURRENCY', 5))
+    EBS_METRICS_BATCH_CONCURRENCY = int(os.getenv('EBS_METRICS_BATCH_CONCURRENCY', 4))
+
+    # Shared rate limiting of AWS calls per (account, region, service): a token
+    # bucket with these sustained rates plus an AIMD concurrency limit
+    AWS_RATE_LIMIT_ENABLED = os.getenv('AWS_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    AWS_RATE_LIMITS = {
+        'ec2': float(os.getenv('AWS_RATE_LIMIT_EC2_PER_SECOND', 20)),
+        'ecs': float(os.getenv('AWS_RATE_LIMIT_ECS_PER_SECOND', 20)),
+        's3': float(os.getenv('AWS_RATE_LIMIT_S3_PER_SECOND', 50)),
+        'cloudwatch': float(os.getenv('AWS_RATE_LIMIT_CLOUDWATCH_PER_SECOND', 25)),
+        'sts': float(os.getenv('AWS_RATE_LIMIT_STS_PER_SECOND', 20))
+    }
+    AWS_RATE_LIMIT_DEFAULT = float(os.getenv('AWS_RATE_LIMIT_DEFAULT_PER_SECOND', 20))
+    AWS_RATE_LIMIT_BURST_SECONDS = float(os.getenv('AWS_RATE_LIMIT_BURST_SECONDS', 2))
+    AWS_ADAPTIVE_CONCURRENCY_INITIAL = int(os.getenv('AWS_ADAPTIVE_CONCURRENCY_INITIAL', 16))
+    AWS_ADAPTIVE_CONCURRENCY_MIN = int(os.getenv('AWS_ADAPTIVE_CONCURRENCY_MIN', 1))
+    AWS_ADAPTIVE_CONCURRENCY_MAX = int(os.getenv('AWS_ADAPTIVE_CONCURRENCY_MAX', 64))
+
+    # Multi-region fan-out (regions=all|a,b,c)
+    REGION_FANOUT_MAX_WORKERS = int(os.getenv('REGION_FANOUT_MAX_WORKERS', 16))
+    REGION_FANOUT_TIMEOUT_SECONDS = int(os.getenv('REGION_FANOUT_TIMEOUT_SECONDS', 30))
+
+    # Multi-account aggregation through sts:AssumeRole (role_arns at login)
+    ASSUME_ROLE_DURATION_SECONDS = int(os.getenv('ASSUME_ROLE_DURATION_SECONDS', 3600))
+    ASSUME_ROLE_REFRESH_AHEAD_SECONDS = int(os.getenv('ASSUME_ROLE_REFRESH_AHEAD_SECONDS', 900))
+    ASSUME_ROLE_EXTERNAL_ID = os.getenv('ASSUME_ROLE_EXTERNAL_ID')
+    ACCOUNT_FANOUT_MAX_WORKERS = int(os.getenv('ACCOUNT_FANOUT_MAX_WORKERS', 8))
+    ACCOUNT_FANOUT_TIMEOUT_SECONDS = int(os.getenv('ACCOUNT_FANOUT_TIMEOUT_SECONDS', 90))
+    MAX_ROLE_ARNS = int(os.getenv('MAX_ROLE_ARNS', 100))
+
+    # Prometheus metrics of AWS API calls at /metrics
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+    # On-demand request profiling: send X-Debug-Profile with the admin token, or
+    # sample a fraction of API requests; reports are listed at /debug/profiles
+    PROFILING_ADMIN_TOKEN = os.getenv('PROFILING_ADMIN_TOKEN')
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0))
+    PROFILING_MAX_REPORTS = int(os.getenv('PROFILING_MAX_REPORTS', 50))
+
+    # Async route handlers await independent service calls concurrently
+    ASYNC_VIEWS_ENABLED = os.getenv('ASYNC_VIEWS_ENABLED', 'true').lower() == 'true'
+
+    # Background jobs for long-running crawls
+    JOB_MAX_WORKERS = int(os.getenv('JOB_MAX_WORKERS', 2))
+    JOB_HISTORY_SIZE = int(os.getenv('JOB_HISTORY_SIZE', 100))
+
+    # Per-section timeouts for the dashboard summary
+    DASHBOARD_SECTION_TIMEOUTS = {
+        'ecs': int(os.getenv('DASHBOARD_ECS_TIMEOUT_SECONDS', 30)),
+        's3': int(os.getenv('DASHBOARD_S3_TIMEOUT_SECONDS', 60)),
+        'ebs': int(os.getenv('DASHBOARD_EBS_TIMEOUT_SECONDS', 30))
+    }
+
+    # Response cache for inventory endpoints
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    CACHE_MAX_STALE_SECONDS = int(os.getenv('CACHE_MAX_STALE_SECONDS', 600))
+    CACHE_STALE_IF_ERROR_SECONDS = int(os.getenv('CACHE_STALE_IF_ERROR_SECONDS', 3600))
+    CACHE_TTLS = {
+        's3.list_buckets': int(os.getenv('CACHE_TTL_S3_BUCKETS_SECONDS', 300)),
+        'ebs.list_volumes': int(os.getenv('CACHE_TTL_EBS_VOLUMES_SECONDS', 120)),
+        'ecs.list_clusters': int(os.getenv('CACHE_TTL_ECS_CLUSTERS_SECONDS', 60)),
+        'dashboard.summary': int(os.getenv('CACHE_TTL_DASHBOARD_SUMMARY_SECONDS', 120)),
+        's3.storage_metrics': int(os.getenv('CACHE_TTL_S3_STORAGE_METRICS_SECONDS', 3600)),
+        'ec2.describe_regions': int(os.getenv('CACHE_TTL_EC2_REGIONS_SECONDS', 86400))
+    }
+
+    # Background inventory crawler and snapshot store
+    CRAWLER_ENABLED = os.getenv('CRAWLER_ENABLED', 'false').lower() == 'true'
+    CRAWLER_INTERVAL_SECONDS = int(os.getenv('CRAWLER_INTERVAL_SECONDS', 300))
+    CRAWLER_JITTER_SECONDS = int(os.getenv('CRAWLER_JITTER_SECONDS', 30))
+    CRAWLER_CONCURRENCY = int(os.getenv('CRAWLER_CONCURRENCY', 4))
+    SNAPSHOT_DB_PATH = os.getenv('SNAPSHOT_DB_PATH', 'snapshots.db')
+    SNAPSHOT_RETENTION = int(os.getenv('SNAPSHOT_RETENTION', 10))
+    SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv('SNAPSHOT_MAX_AGE_SECONDS', 900))
+
+    # CloudWatch datapoint cache for closed metric periods
+    METRICS_CACHE_MAX_SERIES = int(os.getenv('METRICS_CACHE_MAX_SERIES', 10000))
+    METRICS_SETTLE_SECONDS = int(os.getenv('METRICS_SETTLE_SECONDS', 600))
+
+    # Incremental ECS summary for the dashboard
+    ECS_SUMMARY_MAX_AGE_SECONDS = int(os.getenv('ECS_SUMMARY_MAX_AGE_SECONDS', 900))
+    ECS_SUMMARY_MAX_CLUSTERS = int(os.getenv('ECS_SUMMARY_MAX_CLUSTERS', 5000))
+
+    # Source of S3 bucket sizes: 'cloudwatch' storage metrics or 'listing' (first 1,000 objects)
+    S3_SIZE_SOURCE = os.getenv('S3_SIZE_SOURCE', 'cloudwatch')
+
+    # S3 Inventory report ingestion
+    S3_INVENTORY_PREFIX_DEPTH = int(os.getenv('S3_INVENTORY_PREFIX_DEPTH', 1))
+    S3_INVENTORY_MAX_PREFIXES = int(os.getenv('S3_INVENTORY_MAX_PREFIXES', 1000))
+    S3_INVENTORY_MAX_AGE_SECONDS = int(os.getenv('S3_INVENTORY_MAX_AGE_SECONDS', 8 * 24 * 3600))
+
+    # Full bucket scans when S3 Inventory is not enabled
+    S3_SCAN_CONCURRENCY = int(os.getenv('S3_SCAN_CONCURRENCY', 8))
+    S3_SCAN_MAX_DEPTH = int(os.getenv('S3_SCAN_MAX_DEPTH', 2))
+    S3_SCAN_CHECKPOINT_INTERVAL_SECONDS = int(os.getenv('S3_SCAN_CHECKPOINT_INTERVAL_SECONDS', 30))
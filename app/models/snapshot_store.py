@@ -0,0 +1,144 @@
+# app/models/snapshot_store.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from app.config.config import Config
+from app.utils.etag import compute_etag
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """
+    SQLite store for inventory snapshots written by the background crawler.
+
+    Each snapshot holds the JSON result of one service operation (e.g.
+    's3.list_buckets') for one access key and region, along with when the crawl
+    ran, how long it took and the ETag of the stored JSON.
+    """
+
+    def __init__(self, db_path, retention=10):
+        """
+        Initialize the snapshot store
+
+        Args:
+            db_path: Path of the SQLite database file
+            retention: Number of snapshots kept per access key, region and resource
+        """
+        self.db_path = db_path
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        """Open the database and create the schema on first use (lock must be held)"""
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    account_key TEXT NOT NULL,
+                    region TEXT NOT NULL,
+                    resource TEXT NOT NULL,
+                    crawled_at REAL NOT NULL,
+                    duration_ms REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    etag TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_snapshots_lookup
+                ON snapshots (account_key, region, resource, crawled_at DESC)
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def save(self, account_key, region, resource, payload, crawled_at, duration_ms):
+        """
+        Store a snapshot and prune old ones for the same key
+
+        Args:
+            account_key: AWS access key ID the crawl ran with
+            region: AWS region
+            resource: Operation name, e.g. 's3.list_buckets'
+            payload: JSON-serializable result of the operation
+            crawled_at: Unix timestamp when the crawl started
+            duration_ms: How long the crawl took, in milliseconds
+        """
+        serialized = json.dumps(payload, default=str)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO snapshots (account_key, region, resource, crawled_at, duration_ms, payload, etag) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (account_key, region, resource, crawled_at, duration_ms, serialized, compute_etag(serialized))
+            )
+            conn.execute(
+                "DELETE FROM snapshots WHERE account_key = ? AND region = ? AND resource = ? AND id NOT IN ("
+                "SELECT id FROM snapshots WHERE account_key = ? AND region = ? AND resource = ? "
+                "ORDER BY crawled_at DESC LIMIT ?)",
+                (account_key, region, resource, account_key, region, resource, self.retention)
+            )
+            conn.commit()
+
+    def latest(self, account_key, region, resource, max_age=None):
+        """
+        Get the most recent snapshot for a resource
+
+        Args:
+            account_key: AWS access key ID
+            region: AWS region
+            resource: Operation name, e.g. 's3.list_buckets'
+            max_age: Ignore snapshots older than this many seconds (default: no limit)
+
+        Returns:
+            dict: Snapshot with 'payload', 'crawled_at', 'duration_ms' and 'etag'
+                keys, or None
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT payload, crawled_at, duration_ms, etag FROM snapshots "
+                "WHERE account_key = ? AND region = ? AND resource = ? "
+                "ORDER BY crawled_at DESC LIMIT 1",
+                (account_key, region, resource)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        payload, crawled_at, duration_ms, etag = row
+        if max_age is not None and time.time() - crawled_at > max_age:
+            return None
+
+        return {
+            'payload': json.loads(payload),
+            'crawled_at': crawled_at,
+            'duration_ms': duration_ms,
+            'etag': etag
+        }
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Shared store used by the crawler and the API endpoints
+snapshot_store = SnapshotStore(
+    db_path=Config.SNAPSHOT_DB_PATH,
+    retention=Config.SNAPSHOT_RETENTION
+)
@@ -0,0 +1,207 @@
+# app/services/account_fanout.py
+import logging
+import re
+
+from app.config.config import Config
+from app.services.dashboard_service import DashboardService
+from app.utils.cache import is_error_response
+from app.utils.concurrency import bounded_map, get_account_executor, run_sections
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+ROLE_ARN_PATTERN = re.compile(r'^arn:aws[a-z-]*:iam::(\d{12}):role/[\w+=,.@/-]+$')
+
+
+def validate_role_arns(role_arns):
+    """
+    Check the role ARNs given at login
+
+    Args:
+        role_arns: List of IAM role ARNs, at most one per account
+
+    Returns:
+        list: The role ARNs, without duplicates
+
+    Raises:
+        ValueError: If the list is too long, an ARN is malformed or two roles
+            are in the same account
+    """
+    if not isinstance(role_arns, list):
+        raise ValueError("role_arns must be a list of IAM role ARNs")
+    role_arns = list(dict.fromkeys(role_arns))
+    if len(role_arns) > Config.MAX_ROLE_ARNS:
+        raise ValueError(f"At most {Config.MAX_ROLE_ARNS} role ARNs are allowed")
+
+    accounts = set()
+    for role_arn in role_arns:
+        match = ROLE_ARN_PATTERN.match(role_arn) if isinstance(role_arn, str) else None
+        if not match:
+            raise ValueError(f"Invalid role ARN: {role_arn}")
+        if match.group(1) in accounts:
+            raise ValueError(f"More than one role ARN for account {match.group(1)}")
+        accounts.add(match.group(1))
+    return role_arns
+
+
+def role_account_id(role_arn):
+    """Get the account ID of a role ARN"""
+    return role_arn.split(':')[4]
+
+
+def session_accounts(session):
+    """
+    List the accounts a session covers
+
+    Args:
+        session: Session of the caller
+
+    Returns:
+        dict: Account ID to the role ARN used for it, None for the session's
+            own account
+    """
+    accounts = {session.payload['account_id']: None}
+    for role_arn in session.role_arns:
+        # A role in the caller's own account is not needed to read it
+        accounts.setdefault(role_account_id(role_arn), role_arn)
+    return accounts
+
+
+def assume_roles(session):
+    """
+    Assume every role of a session concurrently, warming the credential cache
+
+    Args:
+        session: Session with role_arns
+
+    Returns:
+        dict: Account ID to a dict with the role ARN and 'status' ('assumed' or
+            'failed', with the error)
+    """
+    def assume(role_arn):
+        try:
+            session.account_credentials(role_arn)
+            return {'role_arn': role_arn, 'status': 'assumed'}
+        except Exception as e:
+            logger.warning(f"Could not assume {role_arn}: {str(e)}")
+            return {'role_arn': role_arn, 'status': 'failed', 'error': str(e)}
+
+    return {
+        role_account_id(status['role_arn']): status
+        for status in bounded_map(assume, session.role_arns, max_workers=Config.ACCOUNT_FANOUT_MAX_WORKERS)
+    }
+
+
+def fan_out_accounts(session, func, timeout=None):
+    """
+    Call func for every account of a session concurrently
+
+    Accounts run on the account executor with a shared deadline. An account
+    whose role cannot be assumed, whose call returns an error response or that
+    misses the deadline is reported without holding up the others.
+
+    Args:
+        session: Session of the caller
+        func: Callable taking a role ARN (None for the session's own account)
+        timeout: Deadline in seconds (default: Config.ACCOUNT_FANOUT_TIMEOUT_SECONDS)
+
+    Returns:
+        tuple: (results, status) mapping each account ID to its result (None
+            unless it completed) and to a dict with its role ARN, status and
+            duration_ms
+    """
+    timeout = timeout or Config.ACCOUNT_FANOUT_TIMEOUT_SECONDS
+    accounts = session_accounts(session)
+    results, status = run_sections(
+        {account_id: (lambda role_arn=role_arn: func(role_arn), timeout) for account_id, role_arn in accounts.items()},
+        executor=get_account_executor()
+    )
+
+    for account_id, result in results.items():
+        if is_error_response(result):
+            logger.warning(f"Account {account_id} failed: {result['error']}")
+            results[account_id] = None
+            status[account_id] = {
+                'status': 'failed',
+                'error': result['error'],
+                'duration_ms': status[account_id].get('duration_ms')
+            }
+        status[account_id]['role_arn'] = accounts[account_id]
+
+    return results, status
+
+
+def get_accounts_summary(session, regions=None):
+    """
+    Get a dashboard summary across every account of a session
+
+    Each account is summarized with its own DashboardService (across regions if
+    given) and the section totals are added up. An account that fails or times
+    out is left out of the totals and every section is reported as partial;
+    a section that did not complete in one account is partial as well.
+
+    Args:
+        session: Session with role_arns
+        regions: Region names to cover in every account (default: the session's region)
+
+    Returns:
+        dict: Summed summary with per-section status and per-account results
+    """
+    try:
+        def summarize(role_arn):
+            dashboard_service = session.account_service(DashboardService, role_arn)
+            if not regions:
+                return dashboard_service.get_summary()
+            regional_services = {
+                region: session.account_service(DashboardService, role_arn, region)
+                for region in regions
+            }
+            return dashboard_service.get_multi_region_summary(regional_services)
+
+        logger.debug(f"Generating dashboard summary for {len(session.role_arns)} roles")
+        results, account_status = fan_out_accounts(session, summarize)
+
+        summary = {}
+        sections = {}
+        for section in ("ecs", "s3", "ebs"):
+            totals = {}
+            incomplete = []
+            for account_id in sorted(results):
+                account = results[account_id]
+                if account is None or account['summary'][section] is None:
+                    incomplete.append(account_id)
+                    continue
+                if account['sections'][section]['status'] != 'completed':
+                    # Partial across regions: counted, but the total is partial too
+                    incomplete.append(account_id)
+                for name, value in account['summary'][section].items():
+                    totals[name] = totals.get(name, 0) + value
+
+            summary[section] = (
+                {name: round(value, 2) if isinstance(value, float) else value for name, value in totals.items()}
+                if len(incomplete) < len(results) else None
+            )
+            sections[section] = (
+                {'status': 'completed'} if not incomplete
+                else {'status': 'partial', 'incomplete_accounts': incomplete}
+            )
+
+        # Keep each account's own summary and section status
+        for account_id, account in results.items():
+            if account is not None:
+                account_status[account_id]['summary'] = account['summary']
+                account_status[account_id]['sections'] = account['sections']
+                if 'regions' in account:
+                    account_status[account_id]['regions'] = account['regions']
+
+        logger.info(f"Successfully generated dashboard summary for {len(results)} accounts")
+        return {
+            "summary": summary,
+            "sections": sections,
+            "accounts": account_status
+        }
+
+    except Exception as e:
+        logger.error(f"Error generating multi-account dashboard summary: {str(e)}")
+        return {"error": f"Failed to generate summary: {str(e)}"}
@@ -1,15 +1,19 @@
 # app/services/dashboard_service.py
 import logging
+from app.config.config import Config
 from app.services.s3_service import S3Service
 from app.services.ecs_service import ECSService
 from app.services.ebs_service import EBSService
+from app.services.ecs_summary_service import ecs_summary_aggregator
+from app.services.region_fanout import fan_out_regions
+from app.utils.concurrency import bounded_map, run_sections
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 class DashboardService:
-    def __init__(self, aws_access_key_id, aws_secret_access_key, region):
+    def __init__(self, aws_access_key_id, aws_secret_access_key, region, aws_session_token=None):
         """
         Initialize the Dashboard service with AWS credentials
         
@@ -17,11 +21,12 @@ class DashboardService:
             aws_access_key_id: AWS access key ID
             aws_secret_access_key: AWS secret access key
             region: AWS region
+            aws_session_token: Session token for temporary credentials, e.g. from AssumeRole
         """
         # Initialize service clients
-        self.s3_service = S3Service(aws_access_key_id, aws_secret_access_key, region)
-        self.ecs_service = ECSService(aws_access_key_id, aws_secret_access_key, region)
-        self.ebs_service = EBSService(aws_access_key_id, aws_secret_access_key, region)
+        self.s3_service = S3Service(aws_access_key_id, aws_secret_access_key, region, aws_session_token)
+        self.ecs_service = ECSService(aws_access_key_id, aws_secret_access_key, region, aws_session_token)
+        self.ebs_service = EBSService(aws_access_key_id, aws_secret_access_key, region, aws_session_token)
         
         self.region = region
         logger.debug(f"Initialized Dashboard service for region {region}")
@@ -30,28 +35,31 @@ class DashboardService:
         """
         Get comprehensive summary of all AWS resources
         
+        The ECS, S3 and EBS sections are collected concurrently, each with its own
+        timeout (Config.DASHBOARD_SECTION_TIMEOUTS). A section that fails or times
+        out is returned as None and reported under 'sections'.
+        
         Returns:
-            dict: Summary of ECS, S3, and EBS resources
+            dict: Summary of ECS, S3, and EBS resources with per-section status
         """
         try:
             logger.debug("Generating dashboard summary")
             
-            # Get ECS summary
-            ecs_summary = self._get_ecs_summary()
-            
-            # Get S3 summary
-            s3_summary = self._get_s3_summary()
-            
-            # Get EBS summary
-            ebs_summary = self._get_ebs_summary()
+            timeouts = Config.DASHBOARD_SECTION_TIMEOUTS
+            results, sections = run_sections({
+                "ecs": (self._get_ecs_summary, timeouts['ecs']),
+                "s3": (self._get_s3_summary, timeouts['s3']),
+                "ebs": (self._get_ebs_summary, timeouts['ebs'])
+            })
             
             # Combine all summaries
             summary = {
                 "summary": {
-                    "ecs": ecs_summary,
-                    "s3": s3_summary,
-                    "ebs": ebs_summary
-                }
+                    "ecs": results["ecs"],
+                    "s3": results["s3"],
+                    "ebs": results["ebs"]
+                },
+                "sections": sections
             }
             
             logger.info("Successfully generated dashboard summary")
@@ -61,60 +69,105 @@ class DashboardService:
             logger.error(f"Error generating dashboard summary: {str(e)}")
             return {"error": f"Failed to generate summary: {str(e)}"}
 
-    def _get_ecs_summary(self):
+    def get_regional_summary(self):
         """
-        Get summary of ECS resources
+        Get the ECS and EBS summaries for this service's region
         
         Returns:
-            dict: ECS summary metrics
+            dict: 'ecs' and 'ebs' summaries (None if a section did not complete)
+                with per-section status under 'sections'
+        """
+        timeouts = Config.DASHBOARD_SECTION_TIMEOUTS
+        results, sections = run_sections({
+            "ecs": (self._get_ecs_summary, timeouts['ecs']),
+            "ebs": (self._get_ebs_summary, timeouts['ebs'])
+        })
+        return {
+            "ecs": results["ecs"],
+            "ebs": results["ebs"],
+            "sections": sections
+        }
+
+    def get_multi_region_summary(self, regional_services):
+        """
+        Get a summary of resources across several regions
+        
+        S3 is global and summarized once. ECS and EBS are summarized in every
+        region concurrently and their totals added up; a region that fails or
+        misses Config.REGION_FANOUT_TIMEOUT_SECONDS is left out of the totals and
+        the ECS and EBS sections are reported as partial.
+        
+        Args:
+            regional_services: Dictionary mapping region name to the
+                DashboardService for that region
+        
+        Returns:
+            dict: Summary of ECS, S3, and EBS resources with per-section and
+                per-region status
         """
         try:
-            # Get clusters
-            clusters_response = self.ecs_service.list_clusters()
-            clusters = clusters_response.get('clusters', [])
+            logger.debug(f"Generating dashboard summary for {len(regional_services)} regions")
             
-            total_clusters = len(clusters)
-            total_services = 0
-            total_tasks = 0
-            unhealthy_services = 0
+            regions = sorted(regional_services)
+            fanout_timeout = Config.REGION_FANOUT_TIMEOUT_SECONDS
+            results, sections = run_sections({
+                "s3": (self._get_s3_summary, Config.DASHBOARD_SECTION_TIMEOUTS['s3']),
+                # Regions time out individually inside fan_out_regions
+                "regions": (
+                    lambda: fan_out_regions(regions, lambda region: regional_services[region].get_regional_summary()),
+                    fanout_timeout + 1
+                )
+            })
+            regional_results, region_status = results["regions"] or ({}, {})
             
-            # Get services and tasks for each cluster
-            for cluster in clusters:
-                cluster_name = cluster if isinstance(cluster, str) else cluster.get('cluster_name', '')
-                
-                # Extract cluster name from ARN if needed
-                if cluster_name.startswith('arn:'):
-                    cluster_name = cluster_name.split('/')[-1]
-                
-                # Get services for this cluster
-                services_response = self.ecs_service.list_services(cluster_name)
-                services = services_response.get('services', [])
-                total_services += len(services)
+            summary = {"ecs": None, "s3": results["s3"], "ebs": None}
+            for section in ("ecs", "ebs"):
+                totals = {}
+                incomplete = []
+                for region in regions:
+                    regional = regional_results.get(region)
+                    if regional is None or regional[section] is None:
+                        incomplete.append(region)
+                        continue
+                    for name, value in regional[section].items():
+                        totals[name] = totals.get(name, 0) + value
                 
-                # Check for unhealthy services and count tasks
-                for service in services:
-                    # This is a simplified approach; in a real implementation,
-                    # you would check service health and count tasks
-                    if isinstance(service, dict):
-                        if service.get('status') != 'ACTIVE':
-                            unhealthy_services += 1
-                        total_tasks += service.get('running_count', 0) + service.get('pending_count', 0)
-                    
+                summary[section] = totals if len(incomplete) < len(regions) else None
+                sections[section] = (
+                    {'status': 'completed'} if not incomplete
+                    else {'status': 'partial', 'incomplete_regions': incomplete}
+                )
+            
+            # Report how each region's sections finished
+            for region, regional in regional_results.items():
+                if regional is not None:
+                    region_status[region]['sections'] = regional['sections']
+            del sections["regions"]
+            
+            logger.info(f"Successfully generated dashboard summary for {len(regions)} regions")
             return {
-                "total_clusters": total_clusters,
-                "total_services": total_services,
-                "total_tasks": total_tasks,
-                "unhealthy_services": unhealthy_services
+                "summary": summary,
+                "sections": sections,
+                "regions": region_status
             }
             
         except Exception as e:
-            logger.error(f"Error generating ECS summary: {str(e)}")
-            return {
-                "total_clusters": 0,
-                "total_services": 0,
-                "total_tasks": 0,
-                "unhealthy_services": 0
-            }
+            logger.error(f"Error generating multi-region dashboard summary: {str(e)}")
+            return {"error": f"Failed to generate summary: {str(e)}"}
+
+    def _get_ecs_summary(self):
+        """
+        Get summary of ECS resources
+        
+        Returns:
+            dict: ECS summary metrics
+        
+        Raises:
+            RuntimeError: If the clusters could not be listed
+        """
+        # Totals come from cluster statistics; only clusters whose statistics
+        # changed since the last summary have their services re-queried
+        return ecs_summary_aggregator.summarize(self.ecs_service)
 
     def _get_s3_summary(self):
         """
@@ -122,55 +175,52 @@ class DashboardService:
         
         Returns:
             dict: S3 summary metrics
+        
+        Raises:
+            RuntimeError: If the buckets could not be listed
         """
-        try:
-            # Get buckets
-            buckets_response = self.s3_service.list_buckets()
-            buckets = buckets_response.get('buckets', [])
-            
-            total_buckets = len(buckets)
-            total_storage_gb = 0
-            buckets_without_encryption = 0
-            publicly_accessible_buckets = 0
-            
-            # Process bucket details
-            for bucket in buckets:
-                # Get bucket details
-                bucket_name = bucket.get('name') if isinstance(bucket, dict) else bucket
-                bucket_details = self.s3_service.get_bucket_details(bucket_name)
-                
-                # Get storage size
-                storage_class_summary = bucket_details.get('storage_class_summary', {})
-                for storage_class, size_bytes in storage_class_summary.items():
-                    total_storage_gb += size_bytes / (1024 * 1024 * 1024)
-                
-                # Check encryption
-                encryption = bucket_details.get('encryption', {})
-                if not encryption.get('enabled', False):
-                    buckets_without_encryption += 1
-                
-                # Check public access (simplified)
-                # In a real implementation, you'd check bucket policies and ACLs
-                publicly_accessible_buckets += 0  # Placeholder
-            
-            # Round total storage to 2 decimal places
-            total_storage_gb = round(total_storage_gb, 2)
+        # Get buckets
+        buckets_response = self.s3_service.list_buckets()
+        if 'error' in buckets_response:
+            raise RuntimeError(buckets_response['error'])
+        buckets = buckets_response.get('buckets', [])
+        
+        # Get bucket details concurrently, reusing what the listing already read
+        all_bucket_details = bounded_map(
+            lambda bucket: self.s3_service.get_bucket_details(bucket['name'], bucket_info=bucket),
+            buckets,
+            max_workers=Config.S3_BUCKET_CONCURRENCY
+        )
+        
+        total_storage_gb = 0
+        buckets_without_encryption = 0
+        publicly_accessible_buckets = 0
+        
+        # Process bucket details
+        for bucket_details in all_bucket_details:
+            # Get storage size
+            storage_class_summary = bucket_details.get('storage_class_summary', {})
+            for storage_class, size_bytes in storage_class_summary.items():
+                total_storage_gb += size_bytes / (1024 * 1024 * 1024)
             
-            return {
-                "total_buckets": total_buckets,
-                "total_storage_gb": total_storage_gb,
-                "buckets_without_encryption": buckets_without_encryption,
-                "publicly_accessible_buckets": publicly_accessible_buckets
-            }
+            # Check encryption
+            encryption = bucket_details.get('encryption', {})
+            if not encryption.get('enabled', False):
+                buckets_without_encryption += 1
             
-        except Exception as e:
-            logger.error(f"Error generating S3 summary: {str(e)}")
-            return {
-                "total_buckets": 0,
-                "total_storage_gb": 0,
-                "buckets_without_encryption": 0,
-                "publicly_accessible_buckets": 0
-            }
+            # Check public access (simplified)
+            # In a real implementation, you'd check bucket policies and ACLs
+            publicly_accessible_buckets += 0  # Placeholder
+        
+        # Round total storage to 2 decimal places
+        total_storage_gb = round(total_storage_gb, 2)
+        
+        return {
+            "total_buckets": len(buckets),
+            "total_storage_gb": total_storage_gb,
+            "buckets_without_encryption": buckets_without_encryption,
+            "publicly_accessible_buckets": publicly_accessible_buckets
+        }
 
     def _get_ebs_summary(self):
         """
@@ -178,42 +228,37 @@ class DashboardService:
         
         Returns:
             dict: EBS summary metrics
+        
+        Raises:
+            RuntimeError: If the volumes could not be listed
         """
-        try:
-            # Get volumes
-            volumes_response = self.ebs_service.list_volumes()
-            volumes = volumes_response.get('volumes', [])
-            
-            total_volumes = len(volumes)
-            total_storage_gb = 0
-            unattached_volumes = 0
-            unencrypted_volumes = 0
-            
-            # Process volume details
-            for volume in volumes:
-                # Get storage size
-                total_storage_gb += volume.get('size', 0)
-                
-                # Check if volume is attached
-                if volume.get('state') != 'in-use' or not volume.get('attached_instance'):
-                    unattached_volumes += 1
-                
-                # Check encryption
-                if not volume.get('encrypted', False):
-                    unencrypted_volumes += 1
+        # Get volumes
+        volumes_response = self.ebs_service.list_volumes()
+        if 'error' in volumes_response:
+            raise RuntimeError(volumes_response['error'])
+        volumes = volumes_response.get('volumes', [])
+        
+        total_volumes = len(volumes)
+        total_storage_gb = 0
+        unattached_volumes = 0
+        unencrypted_volumes = 0
+        
+        # Process volume details
+        for volume in volumes:
+            # Get storage size
+            total_storage_gb += volume.get('size', 0)
             
-            return {
-                "total_volumes": total_volumes,
-                "total_storage_gb": total_storage_gb,
-                "unattached_volumes": unattached_volumes,
-                "unencrypted_volumes": unencrypted_volumes
-            }
+            # Check if volume is attached
+            if volume.get('state') != 'in-use' or not volume.get('attached_instance'):
+                unattached_volumes += 1
             
-        except Exception as e:
-            logger.error(f"Error generating EBS summary: {str(e)}")
-            return {
-                "total_volumes": 0,
-                "total_storage_gb": 0,
-                "unattached_volumes": 0,
-                "unencrypted_volumes": 0
-            }
\ No newline at end of file
+            # Check encryption
+            if not volume.get('encrypted', False):
+                unencrypted_volumes += 1
+        
+        return {
+            "total_volumes": total_volumes,
+            "total_storage_gb": total_storage_gb,
+            "unattached_volumes": unattached_volumes,
+            "unencrypted_volumes": unencrypted_volumes
+        }
@@ -1,15 +1,22 @@
 # app/services/ebs_service.py
-import boto3
+import base64
 import logging
+import re
+import time
+from collections import defaultdict
 from botocore.exceptions import ClientError
-from datetime import datetime, timedelta
+from app.utils.client_pool import client_pool
+from app.config.config import Config
+from app.utils.concurrency import bounded_imap_unordered, get_shared_executor, in_shared_worker, submit_in_context
+from app.utils.metrics_cache import align_down, metric_datapoint_cache
+from datetime import datetime, timedelta, timezone
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 class EBSService:
-    def __init__(self, aws_access_key_id, aws_secret_access_key, region):
+    def __init__(self, aws_access_key_id, aws_secret_access_key, region, aws_session_token=None):
         """
         Initialize the EBS service with AWS credentials
         
@@ -17,78 +24,93 @@ class EBSService:
             aws_access_key_id: AWS access key ID
             aws_secret_access_key: AWS secret access key
             region: AWS region
+            aws_session_token: Session token for temporary credentials, e.g. from AssumeRole
         """
-        # Initialize EC2 client for EBS operations
-        self.ec2_client = boto3.client(
+        # Get EC2 client for EBS operations from the shared pool
+        self.ec2_client = client_pool.get_client(
             'ec2',
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
-            region_name=region
+            aws_session_token=aws_session_token,
+            region=region
         )
         
-        # Initialize CloudWatch client for metrics
-        self.cloudwatch_client = boto3.client(
+        # Get CloudWatch client for metrics from the shared pool
+        self.cloudwatch_client = client_pool.get_client(
             'cloudwatch',
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
-            region_name=region
+            aws_session_token=aws_session_token,
+            region=region
         )
         
+        self.aws_access_key_id = aws_access_key_id
         self.region = region
         logger.debug(f"Initialized EBS service for region {region}")
 
-    def list_volumes(self):
+    # Query filters accepted by list_volumes, mapped to DescribeVolumes filter names
+    VOLUME_FILTERS = {
+        'state': 'status',
+        'volume_type': 'volume-type',
+        'availability_zone': 'availability-zone',
+        'encrypted': 'encrypted'
+    }
+
+    def list_volumes(self, filters=None, limit=None, cursor=None):
         """
-        List all EBS volumes with detailed information
+        List EBS volumes with detailed information
+        
+        Filters are pushed down to DescribeVolumes. Without a limit every page is
+        fetched; with a limit a single page is returned along with a cursor for
+        the next one.
+        
+        Args:
+            filters: Optional dict with any of 'state', 'volume_type',
+                'availability_zone', 'encrypted' and 'tag' ('Key' or 'Key=Value').
+                Values may be comma-separated to match any of several values
+            limit: Maximum number of volumes to return (5-500, default: all)
+            cursor: Opaque cursor returned by a previous call
         
         Returns:
             dict: Dictionary with a 'volumes' key containing a list of volume details
+                and a 'next_cursor' key (None on the last page)
         """
         try:
             logger.debug("Attempting to list EBS volumes")
             
-            # Get all volumes
-            response = self.ec2_client.describe_volumes()
-            
-            volumes_info = []
-            for volume in response.get('Volumes', []):
-                # Extract volume details
-                volume_id = volume.get('VolumeId', '')
-                size = volume.get('Size', 0)
-                volume_type = volume.get('VolumeType', '')
-                state = volume.get('State', '')
-                iops = volume.get('Iops', 0)
-                throughput = volume.get('Throughput', 0)
-                encrypted = volume.get('Encrypted', False)
-                availability_zone = volume.get('AvailabilityZone', '')
-                
-                # Extract attachment information if available
-                attached_instance = ''
-                device = ''
+            request = {}
+            volume_filters = self._build_volume_filters(filters or {})
+            if volume_filters:
+                request['Filters'] = volume_filters
+            
+            if limit is None:
+                # Fetch every page
+                volumes_info = []
+                paginator = self.ec2_client.get_paginator('describe_volumes')
+                for page in paginator.paginate(**request):
+                    volumes_info.extend(self._format_volume(volume) for volume in page.get('Volumes', []))
+                next_cursor = None
+            else:
+                if not 5 <= limit <= 500:
+                    return {"error": "limit must be between 5 and 500"}
                 
-                if volume.get('Attachments'):
-                    attachment = volume['Attachments'][0]  # Get first attachment
-                    attached_instance = attachment.get('InstanceId', '')
-                    device = attachment.get('Device', '')
+                request['MaxResults'] = limit
+                if cursor:
+                    try:
+                        request['NextToken'] = base64.b64decode(cursor, altchars=b'-_', validate=True).decode('utf-8')
+                    except (ValueError, UnicodeError):
+                        request['NextToken'] = ''
+                    if not request['NextToken']:
+                        return {"error": "Invalid cursor"}
                 
-                # Create volume info object
-                volume_info = {
-                    "volume_id": volume_id,
-                    "size": size,
-                    "volume_type": volume_type,
-                    "state": state,
-                    "iops": iops,
-                    "throughput": throughput,
-                    "attached_instance": attached_instance,
-                    "device": device,
-                    "availability_zone": availability_zone,
-                    "encrypted": encrypted
-                }
+                response = self.ec2_client.describe_volumes(**request)
+                volumes_info = [self._format_volume(volume) for volume in response.get('Volumes', [])]
                 
-                volumes_info.append(volume_info)
+                next_token = response.get('NextToken')
+                next_cursor = base64.urlsafe_b64encode(next_token.encode('utf-8')).decode('ascii') if next_token else None
             
             logger.info(f"Successfully listed {len(volumes_info)} EBS volumes")
-            return {"volumes": volumes_info}
+            return {"volumes": volumes_info, "next_cursor": next_cursor}
             
         except ClientError as e:
             error_code = e.response['Error']['Code']
@@ -99,15 +121,99 @@ class EBSService:
             logger.error(f"Unexpected error listing volumes: {str(e)}")
             return {"error": f"Unexpected error: {str(e)}"}
 
-    def get_volume_metrics(self, volume_id, period=3600, start_time=None, end_time=None):
+    def _build_volume_filters(self, filters):
+        """
+        Translate list_volumes filters into DescribeVolumes Filters
+        
+        Args:
+            filters: Dict of filter name to value
+            
+        Returns:
+            list: DescribeVolumes Filters
+        """
+        volume_filters = []
+        
+        for name, aws_name in self.VOLUME_FILTERS.items():
+            value = filters.get(name)
+            if value is None or value == '':
+                continue
+            if isinstance(value, bool):
+                value = 'true' if value else 'false'
+            volume_filters.append({'Name': aws_name, 'Values': str(value).split(',')})
+        
+        tag = filters.get('tag')
+        if tag:
+            if '=' in tag:
+                tag_key, tag_value = tag.split('=', 1)
+                volume_filters.append({'Name': f'tag:{tag_key}', 'Values': tag_value.split(',')})
+            else:
+                volume_filters.append({'Name': 'tag-key', 'Values': [tag]})
+        
+        return volume_filters
+
+    def _format_volume(self, volume):
+        """
+        Convert a DescribeVolumes entry into the volume info returned by the API
+        
+        Args:
+            volume: Volume entry from DescribeVolumes
+            
+        Returns:
+            dict: Volume details
+        """
+        # Extract attachment information if available
+        attached_instance = ''
+        device = ''
+        
+        if volume.get('Attachments'):
+            attachment = volume['Attachments'][0]  # Get first attachment
+            attached_instance = attachment.get('InstanceId', '')
+            device = attachment.get('Device', '')
+        
+        return {
+            "volume_id": volume.get('VolumeId', ''),
+            "size": volume.get('Size', 0),
+            "volume_type": volume.get('VolumeType', ''),
+            "state": volume.get('State', ''),
+            "iops": volume.get('Iops', 0),
+            "throughput": volume.get('Throughput', 0),
+            "attached_instance": attached_instance,
+            "device": device,
+            "availability_zone": volume.get('AvailabilityZone', ''),
+            "encrypted": volume.get('Encrypted', False)
+        }
+
+    # CloudWatch metrics reported by get_volume_metrics, keyed by AWS metric name
+    VOLUME_METRICS = {
+        'VolumeReadOps': 'read_ops',
+        'VolumeWriteOps': 'write_ops',
+        'VolumeReadBytes': 'read_bytes',
+        'VolumeWriteBytes': 'write_bytes',
+        'VolumeQueueLength': 'queue_length'
+    }
+
+    # GetMetricData accepts at most this many queries per call
+    MAX_METRIC_QUERIES = 500
+
+    # Statistics accepted besides percentiles such as p99 or p99.9
+    STATISTICS = ('Average', 'Sum', 'Minimum', 'Maximum', 'SampleCount')
+
+    def get_volume_metrics(self, volume_id, period=3600, start_time=None, end_time=None, stats=None):
         """
         Get CloudWatch metrics for a specific EBS volume
         
+        Every metric and statistic is fetched in a single GetMetricData batch, and
+        the volume existence check runs concurrently with it. Datapoints for closed
+        periods are cached, so repeated calls only fetch the missing ranges.
+        
         Args:
             volume_id: The ID of the EBS volume
             period: Time period in seconds (default: 1 hour)
             start_time: Start time for metrics (default: 24 hours ago)
             end_time: End time for metrics (default: now)
+            stats: Optional list of statistics, e.g. ['Average', 'Maximum', 'p99'].
+                When given, each metric maps to a dict of statistic to datapoints;
+                otherwise each metric maps to its Average datapoints
             
         Returns:
             dict: Dictionary with volume metrics
@@ -115,78 +221,47 @@ class EBSService:
         try:
             logger.debug(f"Getting metrics for volume: {volume_id}")
             
-            # Set default time range if not provided
-            if end_time is None:
-                end_time = datetime.utcnow()
-            if start_time is None:
-                start_time = end_time - timedelta(hours=24)
-                
-            # Convert datetime objects to strings if needed
-            if isinstance(start_time, str):
-                start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-            if isinstance(end_time, str):
-                end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-            
-            # Define metrics to retrieve
-            metric_names = {
-                'VolumeReadOps': 'read_ops',
-                'VolumeWriteOps': 'write_ops',
-                'VolumeReadBytes': 'read_bytes',
-                'VolumeWriteBytes': 'write_bytes',
-                'VolumeQueueLength': 'queue_length'
-            }
+            start_time, end_time = self._resolve_time_range(start_time, end_time)
             
-            metrics_data = {}
+            requested_stats = stats or ['Average']
+            invalid_stats = [stat for stat in requested_stats if not self._is_valid_statistic(stat)]
+            if invalid_stats:
+                return {"error": f"Unsupported statistics: {', '.join(invalid_stats)}"}
             
-            # Fetch each metric
-            for aws_metric_name, api_metric_name in metric_names.items():
-                try:
-                    response = self.cloudwatch_client.get_metric_data(
-                        MetricDataQueries=[
-                            {
-                                'Id': 'metric1',
-                                'MetricStat': {
-                                    'Metric': {
-                                        'Namespace': 'AWS/EBS',
-                                        'MetricName': aws_metric_name,
-                                        'Dimensions': [
-                                            {
-                                                'Name': 'VolumeId',
-                                                'Value': volume_id
-                                            }
-                                        ]
-                                    },
-                                    'Period': period,
-                                    'Stat': 'Average'
-                                },
-                                'ReturnData': True
-                            }
-                        ],
-                        StartTime=start_time,
-                        EndTime=end_time
-                    )
-                    
-                    # Format response data
-                    formatted_data = []
-                    timestamps = response['MetricDataResults'][0]['Timestamps']
-                    values = response['MetricDataResults'][0]['Values']
-                    
-                    for i in range(len(timestamps)):
-                        formatted_data.append({
-                            'timestamp': timestamps[i].isoformat() + 'Z',
-                            'value': values[i]
-                        })
-                    
+            # Verify volume exists while the metrics are fetched
+            exists_future = None
+            if not in_shared_worker():
+                exists_future = submit_in_context(get_shared_executor(), self._volume_exists, volume_id)
+            
+            # Build one query per metric and statistic
+            queries = []
+            query_keys = {}
+            for i, (aws_metric_name, api_metric_name) in enumerate(self.VOLUME_METRICS.items()):
+                for j, stat in enumerate(requested_stats):
+                    query_id = f"m{i}_{j}"
+                    query_keys[query_id] = (api_metric_name, stat)
+                    queries.append(self._build_metric_query(query_id, volume_id, aws_metric_name, stat, period))
+            
+            series = self._fetch_cached_metric_data(volume_id, queries, period, start_time, end_time)
+            
+            # Format response data
+            metrics_data = {}
+            for query_id, (api_metric_name, stat) in query_keys.items():
+                formatted_data = [
+                    {
+                        'timestamp': timestamp.isoformat() + 'Z',
+                        'value': value
+                    }
+                    for timestamp, value in series.get(query_id, [])
+                ]
+                
+                if stats:
+                    metrics_data.setdefault(api_metric_name, {})[stat] = formatted_data
+                else:
                     metrics_data[api_metric_name] = formatted_data
-                    
-                except Exception as e:
-                    logger.warning(f"Error retrieving metric {aws_metric_name}: {str(e)}")
-                    metrics_data[api_metric_name] = []
             
-            # Verify volume exists
-            try:
-                self.ec2_client.describe_volumes(VolumeIds=[volume_id])
-            except ClientError:
+            volume_exists = exists_future.result() if exists_future else self._volume_exists(volume_id)
+            if not volume_exists:
                 return {"error": f"Volume {volume_id} not found"}
             
             result = {
@@ -204,4 +279,316 @@ class EBSService:
             return {"error": f"AWS Error: {error_message}"}
         except Exception as e:
             logger.error(f"Unexpected error getting volume metrics: {str(e)}")
-            return {"error": f"Unexpected error: {str(e)}"}
\ No newline at end of file
+            return {"error": f"Unexpected error: {str(e)}"}
+
+    def iter_fleet_metrics(self, volume_ids=None, filters=None, period=3600, start_time=None,
+                           end_time=None, stat='Average', include_datapoints=False):
+        """
+        Get CloudWatch metrics for many EBS volumes at once
+        
+        Queries for all volumes are packed into GetMetricData batches of up to 500
+        queries. Batches run concurrently and results are yielded per volume as
+        soon as their batch completes, so callers can stream them. Arguments are
+        validated and the volumes listed before anything is yielded, so callers
+        can reject a bad request before starting a streamed response.
+        
+        Args:
+            volume_ids: Optional list of volume IDs; when omitted, every volume
+                matching filters is used
+            filters: Optional list_volumes filters, used when volume_ids is omitted
+            period: Time period in seconds (default: 1 hour)
+            start_time: Start time for metrics (default: 24 hours ago)
+            end_time: End time for metrics (default: now)
+            stat: Statistic to fetch for every metric (default: Average)
+            include_datapoints: Also return the datapoints behind the summary
+            
+        Returns:
+            dict or iterator: An 'error' dict if the arguments are invalid or the
+                volumes could not be listed, otherwise an iterator of per-volume
+                results with a 'summary' of mean and max per metric and the peak
+                queue length, or an 'error'
+        """
+        if not self._is_valid_statistic(stat):
+            return {"error": f"Unsupported statistic: {stat}"}
+        
+        if period <= 0 or (period >= 60 and period % 60 != 0):
+            return {"error": f"Invalid period: {period}"}
+        
+        try:
+            start_time, end_time = self._resolve_time_range(start_time, end_time)
+        except ValueError as e:
+            return {"error": f"Invalid time range: {str(e)}"}
+        
+        if volume_ids is None:
+            volumes = self.list_volumes(filters=filters)
+            if 'error' in volumes:
+                return volumes
+            volume_ids = [volume['volume_id'] for volume in volumes['volumes']]
+        
+        return self._iter_fleet_batches(volume_ids, period, start_time, end_time, stat, include_datapoints)
+
+    def _iter_fleet_batches(self, volume_ids, period, start_time, end_time, stat, include_datapoints):
+        """Yield per-volume results of validated fleet arguments as their batches complete"""
+        # Every volume needs one query per metric plus one for its peak queue length
+        queries_per_volume = len(self.VOLUME_METRICS) + 1
+        volumes_per_batch = self.MAX_METRIC_QUERIES // queries_per_volume
+        batches = [
+            volume_ids[i:i + volumes_per_batch]
+            for i in range(0, len(volume_ids), volumes_per_batch)
+        ]
+        logger.debug(f"Fetching metrics for {len(volume_ids)} volumes in {len(batches)} batches")
+        
+        def fetch_batch(batch):
+            return self._fetch_fleet_batch(batch, period, start_time, end_time, stat, include_datapoints)
+        
+        for batch_results in bounded_imap_unordered(fetch_batch, batches, Config.EBS_METRICS_BATCH_CONCURRENCY):
+            for volume_result in batch_results:
+                yield volume_result
+
+    def _fetch_fleet_batch(self, volume_ids, period, start_time, end_time, stat, include_datapoints):
+        """
+        Fetch and summarize metrics for one batch of volumes
+        
+        Args:
+            volume_ids: Volume IDs in this batch
+            period: Time period in seconds
+            start_time: Start of the time range
+            end_time: End of the time range
+            stat: Statistic to fetch for every metric
+            include_datapoints: Also return the datapoints behind the summary
+            
+        Returns:
+            list: Per-volume results
+        """
+        queries = []
+        for v, volume_id in enumerate(volume_ids):
+            for m, aws_metric_name in enumerate(self.VOLUME_METRICS):
+                queries.append(self._build_metric_query(f"v{v}_m{m}", volume_id, aws_metric_name, stat, period))
+            queries.append(self._build_metric_query(f"v{v}_peak", volume_id, 'VolumeQueueLength', 'Maximum', period))
+        
+        try:
+            series = self._fetch_metric_data(queries, start_time, end_time)
+        except ClientError as e:
+            error_message = e.response['Error']['Message']
+            logger.error(f"AWS CloudWatch Error for metrics batch: {error_message}")
+            return [{"volume_id": volume_id, "error": f"AWS Error: {error_message}"} for volume_id in volume_ids]
+        except Exception as e:
+            logger.error(f"Unexpected error fetching metrics batch: {str(e)}")
+            return [{"volume_id": volume_id, "error": f"Unexpected error: {str(e)}"} for volume_id in volume_ids]
+        
+        results = []
+        for v, volume_id in enumerate(volume_ids):
+            summary = {}
+            datapoints = {}
+            for m, api_metric_name in enumerate(self.VOLUME_METRICS.values()):
+                points = series.get(f"v{v}_m{m}", [])
+                values = [value for _, value in points]
+                summary[api_metric_name] = {
+                    "mean": sum(values) / len(values) if values else None,
+                    "max": max(values) if values else None
+                }
+                if include_datapoints:
+                    datapoints[api_metric_name] = [
+                        {'timestamp': timestamp.isoformat() + 'Z', 'value': value}
+                        for timestamp, value in points
+                    ]
+            
+            peak_values = [value for _, value in series.get(f"v{v}_peak", [])]
+            summary["peak_queue_length"] = max(peak_values) if peak_values else None
+            
+            volume_result = {"volume_id": volume_id, "summary": summary}
+            if include_datapoints:
+                volume_result["metrics"] = datapoints
+            results.append(volume_result)
+        
+        return results
+
+    def _resolve_time_range(self, start_time, end_time):
+        """
+        Apply the default 24 hour window and parse ISO 8601 strings
+        
+        Args:
+            start_time: Start time as datetime, ISO 8601 string or None
+            end_time: End time as datetime, ISO 8601 string or None
+            
+        Returns:
+            tuple: (start_time, end_time) as datetimes
+        """
+        # Set default time range if not provided
+        if end_time is None:
+            end_time = datetime.utcnow()
+        if start_time is None:
+            start_time = end_time - timedelta(hours=24)
+            
+        # Convert strings to datetime objects if needed
+        if isinstance(start_time, str):
+            start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+        if isinstance(end_time, str):
+            end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+        
+        return start_time, end_time
+
+    def _is_valid_statistic(self, stat):
+        """Return True for a CloudWatch statistic or a percentile such as p99"""
+        return stat in self.STATISTICS or re.fullmatch(r'p\d{1,2}(\.\d+)?', stat) is not None
+
+    def _volume_exists(self, volume_id):
+        """
+        Check whether a volume exists
+        
+        Args:
+            volume_id: The ID of the EBS volume
+            
+        Returns:
+            bool: False if EC2 does not know the volume
+        """
+        try:
+            self.ec2_client.describe_volumes(VolumeIds=[volume_id])
+            return True
+        except ClientError:
+            return False
+
+    def _build_metric_query(self, query_id, volume_id, aws_metric_name, stat, period):
+        """
+        Build a GetMetricData query for one EBS volume metric
+        
+        Args:
+            query_id: Unique query ID within the batch
+            volume_id: The ID of the EBS volume
+            aws_metric_name: CloudWatch metric name, e.g. 'VolumeReadOps'
+            stat: Statistic to return
+            period: Time period in seconds
+            
+        Returns:
+            dict: MetricDataQuery
+        """
+        return {
+            'Id': query_id,
+            'MetricStat': {
+                'Metric': {
+                    'Namespace': 'AWS/EBS',
+                    'MetricName': aws_metric_name,
+                    'Dimensions': [
+                        {
+                            'Name': 'VolumeId',
+                            'Value': volume_id
+                        }
+                    ]
+                },
+                'Period': period,
+                'Stat': stat
+            },
+            'ReturnData': True
+        }
+
+    def _fetch_cached_metric_data(self, volume_id, queries, period, start_time, end_time):
+        """
+        Get datapoints for a volume's metric queries, using the datapoint cache
+        
+        Only ranges missing from the cache are fetched. Queries that miss the same
+        range, typically the still-open tail, share a single GetMetricData call.
+        
+        Args:
+            volume_id: The ID of the EBS volume
+            queries: List of MetricDataQuery dicts for this volume
+            period: Time period in seconds
+            start_time: Start of the time range
+            end_time: End of the time range
+            
+        Returns:
+            dict: Query ID to a list of (timestamp, value) tuples, newest first
+        """
+        start = align_down(self._to_epoch(start_time), period)
+        end = self._to_epoch(end_time)
+        closed_before = metric_datapoint_cache.closed_before(time.time(), period)
+        
+        keys = {
+            query['Id']: (
+                self.aws_access_key_id,
+                self.region,
+                volume_id,
+                query['MetricStat']['Metric']['MetricName'],
+                query['MetricStat']['Stat'],
+                period
+            )
+            for query in queries
+        }
+        
+        # Group queries by missing range so series sharing a gap share one call
+        queries_by_range = defaultdict(list)
+        for query in queries:
+            for missing_range in metric_datapoint_cache.missing_ranges(keys[query['Id']], start, end):
+                queries_by_range[missing_range].append(query)
+        
+        open_points = defaultdict(dict)
+        for (range_start, range_end), range_queries in queries_by_range.items():
+            try:
+                fetched = self._fetch_metric_data(
+                    range_queries,
+                    datetime.fromtimestamp(range_start, tz=timezone.utc),
+                    datetime.fromtimestamp(range_end, tz=timezone.utc)
+                )
+            except Exception as e:
+                logger.warning(f"Error retrieving metrics for volume {volume_id}: {str(e)}")
+                continue
+            
+            for query in range_queries:
+                points = [(int(timestamp.timestamp()), value) for timestamp, value in fetched.get(query['Id'], [])]
+                covered_end = metric_datapoint_cache.store(
+                    keys[query['Id']], range_start, range_end, period, points, closed_before
+                )
+                
+                # Open or partial periods are returned but never cached
+                for timestamp, value in points:
+                    if timestamp >= covered_end:
+                        open_points[query['Id']][timestamp] = value
+        
+        series = {}
+        for query in queries:
+            merged = metric_datapoint_cache.get_points(keys[query['Id']], start, end)
+            merged.update(open_points[query['Id']])
+            series[query['Id']] = [
+                (datetime.fromtimestamp(timestamp, tz=timezone.utc), value)
+                for timestamp, value in sorted(merged.items(), reverse=True)
+            ]
+        
+        return series
+
+    @staticmethod
+    def _to_epoch(value):
+        """Convert a datetime to Unix seconds, treating naive datetimes as UTC"""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+
+    def _fetch_metric_data(self, queries, start_time, end_time):
+        """
+        Run a GetMetricData batch, following NextToken until every page is read
+        
+        Args:
+            queries: List of MetricDataQuery dicts (at most 500)
+            start_time: Start of the time range
+            end_time: End of the time range
+            
+        Returns:
+            dict: Query ID to a list of (timestamp, value) tuples
+        """
+        series = {query['Id']: [] for query in queries}
+        request = {
+            'MetricDataQueries': queries,
+            'StartTime': start_time,
+            'EndTime': end_time
+        }
+        
+        while True:
+            response = self.cloudwatch_client.get_metric_data(**request)
+            
+            for result in response.get('MetricDataResults', []):
+                series.setdefault(result['Id'], []).extend(
+                    zip(result.get('Timestamps', []), result.get('Values', []))
+                )
+            
+            next_token = response.get('NextToken')
+            if not next_token:
+                return series
+            request['NextToken'] = next_token
@@ -1,14 +1,22 @@
 # app/services/ecs_service.py
-import boto3
 import logging
 from botocore.exceptions import ClientError
+from app.config.config import Config
+from app.utils.client_pool import client_pool
+from app.utils.concurrency import bounded_imap_unordered, bounded_map
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 class ECSService:
-    def __init__(self, aws_access_key_id, aws_secret_access_key, region):
+    # describe_clusters accepts at most this many clusters per call
+    DESCRIBE_CLUSTERS_BATCH_SIZE = 100
+
+    # describe_services accepts at most this many services per call
+    DESCRIBE_SERVICES_BATCH_SIZE = 10
+
+    def __init__(self, aws_access_key_id, aws_secret_access_key, region, aws_session_token=None):
         """
         Initialize the ECS service with AWS credentials
         
@@ -16,22 +24,32 @@ class ECSService:
             aws_access_key_id: AWS access key ID
             aws_secret_access_key: AWS secret access key
             region: AWS region
+            aws_session_token: Session token for temporary credentials, e.g. from AssumeRole
         """
-        # Initialize ECS client
-        self.client = boto3.client(
+        # Get ECS client from the shared pool
+        self.client = client_pool.get_client(
             'ecs',
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
-            region_name=region
+            aws_session_token=aws_session_token,
+            region=region
         )
         
+        self.aws_access_key_id = aws_access_key_id
         self.region = region
         logger.debug(f"Initialized ECS service for region {region}")
 
-    def list_clusters(self):
+    def list_clusters(self, exact_counts=False):
         """
         List all ECS clusters with detailed information
         
+        Task and container instance counts come from the cluster statistics that
+        describe_clusters already returns. With exact_counts, tasks and container
+        instances are instead counted by paginated listing, clusters in parallel.
+        
+        Args:
+            exact_counts: Count tasks and container instances by listing them
+        
         Returns:
             dict: Dictionary with a 'clusters' key containing a list of cluster details
         """
@@ -39,57 +57,50 @@ class ECSService:
             logger.debug("Attempting to list ECS clusters")
             
             # Get all cluster ARNs
-            response = self.client.list_clusters()
-            cluster_arns = response.get('clusterArns', [])
+            cluster_arns = []
+            paginator = self.client.get_paginator('list_clusters')
+            for page in paginator.paginate():
+                cluster_arns.extend(page.get('clusterArns', []))
             
             if not cluster_arns:
                 logger.info("No ECS clusters found")
                 return {"clusters": []}
             
-            # Get detailed information for each cluster
-            clusters_info = []
+            # Describe clusters in chunks of 100 (AWS API limit)
+            chunks = [
+                cluster_arns[i:i + self.DESCRIBE_CLUSTERS_BATCH_SIZE]
+                for i in range(0, len(cluster_arns), self.DESCRIBE_CLUSTERS_BATCH_SIZE)
+            ]
+            described = bounded_map(self._describe_clusters, chunks, max_workers=Config.ECS_CLUSTER_CONCURRENCY)
             
-            # Describe clusters to get more details
-            describe_response = self.client.describe_clusters(
-                clusters=cluster_arns,
-                include=['SETTINGS', 'STATISTICS', 'TAGS']
-            )
+            clusters_info = []
+            for clusters in described:
+                for cluster in clusters:
+                    # Extract cluster name from ARN
+                    cluster_arn = cluster.get('clusterArn', '')
+                    cluster_name = cluster.get('clusterName', '') or cluster_arn.split('/')[-1]
+                    
+                    # Create cluster info object
+                    cluster_info = {
+                        "cluster_name": cluster_name,
+                        "cluster_arn": cluster_arn,
+                        "status": cluster.get('status', 'INACTIVE'),
+                        "registered_container_instances_count": cluster.get('registeredContainerInstancesCount', 0),
+                        "running_tasks_count": cluster.get('runningTasksCount', 0),
+                        "pending_tasks_count": cluster.get('pendingTasksCount', 0),
+                        "active_services_count": cluster.get('activeServicesCount', 0)
+                    }
+                    
+                    clusters_info.append(cluster_info)
             
-            for cluster in describe_response.get('clusters', []):
-                # Extract cluster name from ARN
-                cluster_arn = cluster.get('clusterArn', '')
-                cluster_name = cluster.get('clusterName', '') or cluster_arn.split('/')[-1]
-                
-                # Get running and pending tasks count
-                tasks_response = self.client.list_tasks(
-                    cluster=cluster_arn,
-                    desiredStatus='RUNNING'
-                )
-                running_tasks_count = len(tasks_response.get('taskArns', []))
-                
-                pending_tasks_response = self.client.list_tasks(
-                    cluster=cluster_arn,
-                    desiredStatus='PENDING'
-                )
-                pending_tasks_count = len(pending_tasks_response.get('taskArns', []))
-                
-                # Get container instances count
-                container_instances_response = self.client.list_container_instances(
-                    cluster=cluster_arn
+            if exact_counts:
+                exact = bounded_map(
+                    self._count_cluster_resources,
+                    [cluster_info["cluster_arn"] for cluster_info in clusters_info],
+                    max_workers=Config.ECS_CLUSTER_CONCURRENCY
                 )
-                registered_container_instances_count = len(container_instances_response.get('containerInstanceArns', []))
-                
-                # Create cluster info object
-                cluster_info = {
-                    "cluster_name": cluster_name,
-                    "cluster_arn": cluster_arn,
-                    "status": cluster.get('status', 'INACTIVE'),
-                    "registered_container_instances_count": registered_container_instances_count,
-                    "running_tasks_count": running_tasks_count,
-                    "pending_tasks_count": pending_tasks_count
-                }
-                
-                clusters_info.append(cluster_info)
+                for cluster_info, counts in zip(clusters_info, exact):
+                    cluster_info.update(counts)
             
             logger.info(f"Successfully listed {len(clusters_info)} ECS clusters")
             return {"clusters": clusters_info}
@@ -103,10 +114,52 @@ class ECSService:
             logger.error(f"Unexpected error listing clusters: {str(e)}")
             return {"error": f"Unexpected error: {str(e)}"}
 
+    def _describe_clusters(self, cluster_arns):
+        """
+        Describe up to 100 clusters in one call
+        
+        Args:
+            cluster_arns: List of cluster ARNs
+        
+        Returns:
+            list: Cluster descriptions
+        """
+        response = self.client.describe_clusters(
+            clusters=cluster_arns,
+            include=['SETTINGS', 'STATISTICS', 'TAGS']
+        )
+        return response.get('clusters', [])
+
+    def _count_cluster_resources(self, cluster_arn):
+        """
+        Count running and pending tasks and container instances by listing them
+        
+        Args:
+            cluster_arn: The ARN of the ECS cluster
+        
+        Returns:
+            dict: Exact running task, pending task and container instance counts
+        """
+        def count(operation, result_key, **kwargs):
+            paginator = self.client.get_paginator(operation)
+            return sum(
+                len(page.get(result_key, []))
+                for page in paginator.paginate(cluster=cluster_arn, **kwargs)
+            )
+        
+        return {
+            "running_tasks_count": count('list_tasks', 'taskArns', desiredStatus='RUNNING'),
+            "pending_tasks_count": count('list_tasks', 'taskArns', desiredStatus='PENDING'),
+            "registered_container_instances_count": count('list_container_instances', 'containerInstanceArns')
+        }
+
     def list_services(self, cluster_name):
         """
         List all services in a specific ECS cluster
         
+        Every list_services page is read, and the describe_services batches of 10
+        are sent concurrently.
+        
         Args:
             cluster_name: The name or ARN of the ECS cluster
         
@@ -117,56 +170,19 @@ class ECSService:
             logger.debug(f"Listing services for cluster: {cluster_name}")
             
             # List service ARNs
-            response = self.client.list_services(
-                cluster=cluster_name
-            )
-            
-            service_arns = response.get('serviceArns', [])
+            service_arns = self._list_service_arns(cluster_name)
             
             if not service_arns:
                 logger.info(f"No services found in cluster: {cluster_name}")
                 return {"services": []}
             
-            # Get detailed information for each service
-            services_info = []
-            
-            # Process services in batches of 10 (AWS API limit)
-            for i in range(0, len(service_arns), 10):
-                batch = service_arns[i:i+10]
-                
-                # Describe services to get more details
-                describe_response = self.client.describe_services(
-                    cluster=cluster_name,
-                    services=batch
-                )
-                
-                for service in describe_response.get('services', []):
-                    # Extract service details
-                    service_name = service.get('serviceName', '')
-                    service_arn = service.get('serviceArn', '')
-                    
-                    # Determine deployment status
-                    deployment_status = "NONE"
-                    if service.get('deployments'):
-                        primary_deployment = next(
-                            (d for d in service['deployments'] if d.get('status') == 'PRIMARY'), 
-                            None
-                        )
-                        if primary_deployment:
-                            deployment_status = "PRIMARY"
-                    
-                    # Create service info object
-                    service_info = {
-                        "service_name": service_name,
-                        "service_arn": service_arn,
-                        "status": service.get('status', 'INACTIVE'),
-                        "desired_count": service.get('desiredCount', 0),
-                        "running_count": service.get('runningCount', 0),
-                        "pending_count": service.get('pendingCount', 0),
-                        "deployment_status": deployment_status
-                    }
-                    
-                    services_info.append(service_info)
+            # Describe services in batches of 10 (AWS API limit), keeping their order
+            described = bounded_map(
+                lambda batch: self._describe_services(cluster_name, batch),
+                self._batch_service_arns(service_arns),
+                max_workers=Config.ECS_DESCRIBE_CONCURRENCY
+            )
+            services_info = [service_info for batch in described for service_info in batch]
             
             logger.info(f"Successfully listed {len(services_info)} services for cluster {cluster_name}")
             return {"services": services_info}
@@ -180,6 +196,115 @@ class ECSService:
             logger.error(f"Unexpected error listing services: {str(e)}")
             return {"error": f"Unexpected error: {str(e)}"}
 
+    def iter_services(self, cluster_name):
+        """
+        Stream the services of a specific ECS cluster
+        
+        Each list_services page is described as soon as it arrives, and services
+        are yielded as their describe_services batch completes, so the first
+        results are available long before the last batch of a large cluster.
+        
+        Args:
+            cluster_name: The name or ARN of the ECS cluster
+        
+        Yields:
+            dict: Service details, or a single {'error': ...} dict if listing fails
+        """
+        try:
+            logger.debug(f"Streaming services for cluster: {cluster_name}")
+            
+            paginator = self.client.get_paginator('list_services')
+            for page in paginator.paginate(cluster=cluster_name, PaginationConfig={'PageSize': 100}):
+                batches = self._batch_service_arns(page.get('serviceArns', []))
+                described = bounded_imap_unordered(
+                    lambda batch: self._describe_services(cluster_name, batch),
+                    batches,
+                    max_workers=Config.ECS_DESCRIBE_CONCURRENCY
+                )
+                for batch in described:
+                    for service_info in batch:
+                        yield service_info
+            
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            logger.error(f"AWS ECS Error: {error_code} - {error_message}")
+            yield {"error": f"AWS Error: {error_message}"}
+        except Exception as e:
+            logger.error(f"Unexpected error streaming services: {str(e)}")
+            yield {"error": f"Unexpected error: {str(e)}"}
+
+    def _list_service_arns(self, cluster_name):
+        """
+        List every service ARN in a cluster, following nextToken
+        
+        Args:
+            cluster_name: The name or ARN of the ECS cluster
+        
+        Returns:
+            list: Service ARNs
+        """
+        service_arns = []
+        paginator = self.client.get_paginator('list_services')
+        for page in paginator.paginate(cluster=cluster_name, PaginationConfig={'PageSize': 100}):
+            service_arns.extend(page.get('serviceArns', []))
+        return service_arns
+
+    def _batch_service_arns(self, service_arns):
+        """Split service ARNs into describe_services sized batches"""
+        return [
+            service_arns[i:i + self.DESCRIBE_SERVICES_BATCH_SIZE]
+            for i in range(0, len(service_arns), self.DESCRIBE_SERVICES_BATCH_SIZE)
+        ]
+
+    def _describe_services(self, cluster_name, service_arns):
+        """
+        Describe one batch of up to 10 services
+        
+        Args:
+            cluster_name: The name or ARN of the ECS cluster
+            service_arns: Service ARNs in this batch
+        
+        Returns:
+            list: Service details
+        """
+        # Describe services to get more details
+        describe_response = self.client.describe_services(
+            cluster=cluster_name,
+            services=service_arns
+        )
+        
+        services_info = []
+        for service in describe_response.get('services', []):
+            # Extract service details
+            service_name = service.get('serviceName', '')
+            service_arn = service.get('serviceArn', '')
+            
+            # Determine deployment status
+            deployment_status = "NONE"
+            if service.get('deployments'):
+                primary_deployment = next(
+                    (d for d in service['deployments'] if d.get('status') == 'PRIMARY'), 
+                    None
+                )
+                if primary_deployment:
+                    deployment_status = "PRIMARY"
+            
+            # Create service info object
+            service_info = {
+                "service_name": service_name,
+                "service_arn": service_arn,
+                "status": service.get('status', 'INACTIVE'),
+                "desired_count": service.get('desiredCount', 0),
+                "running_count": service.get('runningCount', 0),
+                "pending_count": service.get('pendingCount', 0),
+                "deployment_status": deployment_status
+            }
+            
+            services_info.append(service_info)
+        
+        return services_info
+
     def get_cluster_details(self, cluster_name):
         """
         Get detailed information about a specific ECS cluster
@@ -212,10 +337,7 @@ class ECSService:
             extracted_name = cluster.get('clusterName', '') or cluster_arn.split('/')[-1]
             
             # List services in the cluster
-            services_response = self.client.list_services(
-                cluster=cluster_name
-            )
-            services = services_response.get('serviceArns', [])
+            services = self._list_service_arns(cluster_name)
             
             # Create cluster details object
             details = {
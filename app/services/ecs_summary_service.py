@@ -0,0 +1,142 @@
+# app/services/ecs_summary_service.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from app.config.config import Config
+from app.utils.concurrency import bounded_map
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class ECSSummaryAggregator:
+    """
+    Computes the dashboard's ECS totals with as few API calls as possible.
+
+    Cluster, service and task totals come straight from the cluster statistics
+    returned by ECSService.list_clusters. Only the unhealthy service count needs
+    the services themselves, so it is computed per cluster and cached together
+    with a fingerprint of the cluster's statistics. On the next refresh a
+    cluster is only re-queried if its fingerprint changed or its cached result
+    is older than max_age seconds.
+    """
+
+    def __init__(self, max_age, max_entries):
+        """
+        Initialize the aggregator
+
+        Args:
+            max_age: Seconds after which a cluster's unhealthy count is recomputed
+                even if its statistics did not change
+            max_entries: Maximum number of cached clusters, evicted in LRU order
+        """
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._clusters = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(cluster):
+        return (
+            cluster.get('status'),
+            cluster.get('active_services_count', 0),
+            cluster.get('running_tasks_count', 0),
+            cluster.get('pending_tasks_count', 0)
+        )
+
+    @staticmethod
+    def is_unhealthy(service):
+        """A service is unhealthy if it is not ACTIVE or runs fewer tasks than desired"""
+        return (
+            service.get('status') != 'ACTIVE' or
+            service.get('running_count', 0) < service.get('desired_count', 0)
+        )
+
+    def summarize(self, ecs_service):
+        """
+        Compute ECS totals for every cluster visible to an ECSService
+
+        Args:
+            ecs_service: ECSService for the account and region to summarize
+
+        Returns:
+            dict: Cluster, service, task and unhealthy service totals
+
+        Raises:
+            RuntimeError: If the clusters could not be listed, or a changed
+                cluster's services could not be listed and nothing is cached for it
+        """
+        clusters_response = ecs_service.list_clusters()
+        if 'error' in clusters_response:
+            raise RuntimeError(clusters_response['error'])
+        clusters = clusters_response.get('clusters', [])
+
+        now = time.monotonic()
+        unhealthy = {}
+        changed = []
+
+        with self._lock:
+            for cluster in clusters:
+                key = (ecs_service.aws_access_key_id, ecs_service.region, cluster['cluster_arn'])
+                cached = self._clusters.get(key)
+
+                if not cluster.get('active_services_count'):
+                    unhealthy[key] = 0
+                elif (cached is not None and
+                        cached['fingerprint'] == self._fingerprint(cluster) and
+                        now - cached['computed_at'] < self.max_age):
+                    self._clusters.move_to_end(key)
+                    unhealthy[key] = cached['unhealthy']
+                else:
+                    changed.append((key, cluster))
+
+        logger.debug(f"Recomputing {len(changed)} of {len(clusters)} ECS clusters")
+
+        def count_unhealthy(item):
+            key, cluster = item
+            services_response = ecs_service.list_services(cluster['cluster_arn'])
+            if 'error' in services_response:
+                return key, cluster, None, services_response['error']
+            count = sum(1 for service in services_response.get('services', []) if self.is_unhealthy(service))
+            return key, cluster, count, None
+
+        for key, cluster, count, error in bounded_map(count_unhealthy, changed, Config.ECS_CLUSTER_CONCURRENCY):
+            with self._lock:
+                if error is None:
+                    self._clusters[key] = {
+                        'fingerprint': self._fingerprint(cluster),
+                        'unhealthy': count,
+                        'computed_at': now
+                    }
+                    self._clusters.move_to_end(key)
+                    while len(self._clusters) > self.max_entries:
+                        self._clusters.popitem(last=False)
+                    unhealthy[key] = count
+                    continue
+
+                # Fall back to the last known count for this cluster
+                cached = self._clusters.get(key)
+            if cached is None:
+                raise RuntimeError(error)
+            logger.warning(f"Using cached ECS counts for {cluster['cluster_name']}: {error}")
+            unhealthy[key] = cached['unhealthy']
+
+        return {
+            "total_clusters": len(clusters),
+            "total_services": sum(cluster.get('active_services_count', 0) for cluster in clusters),
+            "total_tasks": sum(
+                cluster.get('running_tasks_count', 0) + cluster.get('pending_tasks_count', 0)
+                for cluster in clusters
+            ),
+            "unhealthy_services": sum(unhealthy.values())
+        }
+
+
+# Shared aggregator used by DashboardService
+ecs_summary_aggregator = ECSSummaryAggregator(
+    max_age=Config.ECS_SUMMARY_MAX_AGE_SECONDS,
+    max_entries=Config.ECS_SUMMARY_MAX_CLUSTERS
+)
@@ -0,0 +1,193 @@
+# app/services/inventory_crawler.py
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config.config import Config
+from app.models.snapshot_store import snapshot_store
+from app.services.s3_service import S3Service
+from app.services.ecs_service import ECSService
+from app.services.ebs_service import EBSService
+from app.utils.cache import cache_key, is_error_response
+from app.utils.singleflight import singleflight
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Operations crawled for every target, keyed by the same names the response cache uses
+CRAWL_OPERATIONS = {
+    's3.list_buckets': lambda key, secret, region: S3Service(key, secret, region).list_buckets(),
+    'ecs.list_clusters': lambda key, secret, region: ECSService(key, secret, region).list_clusters(),
+    'ebs.list_volumes': lambda key, secret, region: EBSService(key, secret, region).list_volumes()
+}
+
+
+class InventoryCrawler:
+    """
+    Background scheduler that periodically crawls S3, ECS and EBS inventory.
+
+    Credentials are registered at login and kept in memory only, for as long as
+    the token issued with them is valid. Each registered (access key, region)
+    target is crawled every interval seconds plus a random jitter, with at most
+    concurrency targets crawled at once. Results go to the snapshot store.
+    """
+
+    def __init__(self, store, interval, jitter, concurrency):
+        """
+        Initialize the crawler
+
+        Args:
+            store: SnapshotStore receiving crawl results
+            interval: Seconds between crawls of the same target
+            jitter: Maximum random delay in seconds added to each interval
+            concurrency: Maximum number of targets crawled at once
+        """
+        self.store = store
+        self.interval = interval
+        self.jitter = jitter
+        self.concurrency = concurrency
+
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._executor = None
+
+    def register(self, aws_access_key_id, aws_secret_access_key, region, ttl_seconds):
+        """
+        Register credentials and a region to be crawled
+
+        Registering an existing target refreshes its credentials and expiry.
+
+        Args:
+            aws_access_key_id: AWS access key ID
+            aws_secret_access_key: AWS secret access key
+            region: AWS region
+            ttl_seconds: Seconds until the target is dropped
+        """
+        key = (aws_access_key_id, region)
+        with self._lock:
+            target = self._targets.get(key)
+            if target is None:
+                target = {'next_run': time.time(), 'running': False}
+                self._targets[key] = target
+                logger.info(f"Registered crawl target {aws_access_key_id}/{region}")
+
+            target['aws_access_key_id'] = aws_access_key_id
+            target['aws_secret_access_key'] = aws_secret_access_key
+            target['region'] = region
+            target['expires_at'] = time.time() + ttl_seconds
+
+        self._wakeup.set()
+
+    def unregister(self, aws_access_key_id, region):
+        """Stop crawling a target"""
+        with self._lock:
+            self._targets.pop((aws_access_key_id, region), None)
+
+    def start(self):
+        """Start the scheduler thread if it is not already running"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix='inventory-crawler'
+        )
+        self._thread = threading.Thread(target=self._run, name='inventory-scheduler', daemon=True)
+        self._thread.start()
+        logger.info("Inventory crawler started")
+
+    def stop(self):
+        """Stop the scheduler and wait for running crawls to finish"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        logger.info("Inventory crawler stopped")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            now = time.time()
+            next_wakeup = now + self.interval
+
+            with self._lock:
+                for key, target in list(self._targets.items()):
+                    if target['expires_at'] <= now:
+                        logger.info(f"Crawl target {key[0]}/{key[1]} expired")
+                        del self._targets[key]
+                        continue
+
+                    if target['running']:
+                        continue
+
+                    if target['next_run'] <= now:
+                        target['running'] = True
+                        self._executor.submit(self._crawl_target, key, dict(target))
+                    else:
+                        next_wakeup = min(next_wakeup, target['next_run'])
+
+            self._wakeup.wait(max(0.1, next_wakeup - time.time()))
+            self._wakeup.clear()
+
+    def _crawl_target(self, key, target):
+        try:
+            self.crawl(target['aws_access_key_id'], target['aws_secret_access_key'], target['region'])
+        finally:
+            with self._lock:
+                current = self._targets.get(key)
+                if current is not None:
+                    current['running'] = False
+                    current['next_run'] = time.time() + self.interval + random.uniform(0, self.jitter)
+            self._wakeup.set()
+
+    def crawl(self, aws_access_key_id, aws_secret_access_key, region):
+        """
+        Crawl every inventory operation for one target and store the snapshots
+
+        Failed operations are logged and skipped so the previous snapshot stays in
+        place.
+
+        Args:
+            aws_access_key_id: AWS access key ID
+            aws_secret_access_key: AWS secret access key
+            region: AWS region
+        """
+        for resource, operation in CRAWL_OPERATIONS.items():
+            crawled_at = time.time()
+            start = time.monotonic()
+            try:
+                # Shares the load with an identical API request missing the cache at the same time
+                key = cache_key({'aws_access_key_id': aws_access_key_id, 'aws_region': region}, resource)
+                payload, _ = singleflight.do(
+                    key, lambda: operation(aws_access_key_id, aws_secret_access_key, region)
+                )
+            except Exception as e:
+                logger.error(f"Crawl of {resource} for {aws_access_key_id}/{region} failed: {str(e)}")
+                continue
+
+            duration_ms = round((time.monotonic() - start) * 1000, 1)
+            if is_error_response(payload):
+                logger.warning(f"Crawl of {resource} for {aws_access_key_id}/{region} returned {payload['error']}")
+                continue
+
+            self.store.save(aws_access_key_id, region, resource, payload, crawled_at, duration_ms)
+            logger.debug(f"Stored {resource} snapshot for {aws_access_key_id}/{region} in {duration_ms}ms")
+
+
+# Shared crawler, started by create_app when CRAWLER_ENABLED is set
+inventory_crawler = InventoryCrawler(
+    store=snapshot_store,
+    interval=Config.CRAWLER_INTERVAL_SECONDS,
+    jitter=Config.CRAWLER_JITTER_SECONDS,
+    concurrency=Config.CRAWLER_CONCURRENCY
+)
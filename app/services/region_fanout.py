@@ -0,0 +1,116 @@
+# app/services/region_fanout.py
+import logging
+import re
+
+from app.config.config import Config
+from app.services.ebs_service import EBSService
+from app.utils.cache import response_cache, is_error_response
+from app.utils.concurrency import get_region_executor, run_sections
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+REGION_PATTERN = re.compile(r'^[a-z]{2}(-[a-z]+)+-\d+$')
+
+
+def resolve_regions(session, regions):
+    """
+    Turn a regions parameter into a list of region names
+
+    Args:
+        session: Session of the caller
+        regions: 'all' for every region enabled in the account, or a
+            comma-separated list of region names
+
+    Returns:
+        list: Region names, sorted
+
+    Raises:
+        ValueError: If a region name is malformed or the regions could not be listed
+    """
+    if regions.strip().lower() == 'all':
+        return _list_enabled_regions(session)
+
+    names = sorted({region.strip() for region in regions.split(',') if region.strip()})
+    if not names:
+        raise ValueError("regions must be 'all' or a comma-separated list of regions")
+    for name in names:
+        if not REGION_PATTERN.match(name):
+            raise ValueError(f"Invalid region: {name}")
+    return names
+
+
+def _list_enabled_regions(session):
+    """List the regions enabled in the account, cached for a day"""
+    ec2_client = session.service(EBSService).ec2_client
+
+    def load():
+        response = ec2_client.describe_regions(
+            Filters=[{'Name': 'opt-in-status', 'Values': ['opt-in-not-required', 'opted-in']}]
+        )
+        return sorted(region['RegionName'] for region in response.get('Regions', []))
+
+    result = response_cache.get_or_load(
+        (session.payload['aws_access_key_id'], session.payload['aws_region'], 'ec2.describe_regions', ''),
+        load,
+        ttl=Config.CACHE_TTLS['ec2.describe_regions']
+    )
+    if is_error_response(result.value):
+        raise ValueError(f"Could not list regions: {result.value['error']}")
+    return result.value
+
+
+def fan_out_regions(regions, func, timeout=None):
+    """
+    Call func for every region concurrently
+
+    Regions run on the region executor with a shared deadline. A region that
+    misses the deadline is reported as timed out without holding up the others,
+    and a region whose call returns an error response is reported as failed.
+
+    Args:
+        regions: Region names
+        func: Callable taking a region name
+        timeout: Deadline in seconds (default: Config.REGION_FANOUT_TIMEOUT_SECONDS)
+
+    Returns:
+        tuple: (results, status) mapping each region to its result (None unless it
+            completed) and to a dict with its status and duration_ms
+    """
+    timeout = timeout or Config.REGION_FANOUT_TIMEOUT_SECONDS
+    results, status = run_sections(
+        {region: (lambda region=region: func(region), timeout) for region in regions},
+        executor=get_region_executor()
+    )
+
+    for region, result in results.items():
+        if is_error_response(result):
+            logger.warning(f"Region {region} failed: {result['error']}")
+            results[region] = None
+            status[region] = {
+                'status': 'failed',
+                'error': result['error'],
+                'duration_ms': status[region].get('duration_ms')
+            }
+
+    return results, status
+
+
+def merge_region_items(results, items_key):
+    """
+    Merge per-region listings into one list, tagging every item with its region
+
+    Args:
+        results: Region to listing dict, as returned by fan_out_regions
+        items_key: Key of the item list in each listing, e.g. 'volumes'
+
+    Returns:
+        list: Items of every completed region, in region order
+    """
+    return [
+        dict(item, region=region)
+        for region in sorted(results)
+        if results[region] is not None
+        for item in results[region].get(items_key, [])
+    ]
@@ -0,0 +1,194 @@
+# app/services/s3_bucket_scanner.py
+import logging
+import time
+
+from botocore.exceptions import ClientError
+
+from app.config.config import Config
+from app.models.snapshot_store import snapshot_store
+from app.services.s3_inventory_service import InventoryAggregate, inventory_resource
+from app.utils.concurrency import bounded_imap_unordered, get_scan_executor
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+def scan_checkpoint_resource(bucket_name):
+    """Snapshot store resource name for a bucket scan checkpoint"""
+    return f"s3.scan_checkpoint:{bucket_name}"
+
+
+class S3BucketScanner:
+    """
+    Exact object statistics for a bucket by listing every object.
+
+    Used when S3 Inventory is not enabled. The keyspace is split into partitions
+    by listing with Delimiter='/': each partition lists the objects directly under
+    its prefix and hands its sub-prefixes back as new partitions, down to
+    max_depth levels, below which a partition lists its whole prefix. Partitions
+    are scanned concurrently with at most concurrency in flight.
+
+    Progress is checkpointed to the snapshot store every checkpoint_interval
+    seconds as the list of unfinished partitions plus the totals so far, so an
+    interrupted scan resumes from the last checkpoint instead of starting over.
+    The final totals are stored like an ingested inventory report, so
+    S3Service.get_bucket_details serves them.
+    """
+
+    def __init__(self, s3_service, concurrency=None, max_depth=None, checkpoint_interval=None):
+        """
+        Initialize the scanner
+
+        Args:
+            s3_service: S3Service whose client and credentials are used
+            concurrency: Maximum partitions listed at once (default: Config.S3_SCAN_CONCURRENCY)
+            max_depth: Prefix levels split into partitions (default: Config.S3_SCAN_MAX_DEPTH)
+            checkpoint_interval: Seconds between checkpoints
+                (default: Config.S3_SCAN_CHECKPOINT_INTERVAL_SECONDS)
+        """
+        self.client = s3_service.client
+        self.aws_access_key_id = s3_service.aws_access_key_id
+        self.region = s3_service.region
+        self.concurrency = concurrency or Config.S3_SCAN_CONCURRENCY
+        self.max_depth = Config.S3_SCAN_MAX_DEPTH if max_depth is None else max_depth
+        self.checkpoint_interval = checkpoint_interval or Config.S3_SCAN_CHECKPOINT_INTERVAL_SECONDS
+
+    def scan(self, bucket_name, resume=True, progress=None):
+        """
+        Scan every object in the bucket and store the totals
+
+        Args:
+            bucket_name: The name of the S3 bucket
+            resume: Continue from the last checkpoint of an unfinished scan
+            progress: Optional callable receiving progress keyword arguments
+
+        Returns:
+            dict: Totals in the same shape as an ingested inventory report
+                (storage_class_summary, storage_classes, prefixes, object_count,
+                total_size_bytes), or an error dict
+        """
+        try:
+            start = time.monotonic()
+            started_at = time.time()
+            aggregate = self._new_aggregate()
+            pending = [('', 0)]
+            partitions_done = 0
+
+            checkpoint = self._load_checkpoint(bucket_name) if resume else None
+            if checkpoint is not None:
+                aggregate = InventoryAggregate.from_dict(
+                    checkpoint['totals'], Config.S3_INVENTORY_PREFIX_DEPTH, Config.S3_INVENTORY_MAX_PREFIXES
+                )
+                pending = [tuple(partition) for partition in checkpoint['pending']]
+                partitions_done = checkpoint['partitions_done']
+                started_at = checkpoint['started_at']
+                logger.info(f"Resuming scan of bucket {bucket_name} with {len(pending)} partitions left")
+
+            last_checkpoint = time.monotonic()
+            while pending:
+                # Partitions discovered at this level are scanned in the next round
+                level, discovered = pending, []
+                remaining = set(level)
+                for partition, partial, children in bounded_imap_unordered(
+                    lambda partition: self._scan_partition(bucket_name, partition),
+                    level,
+                    max_workers=self.concurrency,
+                    executor=get_scan_executor()
+                ):
+                    aggregate.merge(partial)
+                    discovered.extend(children)
+                    remaining.discard(partition)
+                    partitions_done += 1
+
+                    if progress:
+                        progress(
+                            partitions_done=partitions_done,
+                            partitions_pending=len(remaining) + len(discovered),
+                            object_count=aggregate.object_count
+                        )
+                    if time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                        self._save_checkpoint(
+                            bucket_name, sorted(remaining) + discovered, partitions_done, aggregate, started_at
+                        )
+                        last_checkpoint = time.monotonic()
+                pending = discovered
+
+            result = aggregate.to_dict()
+            # Listings carry no encryption status
+            del result['encryption_status']
+            result.update({
+                'bucket': bucket_name,
+                'source': 'scan',
+                'partitions': partitions_done
+            })
+
+            duration_ms = round((time.monotonic() - start) * 1000, 1)
+            snapshot_store.save(
+                self.aws_access_key_id, self.region, inventory_resource(bucket_name),
+                result, time.time(), duration_ms
+            )
+            self._save_checkpoint(bucket_name, [], partitions_done, aggregate, started_at)
+            logger.info(f"Scanned {result['object_count']} objects in {partitions_done} partitions of bucket {bucket_name} in {duration_ms}ms")
+            return result
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            logger.error(f"AWS S3 Error scanning bucket {bucket_name}: {error_code} - {error_message}")
+            return {"error": f"AWS Error: {error_message}"}
+        except Exception as e:
+            logger.error(f"Unexpected error scanning bucket {bucket_name}: {str(e)}")
+            return {"error": f"Unexpected error: {str(e)}"}
+
+    def _scan_partition(self, bucket_name, partition):
+        """
+        List one partition
+
+        Args:
+            bucket_name: The name of the S3 bucket
+            partition: (prefix, depth) tuple
+
+        Returns:
+            tuple: (partition, InventoryAggregate of its objects, list of child partitions)
+        """
+        prefix, depth = partition
+        aggregate = self._new_aggregate()
+        children = []
+
+        request = {'Bucket': bucket_name, 'Prefix': prefix}
+        if depth < self.max_depth:
+            request['Delimiter'] = '/'
+
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(**request):
+            for obj in page.get('Contents', []):
+                aggregate.add(obj['Key'], obj.get('Size', 0), obj.get('StorageClass') or 'STANDARD', 'UNKNOWN')
+            for common_prefix in page.get('CommonPrefixes', []):
+                children.append((common_prefix['Prefix'], depth + 1))
+
+        return partition, aggregate, children
+
+    @staticmethod
+    def _new_aggregate():
+        return InventoryAggregate(Config.S3_INVENTORY_PREFIX_DEPTH, Config.S3_INVENTORY_MAX_PREFIXES)
+
+    def _load_checkpoint(self, bucket_name):
+        """Get the checkpoint of an unfinished scan, if any"""
+        snapshot = snapshot_store.latest(self.aws_access_key_id, self.region, scan_checkpoint_resource(bucket_name))
+        if snapshot is None or not snapshot['payload']['pending']:
+            return None
+        return snapshot['payload']
+
+    def _save_checkpoint(self, bucket_name, pending, partitions_done, aggregate, started_at):
+        snapshot_store.save(
+            self.aws_access_key_id, self.region, scan_checkpoint_resource(bucket_name),
+            {
+                'pending': pending,
+                'partitions_done': partitions_done,
+                'totals': aggregate.to_dict(),
+                'started_at': started_at
+            },
+            time.time(), 0
+        )
+        logger.debug(f"Checkpointed scan of bucket {bucket_name}: {len(pending)} partitions left")
@@ -0,0 +1,322 @@
+# app/services/s3_inventory_service.py
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from urllib.parse import unquote_plus
+
+from botocore.exceptions import ClientError
+
+from app.config.config import Config
+from app.models.snapshot_store import snapshot_store
+from app.utils.client_pool import client_pool
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Bucket used for keys without a prefix, and for prefixes past the prefix limit
+ROOT_PREFIX = ''
+OTHER_PREFIX = '(other)'
+
+
+def inventory_resource(bucket_name):
+    """Snapshot store resource name for a bucket's ingested inventory"""
+    return f"s3.inventory:{bucket_name}"
+
+
+class InventoryAggregate:
+    """
+    Running totals over the rows of an S3 Inventory report.
+
+    Memory use only depends on the number of distinct storage classes,
+    encryption statuses and prefixes, never on the number of objects. Prefixes
+    past max_prefixes are folded into OTHER_PREFIX.
+    """
+
+    def __init__(self, prefix_depth, max_prefixes):
+        """
+        Initialize the aggregate
+
+        Args:
+            prefix_depth: Number of leading key segments that make up a prefix
+            max_prefixes: Maximum number of distinct prefixes tracked
+        """
+        self.prefix_depth = prefix_depth
+        self.max_prefixes = max_prefixes
+        self.object_count = 0
+        self.total_size_bytes = 0
+        self.storage_classes = defaultdict(lambda: {'object_count': 0, 'size_bytes': 0})
+        self.encryption = defaultdict(lambda: {'object_count': 0, 'size_bytes': 0})
+        self.prefixes = defaultdict(lambda: {'object_count': 0, 'size_bytes': 0})
+
+    def add(self, key, size, storage_class, encryption_status):
+        """Add one object to the totals"""
+        self.object_count += 1
+        self.total_size_bytes += size
+
+        for totals in (
+            self.storage_classes[storage_class],
+            self.encryption[encryption_status],
+            self.prefixes[self._prefix(key)]
+        ):
+            totals['object_count'] += 1
+            totals['size_bytes'] += size
+
+    def merge(self, other):
+        """Add the totals of another aggregate, e.g. one built for a single partition"""
+        self.object_count += other.object_count
+        self.total_size_bytes += other.total_size_bytes
+
+        for mine, theirs in (
+            (self.storage_classes, other.storage_classes),
+            (self.encryption, other.encryption)
+        ):
+            for name, totals in theirs.items():
+                mine[name]['object_count'] += totals['object_count']
+                mine[name]['size_bytes'] += totals['size_bytes']
+
+        for prefix, totals in other.prefixes.items():
+            prefix = self._limit_prefix(prefix)
+            self.prefixes[prefix]['object_count'] += totals['object_count']
+            self.prefixes[prefix]['size_bytes'] += totals['size_bytes']
+
+    @classmethod
+    def from_dict(cls, data, prefix_depth, max_prefixes):
+        """Rebuild an aggregate from to_dict() output"""
+        aggregate = cls(prefix_depth, max_prefixes)
+        aggregate.object_count = data['object_count']
+        aggregate.total_size_bytes = data['total_size_bytes']
+        aggregate.storage_classes.update(data['storage_classes'])
+        aggregate.encryption.update(data['encryption_status'])
+        aggregate.prefixes.update(data['prefixes'])
+        return aggregate
+
+    def _prefix(self, key):
+        segments = key.split('/')[:-1][:self.prefix_depth]
+        return self._limit_prefix('/'.join(segments) + '/' if segments else ROOT_PREFIX)
+
+    def _limit_prefix(self, prefix):
+        if prefix not in self.prefixes and len(self.prefixes) >= self.max_prefixes:
+            return OTHER_PREFIX
+        return prefix
+
+    def to_dict(self):
+        """
+        Get the totals
+
+        Returns:
+            dict: Object count and size overall and per storage class, encryption
+                status and prefix
+        """
+        return {
+            'object_count': self.object_count,
+            'total_size_bytes': self.total_size_bytes,
+            'storage_classes': dict(self.storage_classes),
+            'storage_class_summary': {
+                storage_class: totals['size_bytes']
+                for storage_class, totals in self.storage_classes.items()
+            },
+            'encryption_status': dict(self.encryption),
+            'prefixes': dict(self.prefixes)
+        }
+
+
+class S3InventoryService:
+    """
+    Exact bucket statistics from S3 Inventory reports.
+
+    An inventory report is a manifest.json listing gzip-compressed CSV data files.
+    The data files are streamed and aggregated row by row, so buckets with
+    billions of objects are ingested in constant memory. Results are kept in the
+    snapshot store, where S3Service.get_bucket_details picks them up.
+    """
+
+    def __init__(self, aws_access_key_id, aws_secret_access_key, region, aws_session_token=None):
+        """
+        Initialize the inventory service with AWS credentials
+
+        Args:
+            aws_access_key_id: AWS access key ID
+            aws_secret_access_key: AWS secret access key
+            region: AWS region
+            aws_session_token: Session token for temporary credentials, e.g. from AssumeRole
+        """
+        self.aws_access_key_id = aws_access_key_id
+        self.client = client_pool.get_client(
+            's3',
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            aws_session_token=aws_session_token,
+            region=region
+        )
+        self.region = region
+
+    def ingest(self, bucket_name, manifest_bucket=None, manifest_key=None, local_dir=None, progress=None):
+        """
+        Ingest an inventory report for a bucket and store the totals
+
+        Without a manifest location, the most recent report of the bucket's first
+        enabled CSV inventory configuration is used.
+
+        Args:
+            bucket_name: The name of the inventoried S3 bucket
+            manifest_bucket: Bucket holding manifest.json
+            manifest_key: Key of manifest.json
+            local_dir: Directory holding manifest.json and the data files, read
+                instead of S3 (for testing and offline analysis)
+            progress: Optional callable receiving progress keyword arguments
+
+        Returns:
+            dict: Aggregated totals, or an error dict
+        """
+        try:
+            start = time.monotonic()
+            if local_dir:
+                manifest = self._read_local_manifest(local_dir)
+                open_file = lambda key: self._open_local_file(local_dir, key)
+            else:
+                if not manifest_key:
+                    manifest_bucket, manifest_key = self.find_latest_manifest(bucket_name)
+                manifest = json.loads(self.client.get_object(Bucket=manifest_bucket, Key=manifest_key)['Body'].read())
+                data_bucket = manifest['destinationBucket'].split(':::')[-1]
+                open_file = lambda key: self.client.get_object(Bucket=data_bucket, Key=key)['Body']
+
+            if manifest.get('fileFormat', 'CSV').upper() != 'CSV':
+                return {"error": f"Unsupported inventory format: {manifest.get('fileFormat')}"}
+
+            columns = [column.strip() for column in manifest['fileSchema'].split(',')]
+            aggregate = InventoryAggregate(Config.S3_INVENTORY_PREFIX_DEPTH, Config.S3_INVENTORY_MAX_PREFIXES)
+
+            files = manifest.get('files', [])
+            for i, data_file in enumerate(files):
+                with open_file(data_file['key']) as raw:
+                    self._aggregate_file(raw, columns, aggregate)
+                if progress:
+                    progress(files_done=i + 1, files_total=len(files), object_count=aggregate.object_count)
+
+            created_at = manifest.get('creationTimestamp')
+            result = aggregate.to_dict()
+            result.update({
+                'bucket': bucket_name,
+                'source': 'inventory',
+                'source_bucket': manifest.get('sourceBucket', bucket_name),
+                'report_created_at': int(created_at) / 1000 if created_at else None,
+                'files': len(files)
+            })
+
+            duration_ms = round((time.monotonic() - start) * 1000, 1)
+            snapshot_store.save(
+                self.aws_access_key_id, self.region, inventory_resource(bucket_name),
+                result, time.time(), duration_ms
+            )
+            logger.info(f"Ingested inventory of {result['object_count']} objects for bucket {bucket_name} in {duration_ms}ms")
+            return result
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            logger.error(f"AWS S3 Error ingesting inventory for bucket {bucket_name}: {error_code} - {error_message}")
+            return {"error": f"AWS Error: {error_message}"}
+        except Exception as e:
+            logger.error(f"Unexpected error ingesting inventory for bucket {bucket_name}: {str(e)}")
+            return {"error": f"Unexpected error: {str(e)}"}
+
+    def find_latest_manifest(self, bucket_name):
+        """
+        Locate the newest inventory manifest for a bucket
+
+        Reports are delivered to
+        <destination prefix>/<source bucket>/<configuration id>/<YYYY-MM-DDTHH-MMZ>/manifest.json
+
+        Args:
+            bucket_name: The name of the inventoried S3 bucket
+
+        Returns:
+            tuple: (manifest bucket, manifest key)
+        """
+        response = self.client.list_bucket_inventory_configurations(Bucket=bucket_name)
+        for configuration in response.get('InventoryConfigurationList', []):
+            destination = configuration['Destination']['S3BucketDestination']
+            if not configuration.get('IsEnabled') or destination.get('Format') != 'CSV':
+                continue
+
+            destination_bucket = destination['Bucket'].split(':::')[-1]
+            base = '/'.join(
+                part for part in (destination.get('Prefix', '').strip('/'), bucket_name, configuration['Id']) if part
+            ) + '/'
+
+            # Report folders are timestamps, so the lexically largest is the newest
+            latest = None
+            paginator = self.client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=destination_bucket, Prefix=base, Delimiter='/'):
+                for common_prefix in page.get('CommonPrefixes', []):
+                    folder = common_prefix['Prefix']
+                    if folder[len(base):len(base) + 1].isdigit() and (latest is None or folder > latest):
+                        latest = folder
+
+            if latest is not None:
+                return destination_bucket, latest + 'manifest.json'
+
+        raise ValueError(f"No CSV inventory report found for bucket {bucket_name}")
+
+    def _aggregate_file(self, raw, columns, aggregate):
+        """Stream one gzip-compressed CSV data file into the aggregate"""
+        key_index = columns.index('Key')
+        size_index = columns.index('Size') if 'Size' in columns else None
+        class_index = columns.index('StorageClass') if 'StorageClass' in columns else None
+        encryption_index = columns.index('EncryptionStatus') if 'EncryptionStatus' in columns else None
+        delete_marker_index = columns.index('IsDeleteMarker') if 'IsDeleteMarker' in columns else None
+
+        with gzip.GzipFile(fileobj=raw) as decompressed:
+            reader = csv.reader(io.TextIOWrapper(decompressed, encoding='utf-8', newline=''))
+            for row in reader:
+                if delete_marker_index is not None and row[delete_marker_index] == 'true':
+                    continue
+                aggregate.add(
+                    # Keys are URL-encoded in CSV reports
+                    unquote_plus(row[key_index]),
+                    int(row[size_index] or 0) if size_index is not None else 0,
+                    (row[class_index] if class_index is not None else '') or 'STANDARD',
+                    (row[encryption_index] if encryption_index is not None else '') or 'UNKNOWN'
+                )
+
+    @staticmethod
+    def _read_local_manifest(local_dir):
+        with open(os.path.join(local_dir, 'manifest.json')) as manifest_file:
+            return json.load(manifest_file)
+
+    @staticmethod
+    def _open_local_file(local_dir, key):
+        """Open a data file by its full key, or by its file name under local_dir or local_dir/data"""
+        for path in (
+            os.path.join(local_dir, key),
+            os.path.join(local_dir, 'data', os.path.basename(key)),
+            os.path.join(local_dir, os.path.basename(key))
+        ):
+            if os.path.isfile(path):
+                return open(path, 'rb')
+        raise FileNotFoundError(f"Inventory data file {key} not found in {local_dir}")
+
+    def get_latest(self, bucket_name):
+        """
+        Get the most recently ingested inventory totals for a bucket
+
+        Args:
+            bucket_name: The name of the S3 bucket
+
+        Returns:
+            dict: Aggregated totals with 'ingested_at', or None if none are recent
+                enough
+        """
+        snapshot = snapshot_store.latest(
+            self.aws_access_key_id, self.region, inventory_resource(bucket_name),
+            max_age=Config.S3_INVENTORY_MAX_AGE_SECONDS
+        )
+        if snapshot is None:
+            return None
+        return dict(snapshot['payload'], ingested_at=snapshot['crawled_at'])
@@ -1,129 +1,87 @@
 # app/services/s3_service.py
-import boto3
 import logging
 from botocore.exceptions import ClientError
 from datetime import datetime
 from collections import defaultdict
+from app.config.config import Config
+from app.models.snapshot_store import snapshot_store
+from app.services.s3_inventory_service import inventory_resource
+from app.services.s3_storage_metrics_service import S3StorageMetricsService
+from app.utils.client_pool import client_pool
+from app.utils.concurrency import bounded_map
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 class S3Service:
-    def __init__(self, aws_access_key_id, aws_secret_access_key, region):
-        # Initialize the main S3 client
-        self.client = boto3.client(
-            's3',
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=region
-        )
+    def __init__(self, aws_access_key_id, aws_secret_access_key, region, aws_session_token=None):
+        # Number of buckets enriched concurrently by list_buckets
+        self.bucket_concurrency = Config.S3_BUCKET_CONCURRENCY
         
-        # Initialize the S3 resource for higher-level operations
-        self.resource = boto3.resource(
+        # Get the S3 client from the shared pool, with enough connections
+        # for every concurrent bucket worker
+        self.client = client_pool.get_client(
             's3',
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
-            region_name=region
+            aws_session_token=aws_session_token,
+            region=region,
+            max_pool_connections=max(self.bucket_concurrency, Config.AWS_MAX_POOL_CONNECTIONS)
         )
         
+        # Bucket sizes come from CloudWatch storage metrics unless listing is requested
+        self.storage_metrics = S3StorageMetricsService(aws_access_key_id, aws_secret_access_key, aws_session_token)
+        
+        self.aws_access_key_id = aws_access_key_id
         self.region = region
         logger.debug(f"Initialized S3 service for region {region}")
 
-    def list_buckets(self):
+    def list_buckets(self, size_source=None):
         """
         List all S3 buckets with detailed information
         
+        Args:
+            size_source: 'cloudwatch' to read exact object counts and sizes from the
+                daily S3 storage metrics, or 'listing' to count up to 1,000 objects
+                per bucket (default: Config.S3_SIZE_SOURCE)
+        
         Returns:
             dict: Dictionary with a 'buckets' key containing a list of bucket details
         """
         try:
             logger.debug("Attempting to list S3 buckets with detailed information")
+            size_source = size_source or Config.S3_SIZE_SOURCE
             response = self.client.list_buckets()
-            buckets_info = []
+            buckets = response.get('Buckets', [])
             
-            for bucket in response.get('Buckets', []):
-                bucket_name = bucket['Name']
-                creation_date = bucket['CreationDate'].isoformat() + 'Z'
-                
-                # Get additional bucket details
+            # Enrich buckets concurrently; bounded_map keeps the original order
+            buckets_info = bounded_map(
+                lambda bucket: self._describe_bucket(bucket, count_objects=size_source == 'listing'),
+                buckets,
+                max_workers=self.bucket_concurrency
+            )
+            
+            if size_source == 'cloudwatch':
                 try:
-                    # Get bucket location/region
-                    try:
-                        location_response = self.client.get_bucket_location(Bucket=bucket_name)
-                        region = location_response.get('LocationConstraint')
-                        # None represents us-east-1 in the API response
-                        if region is None:
-                            region = 'us-east-1'
-                    except ClientError:
-                        region = self.region
-                    
-                    # Get bucket versioning status
-                    try:
-                        versioning_response = self.client.get_bucket_versioning(Bucket=bucket_name)
-                        versioning_enabled = versioning_response.get('Status') == 'Enabled'
-                    except ClientError:
-                        versioning_enabled = False
-                    
-                    # Get public access block configuration
-                    try:
-                        public_access_response = self.client.get_public_access_block(Bucket=bucket_name)
-                        block_config = public_access_response.get('PublicAccessBlockConfiguration', {})
-                        public_access_blocked = (
-                            block_config.get('BlockPublicAcls', False) and
-                            block_config.get('IgnorePublicAcls', False) and
-                            block_config.get('BlockPublicPolicy', False) and
-                            block_config.get('RestrictPublicBuckets', False)
-                        )
-                    except ClientError:
-                        public_access_blocked = False
-                    
-                    # Get object count and total size (this can be resource-intensive)
-                    object_count = 0
-                    total_size_bytes = 0
-                    
-                    try:
-                        # For performance reasons, limit the count to a reasonable number
-                        bucket_obj = self.resource.Bucket(bucket_name)
-                        MAX_OBJECTS = 1000  # Set a reasonable limit
-                        
-                        # Count objects up to the limit
-                        for i, obj in enumerate(bucket_obj.objects.limit(MAX_OBJECTS + 1)):
-                            if i >= MAX_OBJECTS:
-                                object_count = f"{MAX_OBJECTS}+"
-                                break
-                            else:
-                                object_count += 1
-                                total_size_bytes += obj.size
-                    except ClientError:
-                        # Continue with zero counts if there's an error
-                        pass
-                    
-                    # Create bucket info object
-                    bucket_info = {
-                        "name": bucket_name,
-                        "creation_date": creation_date,
-                        "region": region,
-                        "object_count": object_count,
-                        "total_size_bytes": total_size_bytes,
-                        "versioning_enabled": versioning_enabled,
-                        "public_access_blocked": public_access_blocked
-                    }
-                    
-                    buckets_info.append(bucket_info)
-                    
+                    storage = self.storage_metrics.get_bucket_storage(
+                        bucket_info['region'] for bucket_info in buckets_info
+                    )
+                    for bucket_info in buckets_info:
+                        bucket_storage = storage.get(bucket_info['name'], {})
+                        bucket_info['object_count'] = bucket_storage.get('object_count', 0)
+                        bucket_info['total_size_bytes'] = bucket_storage.get('total_size_bytes', 0)
                 except Exception as e:
-                    logger.error(f"Error getting details for bucket {bucket_name}: {str(e)}")
-                    # Add bucket with minimal information if we encounter an error
-                    buckets_info.append({
-                        "name": bucket_name,
-                        "creation_date": creation_date,
-                        "region": self.region,
-                        "object_count": 0,
-                        "total_size_bytes": 0,
-                        "versioning_enabled": False,
-                        "public_access_blocked": False
-                    })
+                    logger.warning(f"S3 storage metrics unavailable, counting objects instead: {str(e)}")
+                    # The buckets are already described; only their sizes are missing
+                    counts = bounded_map(
+                        lambda bucket_info: self._count_objects(bucket_info['name']),
+                        buckets_info,
+                        max_workers=self.bucket_concurrency
+                    )
+                    for bucket_info, (object_count, total_size_bytes) in zip(buckets_info, counts):
+                        bucket_info['object_count'] = object_count
+                        bucket_info['total_size_bytes'] = total_size_bytes
             
             logger.info(f"Successfully listed {len(buckets_info)} S3 buckets with details")
             return {"buckets": buckets_info}
@@ -137,32 +95,23 @@ class S3Service:
             logger.error(f"Unexpected error listing buckets: {str(e)}")
             return {"error": f"Unexpected error: {str(e)}"}
 
-    def get_bucket_details(self, bucket_name):
+    def _describe_bucket(self, bucket, count_objects=True):
         """
-        Get detailed information about a specific S3 bucket
+        Collect location, versioning, public access and size details for a bucket
         
         Args:
-            bucket_name: The name of the S3 bucket
+            bucket: Bucket entry from the ListBuckets response
+            count_objects: List up to 1,000 objects to estimate count and size;
+                when False both are left at 0 for the caller to fill in
         
         Returns:
-            dict: Detailed information about the bucket
+            dict: Bucket details, or a minimal record if the details could not be read
         """
+        bucket_name = bucket['Name']
+        creation_date = bucket['CreationDate'].isoformat() + 'Z'
+        
+        # Get additional bucket details
         try:
-            logger.debug(f"Getting details for bucket: {bucket_name}")
-            
-            # Get basic bucket information
-            response = self.client.list_buckets()
-            creation_date = None
-            
-            for bucket in response.get('Buckets', []):
-                if bucket['Name'] == bucket_name:
-                    creation_date = bucket['CreationDate'].isoformat() + 'Z'
-                    break
-            
-            if not creation_date:
-                logger.warning(f"Could not find creation date for bucket: {bucket_name}")
-                creation_date = datetime.now().isoformat() + 'Z'
-            
             # Get bucket location/region
             try:
                 location_response = self.client.get_bucket_location(Bucket=bucket_name)
@@ -170,12 +119,162 @@ class S3Service:
                 # None represents us-east-1 in the API response
                 if region is None:
                     region = 'us-east-1'
-            except ClientError as e:
-                logger.warning(f"Error getting bucket location: {str(e)}")
-                region = self.region  # Default to the service region
+            except ClientError:
+                region = self.region
+            
+            # Get bucket versioning status
+            try:
+                versioning_response = self.client.get_bucket_versioning(Bucket=bucket_name)
+                versioning_enabled = versioning_response.get('Status') == 'Enabled'
+            except ClientError:
+                versioning_enabled = False
+            
+            # Get public access block configuration
+            try:
+                public_access_response = self.client.get_public_access_block(Bucket=bucket_name)
+                block_config = public_access_response.get('PublicAccessBlockConfiguration', {})
+                public_access_blocked = (
+                    block_config.get('BlockPublicAcls', False) and
+                    block_config.get('IgnorePublicAcls', False) and
+                    block_config.get('BlockPublicPolicy', False) and
+                    block_config.get('RestrictPublicBuckets', False)
+                )
+            except ClientError:
+                public_access_blocked = False
+            
+            # Get object count and total size (this can be resource-intensive)
+            object_count, total_size_bytes = self._count_objects(bucket_name) if count_objects else (0, 0)
+            
+            # Create bucket info object
+            bucket_info = {
+                "name": bucket_name,
+                "creation_date": creation_date,
+                "region": region,
+                "object_count": object_count,
+                "total_size_bytes": total_size_bytes,
+                "versioning_enabled": versioning_enabled,
+                "public_access_blocked": public_access_blocked
+            }
+            
+            return bucket_info
+            
+        except Exception as e:
+            logger.error(f"Error getting details for bucket {bucket_name}: {str(e)}")
+            # Return bucket with minimal information if we encounter an error
+            return {
+                "name": bucket_name,
+                "creation_date": creation_date,
+                "region": self.region,
+                "object_count": 0,
+                "total_size_bytes": 0,
+                "versioning_enabled": False,
+                "public_access_blocked": False
+            }
+
+    def _lookup_bucket(self, bucket_name):
+        """
+        Look up a bucket's creation date and region
+        
+        Args:
+            bucket_name: The name of the S3 bucket
+        
+        Returns:
+            tuple: (creation_date as ISO 8601 string, region)
+        """
+        # Get basic bucket information
+        response = self.client.list_buckets()
+        creation_date = None
+        
+        for bucket in response.get('Buckets', []):
+            if bucket['Name'] == bucket_name:
+                creation_date = bucket['CreationDate'].isoformat() + 'Z'
+                break
+        
+        if not creation_date:
+            logger.warning(f"Could not find creation date for bucket: {bucket_name}")
+            creation_date = datetime.now().isoformat() + 'Z'
+        
+        # Get bucket location/region
+        try:
+            location_response = self.client.get_bucket_location(Bucket=bucket_name)
+            region = location_response.get('LocationConstraint')
+            # None represents us-east-1 in the API response
+            if region is None:
+                region = 'us-east-1'
+        except ClientError as e:
+            logger.warning(f"Error getting bucket location: {str(e)}")
+            region = self.region  # Default to the service region
+        
+        return creation_date, region
+
+    def _count_objects(self, bucket_name):
+        """
+        Estimate a bucket's object count and size by listing up to 1,000 objects
+        
+        Args:
+            bucket_name: The name of the S3 bucket
+        
+        Returns:
+            tuple: (object_count, total_size_bytes); the count is '1000+' when the
+                limit was reached, and both are 0 if the objects could not be listed
+        """
+        object_count = 0
+        total_size_bytes = 0
+        
+        try:
+            # For performance reasons, limit the count to a reasonable number
+            MAX_OBJECTS = 1000  # Set a reasonable limit
+            
+            # Count objects up to the limit
+            for i, obj in enumerate(self._iter_objects(bucket_name, MAX_OBJECTS + 1)):
+                if i >= MAX_OBJECTS:
+                    object_count = f"{MAX_OBJECTS}+"
+                    break
+                else:
+                    object_count += 1
+                    total_size_bytes += obj.get('Size', 0)
+        except ClientError:
+            # Continue with zero counts if there's an error
+            pass
+        
+        return object_count, total_size_bytes
+
+    def get_bucket_details(self, bucket_name, size_source=None, bucket_info=None):
+        """
+        Get detailed information about a specific S3 bucket
+        
+        When an S3 Inventory report has been ingested for the bucket, its exact
+        totals are served instead and size_source is ignored.
+        
+        Args:
+            bucket_name: The name of the S3 bucket
+            size_source: 'cloudwatch' or 'listing', see list_buckets
+                (default: Config.S3_SIZE_SOURCE)
+            bucket_info: The bucket's entry from list_buckets, if the caller has
+                it; its creation date and region are used instead of listing
+                every bucket and looking up the location again
+        
+        Returns:
+            dict: Detailed information about the bucket
+        """
+        try:
+            logger.debug(f"Getting details for bucket: {bucket_name}")
+            
+            if bucket_info is not None:
+                creation_date = bucket_info['creation_date']
+                region = bucket_info['region']
+            else:
+                creation_date, region = self._lookup_bucket(bucket_name)
             
-            # Get storage class summary
-            storage_class_summary = self._get_storage_class_summary(bucket_name)
+            # Get storage class summary, preferring an ingested inventory report
+            inventory = snapshot_store.latest(
+                self.aws_access_key_id, self.region, inventory_resource(bucket_name),
+                max_age=Config.S3_INVENTORY_MAX_AGE_SECONDS
+            )
+            if inventory is not None:
+                storage_class_summary = inventory['payload']['storage_class_summary']
+            else:
+                storage_class_summary = self._get_storage_class_summary(bucket_name, region, size_source)
             
             # Get lifecycle rules
             lifecycle_rules = self._get_lifecycle_rules(bucket_name)
@@ -193,6 +292,9 @@ class S3Service:
                 "encryption": encryption_settings
             }
             
+            if inventory is not None:
+                details["inventory"] = dict(inventory['payload'], ingested_at=inventory['crawled_at'])
+            
             logger.info(f"Successfully retrieved details for bucket: {bucket_name}")
             return details
             
@@ -205,10 +307,34 @@ class S3Service:
             logger.error(f"Unexpected error getting details for bucket {bucket_name}: {str(e)}")
             return {"error": f"Unexpected error: {str(e)}"}
     
-    def _get_storage_class_summary(self, bucket_name):
+    def _get_storage_class_summary(self, bucket_name, region=None, size_source=None):
         """
         Get summary of storage classes used in the bucket
         
+        Exact totals are read from the S3 storage metrics in CloudWatch. If they are
+        unavailable, or size_source is 'listing', up to 1,000 objects are listed.
+        
+        Args:
+            bucket_name: The name of the S3 bucket
+            region: The bucket's region (default: the service region)
+            size_source: 'cloudwatch' or 'listing' (default: Config.S3_SIZE_SOURCE)
+            
+        Returns:
+            dict: Summary of storage classes and their sizes in bytes
+        """
+        if (size_source or Config.S3_SIZE_SOURCE) == 'cloudwatch':
+            try:
+                storage = self.storage_metrics.get_bucket_storage([region or self.region])
+                return storage.get(bucket_name, {}).get('storage_classes') or {"STANDARD": 0}
+            except Exception as e:
+                logger.warning(f"S3 storage metrics unavailable for bucket {bucket_name}, listing objects: {str(e)}")
+        
+        return self._get_listed_storage_class_summary(bucket_name)
+    
+    def _get_listed_storage_class_summary(self, bucket_name):
+        """
+        Estimate the storage class summary by listing up to 1,000 objects
+        
         Args:
             bucket_name: The name of the S3 bucket
             
@@ -219,18 +345,15 @@ class S3Service:
             # Initialize storage class summary
             storage_summary = defaultdict(int)
             
-            # Get bucket objects
-            bucket = self.resource.Bucket(bucket_name)
-            
             # Limit to a reasonable number for performance
-            for obj in bucket.objects.limit(1000):
+            for obj in self._iter_objects(bucket_name, 1000):
                 # Get object's storage class
-                storage_class = getattr(obj, 'storage_class', 'STANDARD')
+                storage_class = obj.get('StorageClass', 'STANDARD')
                 if not storage_class:
                     storage_class = 'STANDARD'  # Default if not specified
                 
                 # Add object size to corresponding storage class
-                storage_summary[storage_class] += obj.size
+                storage_summary[storage_class] += obj.get('Size', 0)
             
             # Convert defaultdict to regular dict
             return dict(storage_summary)
@@ -239,6 +362,26 @@ class S3Service:
             # Return default storage class summary
             return {"STANDARD": 0}
     
+    def _iter_objects(self, bucket_name, max_items):
+        """
+        Iterate over up to max_items objects in the bucket
+        
+        Args:
+            bucket_name: The name of the S3 bucket
+            max_items: Maximum number of objects to yield
+            
+        Yields:
+            dict: Object entries as returned by ListObjectsV2
+        """
+        paginator = self.client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=bucket_name,
+            PaginationConfig={'MaxItems': max_items}
+        )
+        for page in pages:
+            for obj in page.get('Contents', []):
+                yield obj
+    
     def _get_lifecycle_rules(self, bucket_name):
         """
         Get lifecycle rules for the bucket
@@ -0,0 +1,177 @@
+# app/services/s3_storage_metrics_service.py
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from app.config.config import Config
+from app.utils.cache import response_cache
+from app.utils.client_pool import client_pool
+from app.utils.concurrency import bounded_map
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class S3StorageMetricsService:
+    """
+    Bucket sizes and object counts from the daily AWS/S3 CloudWatch metrics.
+
+    S3 publishes BucketSizeBytes per storage type and NumberOfObjects once a day
+    for every bucket, in the bucket's region. Reading them gives exact totals
+    without listing a single object. Results for a region are cached for
+    CACHE_TTLS['s3.storage_metrics'] seconds since they only change daily.
+    """
+
+    # CloudWatch StorageType dimension values mapped to S3 storage classes
+    STORAGE_TYPES = {
+        'StandardStorage': 'STANDARD',
+        'IntelligentTieringFAStorage': 'INTELLIGENT_TIERING',
+        'IntelligentTieringIAStorage': 'INTELLIGENT_TIERING',
+        'IntelligentTieringAIAStorage': 'INTELLIGENT_TIERING',
+        'IntelligentTieringAAStorage': 'INTELLIGENT_TIERING',
+        'IntelligentTieringDAAStorage': 'INTELLIGENT_TIERING',
+        'StandardIAStorage': 'STANDARD_IA',
+        'OneZoneIAStorage': 'ONEZONE_IA',
+        'ReducedRedundancyStorage': 'REDUCED_REDUNDANCY',
+        'GlacierInstantRetrievalStorage': 'GLACIER_IR',
+        'GlacierStorage': 'GLACIER',
+        'DeepArchiveStorage': 'DEEP_ARCHIVE'
+    }
+
+    # GetMetricData accepts at most this many queries per call
+    MAX_METRIC_QUERIES = 500
+
+    def __init__(self, aws_access_key_id, aws_secret_access_key, aws_session_token=None):
+        """
+        Initialize the storage metrics service with AWS credentials
+
+        Args:
+            aws_access_key_id: AWS access key ID
+            aws_secret_access_key: AWS secret access key
+            aws_session_token: Session token for temporary credentials, e.g. from AssumeRole
+        """
+        self.aws_access_key_id = aws_access_key_id
+        self.aws_secret_access_key = aws_secret_access_key
+        self.aws_session_token = aws_session_token
+
+    def get_bucket_storage(self, regions):
+        """
+        Get storage totals for every bucket in the given regions
+
+        Args:
+            regions: Iterable of AWS regions holding the buckets
+
+        Returns:
+            dict: Bucket name to a dict with 'storage_classes' (storage class to
+                bytes), 'total_size_bytes' and 'object_count'
+        """
+        storage = {}
+        for region_storage in bounded_map(self._get_region_storage, sorted(set(regions)), Config.S3_BUCKET_CONCURRENCY):
+            storage.update(region_storage)
+        return storage
+
+    def _get_region_storage(self, region):
+        """Get storage totals for the buckets in one region, through the response cache"""
+        key = (self.aws_access_key_id, region, 's3.storage_metrics', '')
+        result = response_cache.get_or_load(
+            key,
+            lambda: self._fetch_region_storage(region),
+            ttl=Config.CACHE_TTLS['s3.storage_metrics']
+        )
+        if isinstance(result.value, dict) and 'error' in result.value:
+            raise RuntimeError(result.value['error'])
+        return result.value
+
+    def _fetch_region_storage(self, region):
+        """
+        Read the latest storage metrics for every bucket in a region
+
+        Args:
+            region: AWS region
+
+        Returns:
+            dict: Bucket name to storage totals
+        """
+        cloudwatch = client_pool.get_client(
+            'cloudwatch',
+            aws_access_key_id=self.aws_access_key_id,
+            aws_secret_access_key=self.aws_secret_access_key,
+            aws_session_token=self.aws_session_token,
+            region=region
+        )
+
+        # Discover which bucket/storage type combinations have data
+        metrics = []
+        paginator = cloudwatch.get_paginator('list_metrics')
+        for metric_name in ('BucketSizeBytes', 'NumberOfObjects'):
+            for page in paginator.paginate(Namespace='AWS/S3', MetricName=metric_name):
+                metrics.extend(page.get('Metrics', []))
+
+        if not metrics:
+            return {}
+
+        queries = {}
+        for i, metric in enumerate(metrics):
+            queries[f"s{i}"] = {
+                'Id': f"s{i}",
+                'MetricStat': {
+                    'Metric': {
+                        'Namespace': 'AWS/S3',
+                        'MetricName': metric['MetricName'],
+                        'Dimensions': metric['Dimensions']
+                    },
+                    'Period': 86400,
+                    'Stat': 'Average'
+                },
+                'ReturnData': True
+            }
+
+        # Storage metrics are daily, so the last few days always hold the latest value
+        end_time = datetime.utcnow()
+        start_time = end_time - timedelta(days=3)
+
+        latest = {}
+        query_list = list(queries.values())
+        for i in range(0, len(query_list), self.MAX_METRIC_QUERIES):
+            request = {
+                'MetricDataQueries': query_list[i:i + self.MAX_METRIC_QUERIES],
+                'StartTime': start_time,
+                'EndTime': end_time,
+                'ScanBy': 'TimestampDescending'
+            }
+            while True:
+                response = cloudwatch.get_metric_data(**request)
+                for result in response.get('MetricDataResults', []):
+                    if result.get('Values') and result['Id'] not in latest:
+                        latest[result['Id']] = result['Values'][0]
+                if not response.get('NextToken'):
+                    break
+                request['NextToken'] = response['NextToken']
+
+        storage = defaultdict(lambda: {'storage_classes': defaultdict(int), 'total_size_bytes': 0, 'object_count': 0})
+        for query_id, value in latest.items():
+            metric = queries[query_id]['MetricStat']['Metric']
+            dimensions = {dimension['Name']: dimension['Value'] for dimension in metric['Dimensions']}
+            bucket = storage[dimensions.get('BucketName')]
+
+            if metric['MetricName'] == 'NumberOfObjects':
+                bucket['object_count'] += int(value)
+                continue
+
+            storage_class = self.STORAGE_TYPES.get(dimensions.get('StorageType'))
+            if storage_class is None:
+                # Overhead and staging storage types are not object data
+                continue
+            bucket['storage_classes'][storage_class] += int(value)
+            bucket['total_size_bytes'] += int(value)
+
+        logger.info(f"Read storage metrics for {len(storage)} S3 buckets in {region}")
+        return {
+            name: {
+                'storage_classes': dict(bucket['storage_classes']),
+                'total_size_bytes': bucket['total_size_bytes'],
+                'object_count': bucket['object_count']
+            }
+            for name, bucket in storage.items()
+        }
@@ -0,0 +1,47 @@
+# app/utils/async_views.py
+import asyncio
+import functools
+import inspect
+import logging
+
+from flask_restful import Resource
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+def run_coroutine(method):
+    """
+    Let flask-restful dispatch to an async handler method
+
+    flask-restful calls handler methods synchronously, so coroutine methods are
+    run to completion on a fresh event loop in the request thread, where the
+    request context stays available. Plain methods are returned unchanged.
+
+    Args:
+        method: Bound handler method
+
+    Returns:
+        callable: Synchronous handler
+    """
+    if not inspect.iscoroutinefunction(method):
+        return method
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(method(*args, **kwargs))
+
+    return wrapper
+
+
+class AsyncResource(Resource):
+    """
+    Resource whose handlers may be declared with async def.
+
+    Handlers await blocking service calls through concurrency.run_blocking so
+    independent AWS calls of one request run concurrently on the shared, bounded
+    section executor instead of one after another.
+    """
+
+    method_decorators = [run_coroutine]
@@ -1,10 +1,12 @@
 # app/utils/auth_utils.py
 import jwt
 import datetime
-import boto3
 import logging
 from botocore.exceptions import ClientError
 from flask import current_app
+from app.services.account_fanout import assume_roles
+from app.utils.client_pool import client_pool
+from app.utils.session_store import session_store
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -12,17 +14,35 @@ logger = logging.getLogger(__name__)
 
 class AuthUtils:
     @staticmethod
-    def generate_token(aws_access_key_id, aws_secret_access_key, aws_region='us-west-2'):
+    def generate_token(aws_access_key_id, aws_secret_access_key, aws_region='us-west-2', prebuild=(), role_arns=()):
+        """
+        Verify AWS credentials and issue a token for a new server-side session
+        
+        The credentials are kept in the session store; the token only carries the
+        opaque session ID and expires together with the session.
+        
+        Args:
+            aws_access_key_id: AWS access key ID
+            aws_secret_access_key: AWS secret access key
+            aws_region: AWS region
+            prebuild: Service classes to build when the session is created
+            role_arns: Validated ARNs of roles in other accounts; they are assumed
+                right away so the first multi-account request does not wait on STS
+        
+        Returns:
+            dict: The token and its expiry time, plus the outcome of assuming
+                each role under 'accounts' when role_arns were given
+        """
         try:
             # Detailed credential validation
             logger.debug(f"Attempting to validate AWS credentials for access key: {aws_access_key_id}")
             
             # Create STS client with provided credentials
-            sts_client = boto3.client(
+            sts_client = client_pool.get_client(
                 'sts',
                 aws_access_key_id=aws_access_key_id,
                 aws_secret_access_key=aws_secret_access_key,
-                region_name=aws_region
+                region=aws_region
             )
             
             try:
@@ -36,15 +56,19 @@ class AuthUtils:
                 logger.error(f"AWS Credential Validation Failed: {error_code} - {error_message}")
                 raise ValueError(f"AWS Credential Validation Failed: {error_message}")
             
-            # Generate token with full credential information
-            expiration = datetime.datetime.utcnow() + datetime.timedelta(
-                minutes=current_app.config['TOKEN_EXPIRATION_MINUTES']
+            # Keep the credentials server-side; the token only identifies the session
+            session = session_store.create(
+                aws_access_key_id,
+                aws_secret_access_key,
+                aws_region,
+                caller_identity,
+                prebuild=prebuild,
+                role_arns=role_arns
             )
+            expiration = datetime.datetime.utcfromtimestamp(int(session.expires_at))
             
             token_payload = {
-                'aws_access_key_id': aws_access_key_id,
-                'aws_secret_access_key': aws_secret_access_key,
-                'aws_region': aws_region,
+                'sid': session.id,
                 'exp': expiration
             }
             
@@ -54,27 +78,83 @@ class AuthUtils:
                 algorithm='HS256'
             )
             
-            return {
+            token_info = {
                 'token': token,
                 'expires_at': expiration.isoformat() + 'Z'
             }
+            if session.role_arns:
+                # A role that cannot be assumed now is retried on use, so it does not fail the login
+                token_info['accounts'] = assume_roles(session)
+            return token_info
         
         except Exception as e:
             logger.error(f"Token generation failed: {str(e)}")
             raise ValueError(f"Authentication failed: {str(e)}")
 
     @staticmethod
-    def validate_token(token):
+    def get_session(token):
+        """
+        Look up the session a token was issued for
+        
+        Args:
+            token: JWT from the Authorization header
+        
+        Returns:
+            Session: The session holding the credentials and service objects
+        
+        Raises:
+            ValueError: If the token is invalid or expired, or its session is gone
+        """
         try:
             payload = jwt.decode(
                 token, 
                 current_app.config['JWT_SECRET_KEY'], 
                 algorithms=['HS256']
             )
-            return payload
         except jwt.ExpiredSignatureError:
             logger.warning("Token has expired")
             raise ValueError("Token has expired")
         except jwt.InvalidTokenError:
             logger.warning("Invalid token")
-            raise ValueError("Invalid token")
\ No newline at end of file
+            raise ValueError("Invalid token")
+        
+        session = session_store.get(payload.get('sid'))
+        if session is None:
+            # Logged out, expired, or issued before a server restart
+            logger.warning("Session not found for token")
+            raise ValueError("Session has expired")
+        return session
+
+    @staticmethod
+    def validate_token(token):
+        """
+        Validate a token and get the session payload
+        
+        Args:
+            token: JWT from the Authorization header
+        
+        Returns:
+            dict: The session's credentials, region and identity
+        
+        Raises:
+            ValueError: If the token or its session is not valid
+        """
+        return AuthUtils.get_session(token).payload
+
+    @staticmethod
+    def revoke_token(token):
+        """
+        End the session a token was issued for
+        
+        Args:
+            token: JWT from the Authorization header
+        
+        Returns:
+            Session: The session that was ended
+        
+        Raises:
+            ValueError: If the token or its session is not valid
+        """
+        session = AuthUtils.get_session(token)
+        session_store.delete(session.id)
+        return session
\ No newline at end of file
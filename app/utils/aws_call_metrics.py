@@ -0,0 +1,156 @@
+# app/utils/aws_call_metrics.py
+import contextvars
+import logging
+import threading
+import time
+
+from app.utils.prometheus import Counter, Histogram, registry
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Error codes botocore's standard retry mode treats as throttling
+THROTTLE_ERROR_CODES = frozenset((
+    'Throttling', 'ThrottlingException', 'ThrottledException', 'RequestThrottledException',
+    'TooManyRequestsException', 'ProvisionedThroughputExceededException', 'TransactionInProgressException',
+    'RequestLimitExceeded', 'BandwidthLimitExceeded', 'LimitExceededException', 'RequestThrottled',
+    'SlowDown', 'PriorRequestNotComplete', 'EC2ThrottledException'
+))
+
+# Route label of calls made outside a request, e.g. by the crawler or jobs
+BACKGROUND_ROUTE = 'background'
+
+AWS_CALLS = registry.register(Counter(
+    'aws_api_calls_total', 'AWS API calls made, by service, operation and API route',
+    ('service', 'operation', 'route')
+))
+AWS_CALL_ERRORS = registry.register(Counter(
+    'aws_api_call_errors_total', 'AWS API calls that ended in an error response or exception',
+    ('service', 'operation', 'route')
+))
+AWS_RETRIES = registry.register(Counter(
+    'aws_api_retries_total', 'Retry attempts made by botocore for AWS API calls',
+    ('service', 'operation', 'route')
+))
+AWS_THROTTLES = registry.register(Counter(
+    'aws_api_throttles_total', 'AWS API attempts rejected with a throttling error',
+    ('service', 'operation', 'route')
+))
+AWS_CALL_DURATION = registry.register(Histogram(
+    'aws_api_call_duration_seconds', 'Duration of AWS API calls including retries',
+    ('service', 'operation', 'route')
+))
+
+
+class RequestStats:
+    """AWS call count and time of one API request, summed across worker threads"""
+
+    def __init__(self, route):
+        self.route = route
+        self.calls = 0
+        self.time_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, duration_ms):
+        with self._lock:
+            self.calls += 1
+            self.time_ms += duration_ms
+
+
+# Set for the duration of an API request; the concurrency helpers copy it to
+# the worker threads that make the request's AWS calls
+_current_request = contextvars.ContextVar('aws_call_request_stats', default=None)
+
+
+def begin_request(route):
+    """
+    Start collecting AWS call statistics for an API request
+
+    Args:
+        route: Route template of the request, e.g. '/api/v1/s3/buckets/<bucket_name>'
+
+    Returns:
+        contextvars.Token: Token to pass to end_request
+    """
+    return _current_request.set(RequestStats(route))
+
+
+def current_request_stats():
+    """Get the statistics of the API request being handled, or None outside requests"""
+    return _current_request.get()
+
+
+def end_request(token):
+    """Stop collecting statistics for the request started with begin_request"""
+    _current_request.reset(token)
+
+
+def _labels(model):
+    stats = _current_request.get()
+    return {
+        'service': model.service_model.service_name,
+        'operation': model.name,
+        'route': stats.route if stats is not None else BACKGROUND_ROUTE
+    }
+
+
+def _on_before_parameter_build(model, context, **kwargs):
+    # Emitted to every handler, unlike before-call which stops at the first
+    # handler returning a response, so the clock always starts here
+    context['aws_call_metrics_start'] = time.perf_counter()
+    context['aws_call_metrics_model'] = model
+
+
+def _finish(model, context, failed, retries=0):
+    context.pop('aws_call_metrics_model', None)
+    start = context.pop('aws_call_metrics_start', None)
+    duration = time.perf_counter() - start if start is not None else 0.0
+    labels = _labels(model)
+
+    AWS_CALLS.inc(**labels)
+    AWS_CALL_DURATION.observe(duration, **labels)
+    if failed:
+        AWS_CALL_ERRORS.inc(**labels)
+    if retries:
+        AWS_RETRIES.inc(retries, **labels)
+
+    stats = _current_request.get()
+    if stats is not None:
+        stats.record(duration * 1000)
+
+
+def _on_after_call(http_response, parsed, model, context, **kwargs):
+    retries = (parsed or {}).get('ResponseMetadata', {}).get('RetryAttempts', 0)
+    _finish(model, context, failed=http_response.status_code >= 300, retries=retries)
+
+
+def _on_after_call_error(context, **kwargs):
+    # after-call-error carries no operation model; before-parameter-build left one
+    model = context.get('aws_call_metrics_model')
+    if model is not None:
+        _finish(model, context, failed=True)
+
+
+def _on_needs_retry(response, operation, **kwargs):
+    # Emitted after every attempt, so throttles that were retried away count too
+    if response is None:
+        return None
+    error_code = (response[1] or {}).get('Error', {}).get('Code')
+    if error_code in THROTTLE_ERROR_CODES:
+        AWS_THROTTLES.inc(**_labels(operation))
+    return None
+
+
+def install(client_pool):
+    """
+    Instrument every client of a client pool
+
+    Args:
+        client_pool: ClientPool whose current and future clients report calls
+    """
+    client_pool.register_event_handler('before-parameter-build', _on_before_parameter_build, 'aws-metrics-start')
+    client_pool.register_event_handler('after-call', _on_after_call, 'aws-metrics-finish')
+    client_pool.register_event_handler('after-call-error', _on_after_call_error, 'aws-metrics-error')
+    client_pool.register_event_handler('needs-retry', _on_needs_retry, 'aws-metrics-throttle')
+    logger.info("AWS API call metrics enabled")
@@ -0,0 +1,313 @@
+# app/utils/cache.py
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from app.config.config import Config
+from app.models.snapshot_store import snapshot_store
+from app.utils.concurrency import get_section_executor
+from app.utils.etag import compute_etag
+from app.utils.singleflight import singleflight
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+def is_error_response(value):
+    """Return True if a service method returned its {'error': ...} failure shape"""
+    return isinstance(value, dict) and 'error' in value
+
+
+def cache_key(payload, operation, *args, **kwargs):
+    """
+    Build a cache key for a service call made on behalf of a token
+
+    Keys are scoped to the caller's access key rather than the account, so users
+    with different IAM permissions in the same account never share entries.
+
+    Args:
+        payload: Decoded token payload
+        operation: Operation name, e.g. 's3.list_buckets'
+        *args: Positional arguments of the operation
+        **kwargs: Keyword arguments of the operation
+
+    Returns:
+        tuple: Hashable cache key
+    """
+    arguments = json.dumps([args, kwargs], sort_keys=True, default=str)
+    return (
+        payload['aws_access_key_id'],
+        payload.get('aws_region', 'us-west-2'),
+        operation,
+        arguments
+    )
+
+
+class CacheResult:
+    """Value returned by ResponseCache.get_or_load along with its freshness"""
+
+    def __init__(self, value, status, age, etag=None):
+        self.value = value
+        self.status = status
+        self.age = age
+        self.etag = etag
+
+    def headers(self):
+        """
+        Get response headers describing the freshness of the value
+
+        Returns:
+            dict: Age and X-Cache headers, and the ETag stored with the value
+                if it was cached
+        """
+        headers = {
+            'Age': str(int(self.age)),
+            'X-Cache': self.status
+        }
+        if self.etag is not None:
+            headers['ETag'] = self.etag
+        return headers
+
+
+class _CacheEntry:
+    def __init__(self, value, size, etag):
+        self.value = value
+        self.size = size
+        self.etag = etag
+        self.stored_at = time.monotonic()
+        self.refreshing = False
+
+    def age(self, now):
+        return now - self.stored_at
+
+
+class ResponseCache:
+    """
+    In-process TTL cache for service responses with stale-while-revalidate.
+
+    Entries are evicted in LRU order once the estimated size of all cached values
+    exceeds max_bytes. A value older than its TTL but younger than TTL +
+    max_stale_seconds is served immediately while a background refresh runs.
+    If AWS returns an error, the last good value keeps being served for up to
+    stale_if_error_seconds past its TTL.
+    """
+
+    def __init__(self, max_bytes, max_stale_seconds, stale_if_error_seconds):
+        """
+        Initialize the response cache
+
+        Args:
+            max_bytes: Memory cap for cached values, in bytes of serialized JSON
+            max_stale_seconds: How long past its TTL a value may be served while it
+                is refreshed in the background
+            stale_if_error_seconds: How long past its TTL a value may be served when
+                refreshing it fails
+        """
+        self.max_bytes = max_bytes
+        self.max_stale_seconds = max_stale_seconds
+        self.stale_if_error_seconds = stale_if_error_seconds
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(self, key, loader, ttl, cacheable=None):
+        """
+        Get a cached value, loading or refreshing it as needed
+
+        Args:
+            key: Cache key, see cache_key()
+            loader: Zero-argument callable producing a fresh value
+            ttl: Seconds a value is considered fresh
+            cacheable: Optional predicate deciding whether a loaded value may be
+                stored (default: anything that is not an error response)
+
+        Returns:
+            CacheResult: The value with its cache status (HIT, STALE, MISS,
+                COALESCED or STALE_IF_ERROR) and age in seconds
+        """
+        if cacheable is None:
+            cacheable = lambda value: not is_error_response(value)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                age = entry.age(now)
+
+                if age < ttl:
+                    self.hits += 1
+                    return CacheResult(entry.value, 'HIT', age, entry.etag)
+
+                if age < ttl + self.max_stale_seconds:
+                    self.stale_hits += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        get_section_executor().submit(self._refresh, key, entry, loader, cacheable)
+                    return CacheResult(entry.value, 'STALE', age, entry.etag)
+
+            self.misses += 1
+
+        # Misses for the same key wait for the load already in flight, which
+        # may be the crawler's; every caller of a key gets back the bare value
+        value, shared = singleflight.do(key, lambda: self._load(key, loader, cacheable))
+        status = 'COALESCED' if shared else 'MISS'
+
+        if cacheable(value):
+            return CacheResult(value, status, 0, self._stored_etag(key, value))
+
+        # Fall back to the last good value if it is not too old
+        if entry is not None:
+            age = entry.age(time.monotonic())
+            if age < ttl + self.stale_if_error_seconds:
+                logger.warning(f"Serving stale {key[2]} after a failed refresh")
+                return CacheResult(entry.value, 'STALE_IF_ERROR', age, entry.etag)
+
+        return CacheResult(value, status, 0)
+
+    def _load(self, key, loader, cacheable):
+        """Call loader and store its value if it may be cached"""
+        try:
+            value = loader()
+        except Exception as e:
+            logger.error(f"Error loading {key[2]}: {str(e)}")
+            value = {"error": f"Unexpected error: {str(e)}"}
+
+        if cacheable(value):
+            self._store(key, value)
+        return value
+
+    def _stored_etag(self, key, value):
+        """Get the ETag stored with a loaded value, storing the value first if its load did not"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.value is value:
+                return entry.etag
+        # A load led by the crawler returns the value without caching it
+        return self._store(key, value)
+
+    def _refresh(self, key, entry, loader, cacheable):
+        """Reload a stale entry in the background, keeping it if the reload fails"""
+        try:
+            value, _ = singleflight.do(key, lambda: self._load(key, loader, cacheable))
+            if not cacheable(value):
+                logger.warning(f"Background refresh of {key[2]} failed, keeping stale value")
+        except Exception as e:
+            logger.error(f"Background refresh of {key[2]} raised: {str(e)}")
+        finally:
+            entry.refreshing = False
+
+    def _store(self, key, value):
+        """Store a value, returning its ETag, or None if it is too large to cache"""
+        # The value is serialized once, for both its size and its ETag, so
+        # responses served from the entry never hash their body again
+        serialized = json.dumps(value, default=str)
+        size = len(serialized)
+        if size > self.max_bytes:
+            logger.warning(f"Not caching {key[2]}: {size} bytes exceeds the cache size")
+            return None
+        etag = compute_etag(serialized)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old.size
+
+            self._entries[key] = _CacheEntry(value, size, etag)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.size
+                self.evictions += 1
+
+        return etag
+
+    def invalidate(self, key):
+        """Remove a single entry"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry.size
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """
+        Get cache usage statistics
+
+        Returns:
+            dict: Entry count, size in bytes and hit/miss/eviction counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+# Shared cache used by the inventory endpoints
+response_cache = ResponseCache(
+    max_bytes=Config.CACHE_MAX_BYTES,
+    max_stale_seconds=Config.CACHE_MAX_STALE_SECONDS,
+    stale_if_error_seconds=Config.CACHE_STALE_IF_ERROR_SECONDS
+)
+
+
+def fetch_inventory(payload, operation, loader, arguments=None, cacheable=None):
+    """
+    Get an inventory operation result for a token
+
+    When the background crawler is enabled, a recent enough snapshot is served
+    straight from the snapshot store. Snapshots only hold unfiltered listings, so
+    calls with arguments always go through the response cache, which calls
+    loader on a miss.
+
+    Args:
+        payload: Decoded token payload
+        operation: Operation name, e.g. 's3.list_buckets'
+        loader: Callable producing a fresh value, called with arguments as keywords
+        arguments: Optional dict of keyword arguments, part of the cache key
+        cacheable: Optional predicate passed to ResponseCache.get_or_load
+
+    Returns:
+        CacheResult: The value with its cache status and age in seconds
+    """
+    arguments = arguments or {}
+
+    if Config.CRAWLER_ENABLED and not arguments:
+        snapshot = snapshot_store.latest(
+            payload['aws_access_key_id'],
+            payload.get('aws_region', 'us-west-2'),
+            operation,
+            max_age=Config.SNAPSHOT_MAX_AGE_SECONDS
+        )
+        if snapshot is not None:
+            return CacheResult(
+                snapshot['payload'], 'SNAPSHOT', time.time() - snapshot['crawled_at'], snapshot['etag']
+            )
+
+    return response_cache.get_or_load(
+        cache_key(payload, operation, **arguments),
+        lambda: loader(**arguments),
+        ttl=Config.CACHE_TTLS[operation],
+        cacheable=cacheable
+    )
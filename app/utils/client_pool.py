@@ -0,0 +1,201 @@
+# app/utils/client_pool.py
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import boto3
+from botocore.config import Config as BotoConfig
+
+from app.config.config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class ClientPool:
+    """
+    Process-wide pool of boto3 clients keyed by credentials, region and service.
+
+    boto3 clients are thread-safe and expensive to build (service model loading,
+    endpoint resolution and a fresh urllib3 connection pool), so they are shared
+    across requests instead of being rebuilt by every service instance. The pool
+    is bounded: least recently used clients are evicted when it is full, and
+    clients that have not been used for ``idle_timeout`` seconds are dropped.
+    """
+
+    def __init__(self, max_size=64, idle_timeout=900):
+        """
+        Initialize the client pool
+
+        Args:
+            max_size: Maximum number of clients kept in the pool
+            idle_timeout: Seconds after which an unused client is evicted
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+
+        # A single session shares the loader, so service models are parsed once
+        self._session = boto3.session.Session()
+        self._clients = OrderedDict()
+        self._client_hooks = []
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _make_key(service_name, aws_access_key_id, aws_secret_access_key, aws_session_token, region,
+                  max_pool_connections):
+        # Never keep the raw secret in the key; a digest is enough to make sure a
+        # client built for one secret is never handed to a caller presenting another
+        secret_digest = hashlib.sha256(
+            f"{aws_secret_access_key or ''}:{aws_session_token or ''}".encode('utf-8')
+        ).hexdigest()
+        return (aws_access_key_id, secret_digest, region, service_name, max_pool_connections)
+
+    def get_client(self, service_name, aws_access_key_id, aws_secret_access_key, region,
+                   max_pool_connections=None, aws_session_token=None):
+        """
+        Get a pooled boto3 client, creating it on first use
+
+        Args:
+            service_name: AWS service name (e.g. 's3', 'ecs', 'ec2')
+            aws_access_key_id: AWS access key ID
+            aws_secret_access_key: AWS secret access key
+            region: AWS region
+            max_pool_connections: Size of the client's HTTP connection pool
+                (default: Config.AWS_MAX_POOL_CONNECTIONS)
+            aws_session_token: Session token for temporary credentials
+
+        Returns:
+            botocore.client.BaseClient: A client safe to share between threads
+        """
+        if max_pool_connections is None:
+            max_pool_connections = Config.AWS_MAX_POOL_CONNECTIONS
+
+        key = self._make_key(service_name, aws_access_key_id, aws_secret_access_key,
+                             aws_session_token, region, max_pool_connections)
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle(now)
+
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry['last_used'] = now
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return entry['client']
+
+            self.misses += 1
+            logger.debug(f"Creating pooled {service_name} client for region {region}")
+
+            # Sessions are not thread-safe, so clients are built under the lock
+            client = self._session.client(
+                service_name,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                aws_session_token=aws_session_token,
+                region_name=region,
+                config=BotoConfig(max_pool_connections=max_pool_connections)
+            )
+
+            for hook in self._client_hooks:
+                hook(client, service_name, aws_access_key_id, region)
+
+            self._clients[key] = {'client': client, 'last_used': now}
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+
+            return client
+
+    def _evict_idle(self, now):
+        """Drop clients that have been idle longer than idle_timeout (lock must be held)"""
+        # Entries are kept in LRU order, so idle ones are always at the front
+        while self._clients:
+            key, entry = next(iter(self._clients.items()))
+            if now - entry['last_used'] < self.idle_timeout:
+                break
+            self._clients.popitem(last=False)
+            self.evictions += 1
+
+    def register_event_handler(self, event_name, handler, unique_id):
+        """
+        Register a botocore event handler on every pooled client, current and future
+
+        Clients copy the session's event hooks when they are built, so the handler
+        is added both to the session and to the clients already in the pool.
+
+        Args:
+            event_name: botocore event, e.g. 'before-call' or 'after-call.s3'
+            handler: Callable receiving the event's keyword arguments
+            unique_id: ID used to avoid registering the handler twice and to unregister it
+        """
+        with self._lock:
+            self._session.events.register(event_name, handler, unique_id=unique_id)
+            for entry in self._clients.values():
+                entry['client'].meta.events.register(event_name, handler, unique_id=unique_id)
+
+    def add_client_hook(self, hook):
+        """
+        Call a hook for every pooled client, current and future
+
+        Unlike register_event_handler, the hook learns which credentials, region
+        and service the client was built for, so it can register handlers bound
+        to them on client.meta.events.
+
+        Args:
+            hook: Callable taking (client, service_name, aws_access_key_id, region)
+        """
+        with self._lock:
+            if hook in self._client_hooks:
+                return
+            self._client_hooks.append(hook)
+            for (aws_access_key_id, _, region, service_name, _), entry in self._clients.items():
+                hook(entry['client'], service_name, aws_access_key_id, region)
+
+    def unregister_event_handler(self, event_name, unique_id):
+        """
+        Remove a handler added with register_event_handler
+
+        Args:
+            event_name: botocore event the handler was registered for
+            unique_id: ID the handler was registered with
+        """
+        with self._lock:
+            self._session.events.unregister(event_name, unique_id=unique_id)
+            for entry in self._clients.values():
+                entry['client'].meta.events.unregister(event_name, unique_id=unique_id)
+
+    def clear(self):
+        """Remove all clients from the pool"""
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self):
+        """
+        Get pool usage statistics
+
+        Returns:
+            dict: Current size, capacity and hit/miss/eviction counters
+        """
+        with self._lock:
+            return {
+                'size': len(self._clients),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+# Shared pool used by all service classes
+client_pool = ClientPool(
+    max_size=Config.CLIENT_POOL_MAX_SIZE,
+    idle_timeout=Config.CLIENT_POOL_IDLE_TIMEOUT_SECONDS
+)
@@ -0,0 +1,404 @@
+# app/utils/concurrency.py
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, wait, FIRST_COMPLETED
+
+from app.config.config import Config
+from app.utils import profiling
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+_executor = None
+_section_executor = None
+_region_executor = None
+_account_executor = None
+_scan_executor = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def get_shared_executor():
+    """
+    Get the process-wide executor used for blocking AWS calls
+
+    Returns:
+        ThreadPoolExecutor: Shared, bounded executor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.AWS_EXECUTOR_MAX_WORKERS,
+                    thread_name_prefix='aws-io'
+                )
+    return _executor
+
+
+def get_section_executor():
+    """
+    Get the process-wide executor used for independent sections of a request
+
+    Sections fan out their own AWS calls through bounded_map, so they run on a
+    separate executor and never occupy the workers they are waiting on.
+
+    Returns:
+        ThreadPoolExecutor: Shared, bounded executor for sections
+    """
+    global _section_executor
+    if _section_executor is None:
+        with _executor_lock:
+            if _section_executor is None:
+                _section_executor = ThreadPoolExecutor(
+                    max_workers=Config.SECTION_EXECUTOR_MAX_WORKERS,
+                    thread_name_prefix='aws-section'
+                )
+    return _section_executor
+
+
+def get_region_executor():
+    """
+    Get the process-wide executor used for per-region fan-out
+
+    Each region runs whole service calls, so regions get an executor separate
+    from both the section and leaf workers. Sections started inside a region
+    run inline (see run_sections) rather than going back to the section executor.
+
+    Returns:
+        ThreadPoolExecutor: Shared, bounded executor for regions
+    """
+    global _region_executor
+    if _region_executor is None:
+        with _executor_lock:
+            if _region_executor is None:
+                _region_executor = ThreadPoolExecutor(
+                    max_workers=Config.REGION_FANOUT_MAX_WORKERS,
+                    thread_name_prefix='aws-region'
+                )
+    return _region_executor
+
+
+def get_account_executor():
+    """
+    Get the process-wide executor used for per-account fan-out
+
+    Each account runs a whole dashboard summary, which fans out over regions,
+    so accounts get an executor of their own. Sections started inside an
+    account run inline (see run_sections).
+
+    Returns:
+        ThreadPoolExecutor: Shared, bounded executor for accounts
+    """
+    global _account_executor
+    if _account_executor is None:
+        with _executor_lock:
+            if _account_executor is None:
+                _account_executor = ThreadPoolExecutor(
+                    max_workers=Config.ACCOUNT_FANOUT_MAX_WORKERS,
+                    thread_name_prefix='aws-account'
+                )
+    return _account_executor
+
+
+def get_scan_executor():
+    """
+    Get the process-wide executor used by S3 bucket scan jobs
+
+    Scans list partitions for as long as a bucket takes, often hours, so they
+    get workers of their own instead of holding the shared executor that every
+    API request fans out on. It is sized for every job worker scanning at once.
+
+    Returns:
+        ThreadPoolExecutor: Shared, bounded executor for bucket scans
+    """
+    global _scan_executor
+    if _scan_executor is None:
+        with _executor_lock:
+            if _scan_executor is None:
+                _scan_executor = ThreadPoolExecutor(
+                    max_workers=Config.S3_SCAN_CONCURRENCY * Config.JOB_MAX_WORKERS,
+                    thread_name_prefix='aws-scan'
+                )
+    return _scan_executor
+
+
+def in_shared_worker():
+    """Return True when called from a thread of the shared executor"""
+    return getattr(_worker_state, 'active', False)
+
+
+def in_fanout_worker():
+    """Return True when called from a thread of the region or account executor"""
+    return getattr(_worker_state, 'fanout', False)
+
+
+def submit_in_context(executor, func, *args):
+    """
+    Submit func to an executor, running it in a copy of the caller's context
+
+    Context variables such as the per-request AWS call statistics then follow
+    the work onto the worker thread, and work of a profiled request is profiled
+    in the worker too.
+    """
+    return executor.submit(contextvars.copy_context().run, profiling.wrap(func), *args)
+
+
+def _run_in_worker(func, item):
+    _worker_state.active = True
+    try:
+        return func(item)
+    finally:
+        _worker_state.active = False
+
+
+def bounded_map(func, items, max_workers):
+    """
+    Apply func to every item on the shared executor with bounded concurrency
+
+    At most max_workers items of this call are in flight at once, and results are
+    returned in the same order as items. When called from inside a shared worker
+    the items are processed inline, so nested fan-outs can never deadlock the pool
+    by waiting on work queued behind them.
+
+    Args:
+        func: Callable taking a single item
+        items: Iterable of items to process
+        max_workers: Maximum number of items processed concurrently
+
+    Returns:
+        list: func(item) for each item, in input order
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1 or in_shared_worker():
+        return [func(item) for item in items]
+
+    executor = get_shared_executor()
+    results = [None] * len(items)
+    pending = {}
+    next_index = 0
+
+    def submit_next():
+        nonlocal next_index
+        future = submit_in_context(executor, _run_in_worker, func, items[next_index])
+        pending[future] = next_index
+        next_index += 1
+
+    while next_index < len(items) and len(pending) < max_workers:
+        submit_next()
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            results[index] = future.result()
+            if next_index < len(items):
+                submit_next()
+
+    return results
+
+
+def run_sections(sections, executor=None):
+    """
+    Run independent sections concurrently, each with its own timeout
+
+    A section that overruns its timeout is reported as timed out; it keeps running
+    in the background but its result is discarded.
+
+    When called from a region or account worker the sections run inline, one
+    after another. Each still gets its own budget, measured from the start of
+    the call and capped by the region's or account's deadline: a section whose
+    budget ran out before its turn is skipped and one that finished late is
+    dropped, both reported as timed out, so the sections that completed in time
+    are kept. A section that is already running cannot be cut short, though; if
+    it overruns the enclosing deadline, the region or account as a whole is
+    reported as timed out.
+    Those fan-outs are themselves started from sections, so submitting back to
+    the section executor would nest it inside itself: a few concurrent fan-outs
+    fill it with outer sections waiting on regions whose inner sections then
+    queue behind them until they time out. The regions or accounts already run
+    concurrently, so little is lost by running their sections in turn.
+
+    Args:
+        sections: Dictionary mapping section name to a (func, timeout_seconds) tuple
+        executor: Executor to run the sections on (default: the section executor)
+
+    Returns:
+        tuple: (results, status) where results maps each section name to its return
+            value (None if it did not complete) and status maps each section name
+            to a dict describing how it finished
+    """
+    executor = executor or get_section_executor()
+    start = time.monotonic()
+    durations = {}
+    is_fanout = executor is _region_executor or executor is _account_executor
+
+    def timed(name, func, timeout):
+        section_start = time.monotonic()
+        _worker_state.fanout = is_fanout
+        # Inline sections of a region or account stop starting at its deadline
+        _worker_state.deadline = start + timeout if is_fanout else None
+        try:
+            return func()
+        finally:
+            _worker_state.fanout = False
+            _worker_state.deadline = None
+            durations[name] = round((time.monotonic() - section_start) * 1000, 1)
+
+    if in_fanout_worker() and not is_fanout:
+        return _run_sections_inline(sections)
+
+    futures = {
+        name: submit_in_context(executor, timed, name, func, timeout)
+        for name, (func, timeout) in sections.items()
+    }
+
+    results = {}
+    status = {}
+    for name, (_, timeout) in sections.items():
+        remaining = max(0, start + timeout - time.monotonic())
+        try:
+            results[name] = futures[name].result(timeout=remaining)
+            status[name] = {'status': 'completed', 'duration_ms': durations.get(name)}
+        except TimeoutError:
+            logger.warning(f"Section {name} timed out after {timeout}s")
+            results[name] = None
+            status[name] = {'status': 'timed_out', 'timeout_seconds': timeout}
+        except Exception as e:
+            logger.error(f"Section {name} failed: {str(e)}")
+            results[name] = None
+            status[name] = {'status': 'failed', 'error': str(e), 'duration_ms': durations.get(name)}
+
+    return results, status
+
+
+def _run_sections_inline(sections):
+    """Run sections one after another in the calling thread, reporting them like run_sections"""
+    start = time.monotonic()
+    enclosing_deadline = getattr(_worker_state, 'deadline', None)
+    results = {}
+    status = {}
+    for name, (func, timeout) in sections.items():
+        deadline = start + timeout
+        if enclosing_deadline is not None:
+            deadline = min(deadline, enclosing_deadline)
+        section_start = time.monotonic()
+        if section_start >= deadline:
+            logger.warning(f"Section {name} skipped, its {timeout}s budget ran out before it started")
+            results[name] = None
+            status[name] = {'status': 'timed_out', 'timeout_seconds': timeout}
+            continue
+        try:
+            results[name] = func()
+            status[name] = {'status': 'completed'}
+        except Exception as e:
+            logger.error(f"Section {name} failed: {str(e)}")
+            results[name] = None
+            status[name] = {'status': 'failed', 'error': str(e)}
+        if status[name]['status'] == 'completed' and time.monotonic() > deadline:
+            # Late, as run_sections would have given up on it
+            logger.warning(f"Section {name} timed out after {timeout}s")
+            results[name] = None
+            status[name] = {'status': 'timed_out', 'timeout_seconds': timeout}
+            continue
+        status[name]['duration_ms'] = round((time.monotonic() - section_start) * 1000, 1)
+    return results, status
+
+
+def bounded_imap_unordered(func, items, max_workers, executor=None):
+    """
+    Apply func to every item on the shared executor, yielding results as they finish
+
+    Like bounded_map, at most max_workers items are in flight at once and the
+    items are processed inline when called from a shared worker. Results are
+    yielded in completion order so callers can stream them.
+
+    Args:
+        func: Callable taking a single item
+        items: Iterable of items to process
+        max_workers: Maximum number of items processed concurrently
+        executor: Executor to run the items on (default: the shared executor)
+
+    Yields:
+        func(item) for each item, in completion order
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1 or in_shared_worker():
+        for item in items:
+            yield func(item)
+        return
+
+    executor = executor or get_shared_executor()
+    pending = set()
+    next_index = 0
+
+    try:
+        while next_index < len(items) or pending:
+            while next_index < len(items) and len(pending) < max_workers:
+                pending.add(submit_in_context(executor, _run_in_worker, func, items[next_index]))
+                next_index += 1
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # Stop queued work if the consumer goes away early
+        for future in pending:
+            future.cancel()
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Await a blocking call, such as a boto3-backed service method, from a coroutine
+
+    The call runs on the section executor, since service methods fan out their
+    own AWS calls through bounded_map. Independent calls can be awaited together
+    with asyncio.gather. When Config.ASYNC_VIEWS_ENABLED is off the call runs
+    inline, which reproduces the sequential synchronous handlers.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The return value of func
+    """
+    if not Config.ASYNC_VIEWS_ENABLED:
+        return func(*args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_section_executor(),
+        contextvars.copy_context().run,
+        profiling.wrap(functools.partial(func, *args, **kwargs))
+    )
+
+
+async def map_blocking(func, items, max_workers):
+    """
+    Await a blocking call for every item, such as per-bucket details, from a coroutine
+
+    The items go through bounded_map from a single section worker, so their
+    calls run on the shared executor with at most max_workers of them in flight,
+    rather than as one section job per item that would queue every other
+    request's sections behind them. When Config.ASYNC_VIEWS_ENABLED is off the
+    items run inline one after another, like the synchronous handlers.
+
+    Args:
+        func: Blocking callable taking a single item
+        items: Iterable of items to process
+        max_workers: Maximum number of items processed concurrently
+
+    Returns:
+        list: func(item) for each item, in input order
+    """
+    items = list(items)
+    if not Config.ASYNC_VIEWS_ENABLED:
+        return [func(item) for item in items]
+    return await run_blocking(bounded_map, func, items, max_workers)
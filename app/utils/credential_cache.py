@@ -0,0 +1,168 @@
+# app/utils/credential_cache.py
+import hashlib
+import logging
+import threading
+import time
+
+from app.config.config import Config
+from app.utils.client_pool import client_pool
+from app.utils.concurrency import get_shared_executor
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class _CredentialEntry:
+    def __init__(self, credentials, expires_at, retain_until):
+        self.credentials = credentials
+        self.expires_at = expires_at
+        self.retain_until = retain_until
+        self.refreshing = False
+
+
+class AssumedRoleCredentialCache:
+    """
+    Cache of temporary credentials obtained with sts:AssumeRole.
+
+    Credentials are keyed by the base credentials that assumed the role and the
+    role ARN. Once they are within refresh_ahead seconds of expiring they keep
+    being served while a background refresh runs. Credentials with a
+    retain_until time (the end of the session that uses them) are also
+    refreshed on a timer, so an idle session does not come back to expired
+    credentials; requests only wait on STS the first time a role is used.
+    """
+
+    def __init__(self, duration_seconds, refresh_ahead_seconds, expiry_margin_seconds=60):
+        """
+        Initialize the credential cache
+
+        Args:
+            duration_seconds: Lifetime requested for assumed-role credentials
+            refresh_ahead_seconds: How long before expiry a background refresh starts
+            expiry_margin_seconds: Credentials this close to expiry are never served
+        """
+        self.duration_seconds = duration_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.expiry_margin_seconds = expiry_margin_seconds
+
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _make_key(aws_access_key_id, aws_secret_access_key, role_arn):
+        # As in the client pool, only a digest of the secret is kept
+        secret_digest = hashlib.sha256((aws_secret_access_key or '').encode('utf-8')).hexdigest()
+        return (aws_access_key_id, secret_digest, role_arn)
+
+    def get(self, aws_access_key_id, aws_secret_access_key, role_arn, region, retain_until=None):
+        """
+        Get credentials for a role, assuming it if needed
+
+        Args:
+            aws_access_key_id: Access key ID of the base credentials
+            aws_secret_access_key: Secret access key of the base credentials
+            role_arn: ARN of the role to assume
+            region: Region of the STS endpoint
+            retain_until: Keep refreshing the credentials ahead of expiry until
+                this time (epoch seconds), even if they are not requested
+
+        Returns:
+            dict: aws_access_key_id, aws_secret_access_key and aws_session_token
+
+        Raises:
+            botocore.exceptions.ClientError: If the role cannot be assumed
+        """
+        key = self._make_key(aws_access_key_id, aws_secret_access_key, role_arn)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at - now > self.expiry_margin_seconds:
+                entry.retain_until = max(entry.retain_until or 0, retain_until or 0) or None
+                if entry.expires_at - now <= self.refresh_ahead_seconds:
+                    self._schedule_refresh(key, entry, aws_access_key_id, aws_secret_access_key, role_arn, region)
+                return entry.credentials
+
+        # Nothing usable cached: this caller has to wait for STS
+        return self._assume(key, aws_access_key_id, aws_secret_access_key, role_arn, region, retain_until)
+
+    def _schedule_refresh(self, key, entry, aws_access_key_id, aws_secret_access_key, role_arn, region):
+        """Start a background refresh unless one is already running (lock must be held)"""
+        if not entry.refreshing:
+            entry.refreshing = True
+            # A single STS call, so it goes with the leaf calls rather than onto
+            # the section executor that the fan-outs keep busy
+            get_shared_executor().submit(
+                self._refresh, key, entry, aws_access_key_id, aws_secret_access_key, role_arn, region
+            )
+
+    def _refresh(self, key, entry, aws_access_key_id, aws_secret_access_key, role_arn, region):
+        """Assume the role again in the background, keeping the old credentials if it fails"""
+        try:
+            self._assume(key, aws_access_key_id, aws_secret_access_key, role_arn, region, entry.retain_until)
+        except Exception as e:
+            logger.error(f"Background refresh of {role_arn} credentials failed: {str(e)}")
+        finally:
+            entry.refreshing = False
+
+    def _on_timer(self, key, entry, aws_access_key_id, aws_secret_access_key, role_arn, region):
+        """Refresh retained credentials that reached the refresh-ahead window"""
+        with self._lock:
+            # Skip entries that were replaced, cleared or are no longer needed
+            if self._entries.get(key) is not entry or (entry.retain_until or 0) <= time.time():
+                return
+            self._schedule_refresh(key, entry, aws_access_key_id, aws_secret_access_key, role_arn, region)
+
+    def _assume(self, key, aws_access_key_id, aws_secret_access_key, role_arn, region, retain_until):
+        sts_client = client_pool.get_client(
+            'sts',
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            region=region
+        )
+        request = {
+            'RoleArn': role_arn,
+            'RoleSessionName': f"infra-monitor-{aws_access_key_id[-8:]}",
+            'DurationSeconds': self.duration_seconds
+        }
+        if Config.ASSUME_ROLE_EXTERNAL_ID:
+            request['ExternalId'] = Config.ASSUME_ROLE_EXTERNAL_ID
+
+        response = sts_client.assume_role(**request)
+        credentials = response['Credentials']
+        entry = _CredentialEntry(
+            {
+                'aws_access_key_id': credentials['AccessKeyId'],
+                'aws_secret_access_key': credentials['SecretAccessKey'],
+                'aws_session_token': credentials['SessionToken']
+            },
+            credentials['Expiration'].timestamp(),
+            retain_until
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+        logger.info(f"Assumed role {role_arn}")
+
+        if retain_until and retain_until > entry.expires_at - self.refresh_ahead_seconds:
+            timer = threading.Timer(
+                max(entry.expires_at - self.refresh_ahead_seconds - time.time(), 0),
+                self._on_timer,
+                args=(key, entry, aws_access_key_id, aws_secret_access_key, role_arn, region)
+            )
+            timer.daemon = True
+            timer.start()
+        return entry.credentials
+
+    def clear(self):
+        """Remove all cached credentials"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared cache used by sessions with role ARNs
+assumed_role_credentials = AssumedRoleCredentialCache(
+    duration_seconds=Config.ASSUME_ROLE_DURATION_SECONDS,
+    refresh_ahead_seconds=Config.ASSUME_ROLE_REFRESH_AHEAD_SECONDS
+)
@@ -0,0 +1,49 @@
+# app/utils/etag.py
+import hashlib
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+def compute_etag(data):
+    """
+    Compute a strong ETag for a response body or serialized value
+
+    Args:
+        data: Body bytes, or a str that is hashed as UTF-8
+
+    Returns:
+        str: Quoted ETag, e.g. '"3a7bd3e2..."'
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return f'"{hashlib.sha256(data).hexdigest()}"'
+
+
+def make_conditional(request, response):
+    """
+    Add an ETag to a successful GET response and answer If-None-Match with 304
+
+    A response that already carries an ETag (set from a cached value's stored
+    hash) keeps it; others are hashed from their body. Streamed responses are
+    left alone, since hashing them would mean buffering the whole stream.
+
+    Args:
+        request: Current Flask request
+        response: Response about to be sent
+
+    Returns:
+        Response: The same response, possibly turned into a 304
+    """
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200 or response.is_streamed:
+        return response
+
+    if 'ETag' not in response.headers:
+        response.headers['ETag'] = compute_etag(response.get_data())
+    # Browsers keep the response but revalidate it on every use
+    response.headers.setdefault('Cache-Control', 'private, no-cache')
+
+    # Sets 304 when If-None-Match matches; the body is dropped when it is sent
+    return response.make_conditional(request)
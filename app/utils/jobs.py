@@ -0,0 +1,140 @@
+# app/utils/jobs.py
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config.config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A unit of background work and its progress"""
+
+    def __init__(self, name, owner):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.owner = owner
+        self.status = 'pending'
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def update(self, **progress):
+        """Record progress information reported by the running job"""
+        with self._lock:
+            self.progress.update(progress)
+
+    def to_dict(self):
+        """
+        Get a JSON-serializable view of the job
+
+        Returns:
+            dict: Job status, progress and result or error
+        """
+        with self._lock:
+            return {
+                'job_id': self.id,
+                'name': self.name,
+                'status': self.status,
+                'progress': dict(self.progress),
+                'result': self.result,
+                'error': self.error,
+                'submitted_at': self.submitted_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at
+            }
+
+
+class JobManager:
+    """
+    Runs long AWS crawls outside of HTTP requests.
+
+    Jobs run on a dedicated bounded executor, and the most recent max_jobs jobs
+    are kept so their status and results can be polled.
+    """
+
+    def __init__(self, max_workers, max_jobs):
+        """
+        Initialize the job manager
+
+        Args:
+            max_workers: Maximum number of jobs running at once
+            max_jobs: Number of jobs kept for status lookups
+        """
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, name, owner, func, *args, **kwargs):
+        """
+        Queue a job
+
+        Args:
+            name: Human-readable job name
+            owner: Access key ID of the caller; only the owner can see the job
+            func: Callable run as func(job, *args, **kwargs); its return value
+                becomes the job result
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Job: The queued job
+        """
+        job = Job(name, owner)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        self._executor.submit(self._run, job, func, args, kwargs)
+        logger.info(f"Queued job {job.id} ({name})")
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.status = 'completed'
+            logger.info(f"Job {job.id} ({job.name}) completed")
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            logger.error(f"Job {job.id} ({job.name}) failed: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id, owner):
+        """
+        Look up a job
+
+        Args:
+            job_id: ID returned by submit
+            owner: Access key ID of the caller
+
+        Returns:
+            Job: The job, or None if it does not exist or belongs to someone else
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or job.owner != owner:
+            return None
+        return job
+
+
+# Shared job manager for background crawls
+job_manager = JobManager(
+    max_workers=Config.JOB_MAX_WORKERS,
+    max_jobs=Config.JOB_HISTORY_SIZE
+)
@@ -0,0 +1,183 @@
+# app/utils/metrics_cache.py
+import logging
+import threading
+from collections import OrderedDict
+
+from app.config.config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+def align_down(timestamp, period):
+    """Round a Unix timestamp down to the start of its period"""
+    return int(timestamp) // period * period
+
+
+def align_up(timestamp, period):
+    """Round a Unix timestamp up to the next period boundary"""
+    return -(-int(timestamp) // period) * period
+
+
+class _Series:
+    def __init__(self):
+        # Period start (Unix seconds) -> value, for closed periods only
+        self.points = {}
+        # Sorted, non-overlapping [start, end) ranges already fetched and closed
+        self.covered = []
+
+
+class MetricDatapointCache:
+    """
+    Cache of CloudWatch datapoints for closed metric periods.
+
+    Series are keyed by (access key, region, resource, metric, statistic, period).
+    A period is closed once it ended more than settle seconds ago; its value can
+    no longer change, so it is kept for good and never fetched again. The cache
+    tracks which ranges have been fetched, including ranges with no datapoints,
+    so callers only request the missing gaps and the still-open tail.
+    """
+
+    def __init__(self, max_series, settle_seconds):
+        """
+        Initialize the datapoint cache
+
+        Args:
+            max_series: Maximum number of series kept, evicted in LRU order
+            settle_seconds: Delay after a period ends before it is considered closed
+        """
+        self.max_series = max_series
+        self.settle_seconds = settle_seconds
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+
+    def closed_before(self, now, period):
+        """
+        Get the end of the last closed period
+
+        Args:
+            now: Current Unix timestamp
+            period: Period length in seconds
+
+        Returns:
+            int: Unix timestamp before which every period is closed
+        """
+        return align_down(now - self.settle_seconds, period)
+
+    def missing_ranges(self, key, start, end):
+        """
+        Get the parts of [start, end) that are not cached
+
+        Args:
+            key: Series key
+            start: Period-aligned range start (Unix seconds)
+            end: Range end (Unix seconds)
+
+        Returns:
+            list: (start, end) tuples still to be fetched
+        """
+        with self._lock:
+            series = self._series.get(key)
+            covered = list(series.covered) if series else []
+
+        missing = []
+        cursor = start
+        for covered_start, covered_end in covered:
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    def store(self, key, start, end, period, points, closed_before):
+        """
+        Store datapoints fetched for [start, end)
+
+        Only whole periods that ended before closed_before are kept, and only that
+        part of the range is marked as covered. A partial last period, cut short
+        by an end that is not period-aligned, is left uncovered so it is fetched
+        again rather than cached with an incomplete value.
+
+        Args:
+            key: Series key
+            start: Period-aligned start of the fetched range (Unix seconds)
+            end: End of the fetched range (Unix seconds)
+            period: Period length in seconds
+            points: Iterable of (period start in Unix seconds, value) tuples
+            closed_before: Value returned by closed_before()
+
+        Returns:
+            int: End of the range marked as covered; points at or after it were
+                not stored
+        """
+        covered_end = min(align_down(end, period), align_down(closed_before, period))
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = _Series()
+                self._series[key] = series
+            self._series.move_to_end(key)
+
+            for timestamp, value in points:
+                if start <= timestamp < covered_end:
+                    series.points[timestamp] = value
+
+            if start < covered_end:
+                series.covered = self._merge(series.covered + [(start, covered_end)])
+
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+
+        return covered_end
+
+    def get_points(self, key, start, end):
+        """
+        Get cached datapoints within [start, end)
+
+        Args:
+            key: Series key
+            start: Range start (Unix seconds)
+            end: Range end (Unix seconds)
+
+        Returns:
+            dict: Period start (Unix seconds) -> value
+        """
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return {}
+            self._series.move_to_end(key)
+            return {
+                timestamp: value
+                for timestamp, value in series.points.items()
+                if start <= timestamp < end
+            }
+
+    @staticmethod
+    def _merge(ranges):
+        merged = []
+        for range_start, range_end in sorted(ranges):
+            if merged and range_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+        return merged
+
+    def clear(self):
+        """Remove all series"""
+        with self._lock:
+            self._series.clear()
+
+
+# Shared cache used by EBSService.get_volume_metrics
+metric_datapoint_cache = MetricDatapointCache(
+    max_series=Config.METRICS_CACHE_MAX_SERIES,
+    settle_seconds=Config.METRICS_SETTLE_SECONDS
+)
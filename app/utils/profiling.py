@@ -0,0 +1,238 @@
+# app/utils/profiling.py
+import contextvars
+import cProfile
+import functools
+import io
+import logging
+import marshal
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from app.config.config import Config
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+    """
+    cProfile and tracemalloc capture of a single API request.
+
+    cProfile only sees the thread it is enabled in, so work the request hands to
+    the executors is profiled in each worker thread (see wrap) and merged into
+    the request's statistics when the report is built.
+    """
+
+    def __init__(self, method, path, route, trigger):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.route = route
+        self.trigger = trigger
+        self.started_at = time.time()
+
+        self._profiler = cProfile.Profile()
+        self._worker_profilers = []
+        self._lock = threading.Lock()
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self):
+        self._profiler.disable()
+        return (time.perf_counter() - self._start) * 1000
+
+    def add_worker_profiler(self, profiler):
+        with self._lock:
+            self._worker_profilers.append(profiler)
+
+    def stats(self):
+        """Merged statistics of the request thread and every finished worker"""
+        with self._lock:
+            worker_profilers = list(self._worker_profilers)
+        stats = pstats.Stats(self._profiler)
+        for profiler in worker_profilers:
+            stats.add(profiler)
+        return stats
+
+
+# Profile of the request being handled; copied to worker threads with the context
+_current_profile = contextvars.ContextVar('request_profile', default=None)
+
+
+def wrap(func):
+    """
+    Profile func in the worker thread it runs in, if the caller's request is profiled
+
+    Args:
+        func: Callable about to be handed to an executor
+
+    Returns:
+        func itself outside profiled requests, otherwise a wrapper that runs it
+        under a per-thread profiler attached to the request's profile
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return func
+
+    @functools.wraps(func)
+    def profiled(*args, **kwargs):
+        # A thread already being profiled (e.g. inline nested work) keeps its profiler
+        if sys.getprofile() is not None:
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profile.add_worker_profiler(profiler)
+
+    return profiled
+
+
+class ProfileStore:
+    """
+    Bounded in-memory store of profiling reports.
+
+    tracemalloc is process-wide, so it runs while at least one profiled request
+    is in flight; memory figures of overlapping profiled requests include each
+    other's allocations.
+    """
+
+    def __init__(self, max_reports, top_functions=50, top_allocations=25):
+        """
+        Initialize the profile store
+
+        Args:
+            max_reports: Number of reports kept; the oldest are dropped first
+            top_functions: Functions listed in the text report
+            top_allocations: Allocation sites listed in the memory report
+        """
+        self.max_reports = max_reports
+        self.top_functions = top_functions
+        self.top_allocations = top_allocations
+
+        self._reports = OrderedDict()
+        self._active = 0
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+    def begin(self, method, path, route, trigger):
+        """
+        Start profiling the current request
+
+        Args:
+            method: HTTP method
+            path: Request path
+            route: Route template
+            trigger: What asked for the profile, 'header' or 'sample'
+
+        Returns:
+            tuple: (profile, token) to pass to end
+        """
+        with self._lock:
+            self._active += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+
+        profile = RequestProfile(method, path, route, trigger)
+        token = _current_profile.set(profile)
+        profile.start()
+        return profile, token
+
+    def end(self, profile, token, status_code, aws_stats=None):
+        """
+        Stop profiling a request and store its report
+
+        Args:
+            profile: Profile returned by begin
+            token: Token returned by begin
+            status_code: HTTP status of the response
+            aws_stats: The request's AWS call statistics, if collected
+
+        Returns:
+            str: ID of the stored report
+        """
+        duration_ms = profile.stop()
+        _current_profile.reset(token)
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        _, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            self._active -= 1
+            if self._active == 0 and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+        stats = profile.stats()
+        text = io.StringIO()
+        stats.stream = text
+        stats.sort_stats('cumulative').print_stats(self.top_functions)
+
+        report = {
+            'id': profile.id,
+            'method': profile.method,
+            'path': profile.path,
+            'route': profile.route,
+            'trigger': profile.trigger,
+            'status_code': status_code,
+            'started_at': datetime.utcfromtimestamp(profile.started_at).isoformat() + 'Z',
+            'duration_ms': round(duration_ms, 1),
+            'aws_calls': aws_stats.calls if aws_stats is not None else None,
+            'aws_time_ms': round(aws_stats.time_ms, 1) if aws_stats is not None else None,
+            'peak_memory_kib': round(peak / 1024, 1),
+            'top_allocations': [
+                {
+                    'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    'size_kib': round(stat.size / 1024, 1),
+                    'count': stat.count
+                }
+                for stat in snapshot.statistics('lineno')[:self.top_allocations]
+            ],
+            'cpu_profile': text.getvalue(),
+            # pstats file contents, loadable with pstats.Stats or snakeviz
+            'pstats': marshal.dumps(stats.stats)
+        }
+
+        with self._lock:
+            self._reports[profile.id] = report
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+
+        logger.info(f"Profiled {profile.method} {profile.path} in {duration_ms:.1f}ms (report {profile.id})")
+        return profile.id
+
+    def get(self, report_id):
+        """Get a stored report, or None"""
+        with self._lock:
+            return self._reports.get(report_id)
+
+    def list(self):
+        """
+        List the stored reports, newest first
+
+        Returns:
+            list: Report summaries without the profile data
+        """
+        with self._lock:
+            reports = list(self._reports.values())
+        return [
+            {key: value for key, value in report.items() if key not in ('cpu_profile', 'pstats', 'top_allocations')}
+            for report in reversed(reports)
+        ]
+
+
+# Shared store behind /debug/profiles
+profile_store = ProfileStore(max_reports=Config.PROFILING_MAX_REPORTS)
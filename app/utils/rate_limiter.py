@@ -0,0 +1,261 @@
+# app/utils/rate_limiter.py
+import logging
+import threading
+import time
+
+from app.config.config import Config
+from app.utils.aws_call_metrics import THROTTLE_ERROR_CODES
+from app.utils.prometheus import Counter, registry
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_WAITS = registry.register(Counter(
+    'aws_rate_limiter_waits_total', 'AWS API attempts that waited for the rate limiter',
+    ('service',)
+))
+RATE_LIMIT_WAIT_SECONDS = registry.register(Counter(
+    'aws_rate_limiter_wait_seconds_total', 'Time AWS API attempts spent waiting for the rate limiter',
+    ('service',)
+))
+CONCURRENCY_DECREASES = registry.register(Counter(
+    'aws_adaptive_concurrency_decreases_total', 'Times a concurrency limit was cut after throttling',
+    ('service',)
+))
+
+
+class TokenBucket:
+    """Token bucket allowing rate requests per second with bursts of up to burst"""
+
+    def __init__(self, rate, burst):
+        """
+        Initialize the token bucket
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens held
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a token, waiting for one if the bucket is empty
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Concurrency limit adjusted with additive increase, multiplicative decrease.
+
+    Every successful attempt raises the limit by 1/limit, about one slot per
+    round of calls; a throttled attempt multiplies it by backoff, at most once
+    per cooldown so a burst of throttles from the same round only counts once.
+    """
+
+    def __init__(self, initial, minimum, maximum, backoff=0.5, cooldown=1.0):
+        """
+        Initialize the concurrency limit
+
+        Args:
+            initial: Starting limit
+            minimum: Lowest the limit can be cut to
+            maximum: Highest the limit can grow to
+            backoff: Factor applied to the limit on throttling
+            cooldown: Minimum seconds between two cuts
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.cooldown = cooldown
+
+        self.limit = float(initial)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Wait for a free slot and take it
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        start = time.monotonic()
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        return time.monotonic() - start
+
+    def release(self, throttled):
+        """
+        Give back a slot and adjust the limit
+
+        Args:
+            throttled: Whether the attempt was rejected with a throttling error
+
+        Returns:
+            bool: True if the limit was cut
+        """
+        with self._condition:
+            self.in_flight -= 1
+            decreased = False
+            if throttled:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self._last_decrease = now
+                    decreased = True
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+            return decreased
+
+
+class AWSRateLimiter:
+    """
+    Shared limiter for AWS API calls per (account, region, service).
+
+    AWS throttles per account, region and API, across every caller, so every
+    pooled client of the same credentials, region and service shares a token
+    bucket (Config.AWS_RATE_LIMITS) and an adaptive concurrency limit. Attempts,
+    including botocore's retries, take a token and a concurrency slot before
+    they are sent; throttling errors shrink the concurrency limit and successes
+    grow it back. The access key stands in for the account, since clients are
+    pooled by credentials.
+    """
+
+    def __init__(self, rates, default_rate, burst_seconds, initial_concurrency, min_concurrency,
+                 max_concurrency):
+        """
+        Initialize the rate limiter
+
+        Args:
+            rates: Dictionary mapping service name to sustained calls per second
+            default_rate: Calls per second for services not in rates
+            burst_seconds: Bucket size, in seconds' worth of the rate
+            initial_concurrency: Starting concurrency limit per key
+            min_concurrency: Lowest concurrency limit per key
+            max_concurrency: Highest concurrency limit per key
+        """
+        self.rates = rates
+        self.default_rate = default_rate
+        self.burst_seconds = burst_seconds
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.enabled = True
+
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def _limits_for(self, key):
+        with self._lock:
+            limits = self._limits.get(key)
+            if limits is None:
+                rate = self.rates.get(key[2], self.default_rate)
+                limits = (
+                    TokenBucket(rate, max(1, rate * self.burst_seconds)),
+                    AdaptiveConcurrencyLimit(self.initial_concurrency, self.min_concurrency, self.max_concurrency)
+                )
+                self._limits[key] = limits
+            return limits
+
+    def _before_attempt(self, key, request, **kwargs):
+        if not self.enabled:
+            return
+        bucket, concurrency = self._limits_for(key)
+        waited = concurrency.acquire() + bucket.acquire()
+        if waited > 0:
+            RATE_LIMIT_WAITS.inc(service=key[2])
+            RATE_LIMIT_WAIT_SECONDS.inc(waited, service=key[2])
+        # Released once the attempt's outcome is known
+        request.context['rate_limiter_slot'] = concurrency
+
+    def _after_attempt(self, key, request_dict, response=None, **kwargs):
+        concurrency = request_dict['context'].pop('rate_limiter_slot', None)
+        if concurrency is None:
+            return None
+        error_code = (response[1] or {}).get('Error', {}).get('Code') if response is not None else None
+        if concurrency.release(throttled=error_code in THROTTLE_ERROR_CODES):
+            CONCURRENCY_DECREASES.inc(service=key[2])
+            logger.warning(f"{key[2]} throttled in {key[1]}, concurrency limit cut to {int(concurrency.limit)}")
+        return None
+
+    @staticmethod
+    def _after_call_error(context, **kwargs):
+        # An attempt that failed before botocore looked at retrying still holds its slot
+        concurrency = context.pop('rate_limiter_slot', None)
+        if concurrency is not None:
+            concurrency.release(throttled=False)
+
+    def attach(self, client, service_name, aws_access_key_id, region):
+        """
+        Route a client's attempts through the limiter for its credentials, region and service
+
+        Args:
+            client: botocore client
+            service_name: AWS service name of the client
+            aws_access_key_id: Access key the client signs with
+            region: Region of the client
+        """
+        key = (aws_access_key_id, region, service_name)
+        # request-created and needs-retry are emitted for every attempt, retries included
+        client.meta.events.register(
+            'request-created', lambda **kwargs: self._before_attempt(key, **kwargs), unique_id='rate-limiter-acquire'
+        )
+        client.meta.events.register(
+            'needs-retry', lambda **kwargs: self._after_attempt(key, **kwargs), unique_id='rate-limiter-release'
+        )
+        client.meta.events.register('after-call-error', self._after_call_error, unique_id='rate-limiter-error')
+
+    def stats(self):
+        """
+        Get the current limits
+
+        Returns:
+            list: Rate, concurrency limit and calls in flight per key, without access keys
+        """
+        with self._lock:
+            limits = dict(self._limits)
+        return [
+            {
+                'region': region,
+                'service': service_name,
+                'rate': bucket.rate,
+                'concurrency_limit': int(concurrency.limit),
+                'in_flight': concurrency.in_flight
+            }
+            for (_, region, service_name), (bucket, concurrency) in sorted(limits.items())
+        ]
+
+
+# Shared limiter attached to every pooled client
+aws_rate_limiter = AWSRateLimiter(
+    rates=Config.AWS_RATE_LIMITS,
+    default_rate=Config.AWS_RATE_LIMIT_DEFAULT,
+    burst_seconds=Config.AWS_RATE_LIMIT_BURST_SECONDS,
+    initial_concurrency=Config.AWS_ADAPTIVE_CONCURRENCY_INITIAL,
+    min_concurrency=Config.AWS_ADAPTIVE_CONCURRENCY_MIN,
+    max_concurrency=Config.AWS_ADAPTIVE_CONCURRENCY_MAX
+)
@@ -0,0 +1,225 @@
+# app/utils/session_store.py
+import logging
+import secrets
+import threading
+import time
+
+from app.config.config import Config
+from app.utils.credential_cache import assumed_role_credentials
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class Session:
+    """Credentials, verified identity and service objects for one login"""
+
+    def __init__(self, session_id, aws_access_key_id, aws_secret_access_key, aws_region, caller_identity, expires_at,
+                 role_arns=()):
+        self.id = session_id
+        self.expires_at = expires_at
+        self.caller_identity = caller_identity
+        # Roles assumed in other accounts for multi-account views
+        self.role_arns = list(role_arns)
+
+        # Same keys the JWT payload used to carry, so callers can keep using it
+        # for cache keys and credentials
+        self.payload = {
+            'session_id': session_id,
+            'aws_access_key_id': aws_access_key_id,
+            'aws_secret_access_key': aws_secret_access_key,
+            'aws_region': aws_region,
+            'account_id': caller_identity.get('Account'),
+            'arn': caller_identity.get('Arn')
+        }
+
+        self._services = {}
+        self._lock = threading.Lock()
+
+    def service(self, service_class, region=None):
+        """
+        Get the session's instance of a service, building it on first use
+
+        Args:
+            service_class: Service class taking (aws_access_key_id,
+                aws_secret_access_key, region)
+            region: AWS region (default: the session's region)
+
+        Returns:
+            The service instance shared by every request of this session
+        """
+        region = region or self.payload['aws_region']
+        with self._lock:
+            instance = self._services.get((service_class, region))
+            if instance is None:
+                instance = service_class(
+                    aws_access_key_id=self.payload['aws_access_key_id'],
+                    aws_secret_access_key=self.payload['aws_secret_access_key'],
+                    region=region
+                )
+                self._services[(service_class, region)] = instance
+            return instance
+
+    def account_credentials(self, role_arn):
+        """
+        Get temporary credentials for one of the session's roles
+
+        Args:
+            role_arn: ARN of the role to assume
+
+        Returns:
+            dict: aws_access_key_id, aws_secret_access_key and aws_session_token
+
+        Raises:
+            botocore.exceptions.ClientError: If the role cannot be assumed
+        """
+        return assumed_role_credentials.get(
+            self.payload['aws_access_key_id'],
+            self.payload['aws_secret_access_key'],
+            role_arn,
+            self.payload['aws_region'],
+            retain_until=self.expires_at
+        )
+
+    def account_service(self, service_class, role_arn, region=None):
+        """
+        Get the session's instance of a service for another account
+
+        The instance is rebuilt whenever the role's credentials have been
+        refreshed, so it never holds on to expired credentials.
+
+        Args:
+            service_class: Service class taking (aws_access_key_id,
+                aws_secret_access_key, region, aws_session_token)
+            role_arn: ARN of the role to assume, or None for the session's own account
+            region: AWS region (default: the session's region)
+
+        Returns:
+            The service instance for the account
+
+        Raises:
+            botocore.exceptions.ClientError: If the role cannot be assumed
+        """
+        if role_arn is None:
+            return self.service(service_class, region)
+
+        region = region or self.payload['aws_region']
+        credentials = self.account_credentials(role_arn)
+        with self._lock:
+            access_key, instance = self._services.get((service_class, region, role_arn), (None, None))
+            if instance is None or access_key != credentials['aws_access_key_id']:
+                instance = service_class(region=region, **credentials)
+                self._services[(service_class, region, role_arn)] = (credentials['aws_access_key_id'], instance)
+            return instance
+
+
+class SessionStore:
+    """
+    In-process store of logged-in sessions.
+
+    Tokens only carry an opaque session ID; the AWS credentials stay on the
+    server. A session expires together with its token, after ttl_seconds, and
+    expired sessions are evicted as they are looked up and on every login.
+    """
+
+    def __init__(self, ttl_seconds):
+        """
+        Initialize the session store
+
+        Args:
+            ttl_seconds: Lifetime of a session, in seconds
+        """
+        self.ttl_seconds = ttl_seconds
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self, aws_access_key_id, aws_secret_access_key, aws_region, caller_identity, prebuild=(),
+               role_arns=()):
+        """
+        Create a session for verified credentials
+
+        Args:
+            aws_access_key_id: AWS access key ID
+            aws_secret_access_key: AWS secret access key
+            aws_region: AWS region
+            caller_identity: Result of sts get_caller_identity for the credentials
+            prebuild: Service classes to build right away, so the first request
+                does not pay for client construction
+            role_arns: ARNs of roles in other accounts covered by the session
+
+        Returns:
+            Session: The new session
+        """
+        session = Session(
+            secrets.token_urlsafe(32),
+            aws_access_key_id,
+            aws_secret_access_key,
+            aws_region,
+            caller_identity,
+            time.time() + self.ttl_seconds,
+            role_arns=role_arns
+        )
+        for service_class in prebuild:
+            session.service(service_class)
+
+        with self._lock:
+            self._evict_expired(time.time())
+            self._sessions[session.id] = session
+
+        logger.info(f"Created session for {aws_access_key_id} in {aws_region}")
+        return session
+
+    def get(self, session_id):
+        """
+        Look up a session
+
+        Args:
+            session_id: ID carried by the token
+
+        Returns:
+            Session: The session, or None if it does not exist or has expired
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and session.expires_at <= time.time():
+                del self._sessions[session_id]
+                session = None
+        return session
+
+    def delete(self, session_id):
+        """End a session"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def has_sessions(self, aws_access_key_id, aws_region):
+        """
+        Check whether any live session uses the given credentials and region
+
+        Args:
+            aws_access_key_id: AWS access key ID
+            aws_region: AWS region
+
+        Returns:
+            bool: True if at least one unexpired session matches
+        """
+        now = time.time()
+        with self._lock:
+            return any(
+                session.expires_at > now
+                and session.payload['aws_access_key_id'] == aws_access_key_id
+                and session.payload['aws_region'] == aws_region
+                for session in self._sessions.values()
+            )
+
+    def _evict_expired(self, now):
+        for session_id in [sid for sid, session in self._sessions.items() if session.expires_at <= now]:
+            del self._sessions[session_id]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+# Shared session store used by AuthUtils
+session_store = SessionStore(ttl_seconds=Config.TOKEN_EXPIRATION_MINUTES * 60)
@@ -0,0 +1,108 @@
+# app/utils/singleflight.py
+import logging
+import threading
+
+from app.utils.prometheus import Counter, registry
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+SINGLEFLIGHT_CALLS = registry.register(Counter(
+    'singleflight_calls_total', 'Computations requested through the singleflight layer, by operation',
+    ('operation',)
+))
+SINGLEFLIGHT_COALESCED = registry.register(Counter(
+    'singleflight_coalesced_total', 'Computations that waited for an identical one already in flight, by operation',
+    ('operation',)
+))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical computations that are in flight at the same time.
+
+    The first caller for a key runs the computation; callers arriving with the
+    same key before it finishes wait for its result instead of starting their
+    own, so ten dashboards opened at once cost one crawl of the account. Nothing
+    is kept once the computation finishes; caching is left to the response cache.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Run func, or wait for the identical call already running
+
+        Args:
+            key: Cache key identifying the computation, see cache_key(); its
+                third element is the operation name used in metrics
+            func: Zero-argument callable computing the value
+
+        Returns:
+            tuple: (value, shared) where shared is True if the value came from
+                another caller's computation
+
+        Raises:
+            Exception: Whatever func raised, in every caller waiting for it
+        """
+        operation = key[2]
+        SINGLEFLIGHT_CALLS.inc(operation=operation)
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if not leader:
+            SINGLEFLIGHT_COALESCED.inc(operation=operation)
+            logger.debug(f"Waiting for {operation} already in flight")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            # Later callers start a new computation rather than reusing this one
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.value, False
+
+    def stats(self):
+        """
+        Get the computations currently in flight
+
+        Returns:
+            dict: Number of computations running and callers waiting on them
+        """
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'waiting': sum(call.waiters for call in self._calls.values())
+            }
+
+
+# Shared by the response cache and the crawler
+singleflight = SingleFlight()
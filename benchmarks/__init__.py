@@ -0,0 +1 @@
+# This file can be left empty to mark the directory as a Python package
@@ -0,0 +1,125 @@
+# benchmarks/bench_async_views.py
+"""
+Load test comparing async and synchronous route handlers.
+
+Runs the app on a local threaded server and sends concurrent requests to
+GET /api/v1/dashboard/overview, first with ASYNC_VIEWS_ENABLED off (service
+calls run one after another, as in the synchronous handlers) and then on
+(independent calls are awaited concurrently). AWS is replaced by a stub that
+answers every API call after a fixed latency, so no credentials or network
+access are needed.
+
+Usage:
+    python -m benchmarks.bench_async_views [clients] [requests_per_client] [latency_ms]
+"""
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest import mock
+
+import requests
+from botocore.client import BaseClient
+from werkzeug.serving import make_server
+
+from app import create_app
+from app.config.config import Config
+from app.utils.cache import response_cache
+
+ACCESS_KEY = 'AKIABENCHMARK0000000'
+SECRET_KEY = 'benchmark-secret'
+REGION = 'us-west-2'
+
+# Canned responses per API operation; anything else gets an empty response
+RESPONSES = {
+    'GetCallerIdentity': {'Account': '123456789012', 'Arn': 'arn:aws:iam::123456789012:user/benchmark'},
+    'ListBuckets': {'Buckets': [{'Name': f'bucket-{i}', 'CreationDate': datetime(2024, 1, 1)} for i in range(5)]},
+    'GetBucketLocation': {'LocationConstraint': REGION},
+    'ListClusters': {'clusterArns': [f'arn:aws:ecs:{REGION}:123456789012:cluster/cluster-{i}' for i in range(3)]},
+    'DescribeClusters': {'clusters': [
+        {
+            'clusterArn': f'arn:aws:ecs:{REGION}:123456789012:cluster/cluster-{i}',
+            'clusterName': f'cluster-{i}',
+            'status': 'ACTIVE',
+            'runningTasksCount': 0,
+            'pendingTasksCount': 0,
+            'activeServicesCount': 0,
+            'registeredContainerInstancesCount': 0
+        }
+        for i in range(3)
+    ]},
+    'DescribeVolumes': {'Volumes': []}
+}
+
+
+def stub_api_call(latency):
+    """Build a replacement for BaseClient._make_api_call that sleeps, then answers"""
+    def make_api_call(client, operation_name, api_params):
+        time.sleep(latency)
+        return RESPONSES.get(operation_name, {})
+    return make_api_call
+
+
+def run_load(base_url, token, clients, requests_per_client):
+    """Send requests from concurrent clients and collect per-request latency"""
+    def client_loop(_):
+        timings = []
+        with requests.Session() as http:
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                response = http.get(f"{base_url}/api/v1/dashboard/overview", headers={'Authorization': token})
+                response.raise_for_status()
+                timings.append(time.perf_counter() - start)
+        return timings
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        timings = sorted(t for client_timings in pool.map(client_loop, range(clients)) for t in client_timings)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'requests_per_second': len(timings) / elapsed,
+        'p50_ms': timings[len(timings) // 2] * 1000,
+        'p95_ms': timings[int(len(timings) * 0.95) - 1] * 1000
+    }
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    requests_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    latency = (int(sys.argv[3]) if len(sys.argv) > 3 else 50) / 1000
+
+    # Keep the per-call debug logging out of the measurements
+    logging.disable(logging.WARNING)
+
+    app = create_app()
+    app.config['JWT_SECRET_KEY'] = app.config['JWT_SECRET_KEY'] or 'benchmark-jwt-secret'
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    results = {}
+    with mock.patch.object(BaseClient, '_make_api_call', stub_api_call(latency)):
+        token = requests.post(f"{base_url}/api/v1/auth/login", json={
+            'aws_access_key_id': ACCESS_KEY,
+            'aws_secret_access_key': SECRET_KEY,
+            'aws_region': REGION
+        }).json()['token']
+
+        for name, enabled in (('sync handlers', False), ('async handlers', True)):
+            Config.ASYNC_VIEWS_ENABLED = enabled
+            response_cache.clear()
+            results[name] = run_load(base_url, token, clients, requests_per_client)
+
+    server.shutdown()
+
+    print(f"{clients} clients x {requests_per_client} requests, {latency * 1000:.0f}ms per AWS call")
+    print(f"{'scenario':<16} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<16} {stats['requests_per_second']:>10.2f} {stats['p50_ms']:>10.1f} {stats['p95_ms']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_client_pool.py
+"""
+Measure the per-request cost of building AWS service objects.
+
+Compares constructing fresh boto3 clients on every request (the old behaviour
+of the service classes) with fetching them from the shared client pool.
+No AWS calls are made, so dummy credentials are fine.
+
+Usage:
+    python -m benchmarks.bench_client_pool [iterations]
+"""
+import sys
+import time
+
+import boto3
+
+from app.services.s3_service import S3Service
+from app.services.ecs_service import ECSService
+from app.services.ebs_service import EBSService
+from app.utils.client_pool import client_pool
+
+ACCESS_KEY = 'AKIABENCHMARK0000000'
+SECRET_KEY = 'benchmark-secret'
+REGION = 'us-west-2'
+
+
+def fresh_clients():
+    """Build every client a dashboard request needs, without pooling"""
+    kwargs = {
+        'aws_access_key_id': ACCESS_KEY,
+        'aws_secret_access_key': SECRET_KEY,
+        'region_name': REGION
+    }
+    boto3.client('s3', **kwargs)
+    boto3.resource('s3', **kwargs)
+    boto3.client('ecs', **kwargs)
+    boto3.client('ec2', **kwargs)
+    boto3.client('cloudwatch', **kwargs)
+
+
+def pooled_services():
+    """Build every service a dashboard request needs, using the shared pool"""
+    S3Service(ACCESS_KEY, SECRET_KEY, REGION)
+    ECSService(ACCESS_KEY, SECRET_KEY, REGION)
+    EBSService(ACCESS_KEY, SECRET_KEY, REGION)
+
+
+def measure(func, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        'mean_ms': sum(timings) / len(timings) * 1000,
+        'p50_ms': timings[len(timings) // 2] * 1000,
+        'max_ms': timings[-1] * 1000
+    }
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    # Warm up the default session so both runs start with loaded models
+    fresh_clients()
+
+    results = {
+        'fresh clients per request': measure(fresh_clients, iterations),
+        'pooled clients per request': measure(pooled_services, iterations)
+    }
+
+    print(f"{'scenario':<28} {'mean ms':>10} {'p50 ms':>10} {'max ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<28} {stats['mean_ms']:>10.3f} {stats['p50_ms']:>10.3f} {stats['max_ms']:>10.3f}")
+    print(f"pool stats: {client_pool.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+# benchmarks/bench_rate_limiter.py
+"""
+Load test of the shared AWS rate limiter under concurrent requests.
+
+Many threads call ECSService.list_clusters in a loop, as concurrent dashboard
+refreshes would, against a simulated ECS endpoint that enforces its own token
+bucket and answers ThrottlingException when it is exceeded, like AWS does. The
+simulation answers from botocore's before-send event, so every attempt goes
+through signing, the rate limiter and botocore's retry handling exactly as a
+real call would; only the HTTP round trip is replaced.
+
+The run is repeated with the limiter disabled and enabled, reporting the rate
+of successful calls, the throttling errors the endpoint returned, and calls
+that failed after botocore gave up retrying.
+
+Usage:
+    python -m benchmarks.bench_rate_limiter [threads] [seconds] [server_rate] [latency_ms]
+"""
+import json
+import logging
+import sys
+import threading
+import time
+
+from botocore.awsrequest import AWSResponse
+
+from app.config.config import Config
+from app.services.ecs_service import ECSService
+from app.utils.client_pool import client_pool
+from app.utils.rate_limiter import aws_rate_limiter
+
+SECRET_KEY = 'benchmark-secret'
+REGION = 'us-west-2'
+CLUSTER_ARNS = [f'arn:aws:ecs:{REGION}:123456789012:cluster/bench-{i}' for i in range(3)]
+
+
+class _Body:
+    """Minimal stand-in for the urllib3 response botocore reads bodies from"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def stream(self, **kwargs):
+        yield self.data
+
+
+class ThrottlingECSEndpoint:
+    """Simulated ECS endpoint that throttles above rate requests per second"""
+
+    def __init__(self, rate, burst, latency):
+        self.latency = latency
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.throttled = 0
+
+    def _admit(self):
+        # Like AWS, reject instead of waiting when the bucket is empty
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.accepted += 1
+                return True
+            self.throttled += 1
+            return False
+
+    def handle(self, request, **kwargs):
+        time.sleep(self.latency)
+        headers = {'x-amzn-requestid': 'benchmark', 'content-type': 'application/x-amz-json-1.1'}
+        if not self._admit():
+            body = {'__type': 'ThrottlingException', 'message': 'Rate exceeded'}
+            return AWSResponse(request.url, 400, headers, _Body(json.dumps(body).encode('utf-8')))
+
+        operation = request.headers.get('X-Amz-Target', b'')
+        operation = operation.decode('utf-8') if isinstance(operation, bytes) else operation
+        if operation.endswith('ListClusters'):
+            body = {'clusterArns': CLUSTER_ARNS}
+        elif operation.endswith('DescribeClusters'):
+            body = {'clusters': [
+                {'clusterArn': arn, 'clusterName': arn.split('/')[-1], 'status': 'ACTIVE'} for arn in CLUSTER_ARNS
+            ], 'failures': []}
+        else:
+            body = {}
+        return AWSResponse(request.url, 200, headers, _Body(json.dumps(body).encode('utf-8')))
+
+
+def run_load(access_key, threads, seconds):
+    """Call list_clusters from many threads for a fixed time"""
+    service = ECSService(access_key, SECRET_KEY, REGION)
+    deadline = time.monotonic() + seconds
+    lock = threading.Lock()
+    timings = []
+    failures = []
+
+    def worker():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            result = service.list_clusters()
+            elapsed = time.perf_counter() - start
+            with lock:
+                if 'error' in result:
+                    failures.append(result['error'])
+                else:
+                    timings.append(elapsed)
+
+    start = time.monotonic()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    timings.sort()
+    return {
+        'successful_per_second': len(timings) / elapsed,
+        'failed': len(failures),
+        'p50_ms': timings[len(timings) // 2] * 1000 if timings else float('nan'),
+        'p95_ms': timings[int(len(timings) * 0.95) - 1] * 1000 if timings else float('nan')
+    }
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    server_rate = float(sys.argv[3]) if len(sys.argv) > 3 else Config.AWS_RATE_LIMITS['ecs']
+    latency = (float(sys.argv[4]) if len(sys.argv) > 4 else 20) / 1000
+
+    # Keep the per-call logging out of the measurements
+    logging.disable(logging.CRITICAL)
+
+    client_pool.add_client_hook(aws_rate_limiter.attach)
+
+    results = {}
+    for run, (name, enabled) in enumerate((('limiter off', False), ('limiter on', True))):
+        endpoint = ThrottlingECSEndpoint(server_rate, server_rate * 2, latency)
+        client_pool.register_event_handler('before-send', endpoint.handle, 'bench-rate-limiter')
+        aws_rate_limiter.enabled = enabled
+        try:
+            # A new access key per run starts from fresh limiter state
+            stats = run_load(f'AKIABENCHRATE{run:07d}', threads, seconds)
+        finally:
+            client_pool.unregister_event_handler('before-send', 'bench-rate-limiter')
+        stats['aws_accepted_per_second'] = endpoint.accepted / seconds
+        stats['aws_throttled'] = endpoint.throttled
+        results[name] = stats
+
+    print(f"{threads} threads for {seconds:.0f}s, endpoint allows {server_rate:.0f} calls/s, "
+          f"{latency * 1000:.0f}ms per call")
+    print(f"{'scenario':<12} {'ok/s':>8} {'aws ok/s':>9} {'throttled':>10} {'failed':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, stats in results.items():
+        print(f"{name:<12} {stats['successful_per_second']:>8.2f} {stats['aws_accepted_per_second']:>9.2f} "
+              f"{stats['aws_throttled']:>10} {stats['failed']:>8} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f}")
+    print(f"limiter state: {aws_rate_limiter.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,478 @@
+# benchmarks/bench_service_scale.py
+"""
+Synthetic-scale benchmark for the service layer.
+
+Builds synthetic accounts with 10, 1,000 and 10,000 S3 buckets, EBS volumes
+and ECS services and measures S3Service, ECSService, EBSService and
+DashboardService against them. AWS is replaced by an in-process stand-in
+registered on the shared client pool's botocore events: requests go through
+parameter validation and the event hooks like real calls, but are answered
+from the synthetic account, with pagination, instead of being sent over HTTP.
+
+For every endpoint and scale the benchmark reports wall time, the number of
+AWS API calls per operation and peak traced memory. Wall time and call counts
+come from one run; peak memory from a second run under tracemalloc, which
+would otherwise distort the timings. Every run starts with empty caches.
+
+Results are written as JSON (by default to benchmarks/results/, named after
+the current commit) so runs can be compared between commits with --compare.
+
+Usage:
+    python -m benchmarks.bench_service_scale [--scales 10,1000,10000] [--latency-ms 0]
+        [--output FILE] [--compare BASELINE_FILE] [--no-memory]
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+
+from botocore.awsrequest import AWSResponse
+
+from app.config.config import Config
+from app.services.dashboard_service import DashboardService
+from app.services.ebs_service import EBSService
+from app.services.ecs_service import ECSService
+from app.services.s3_service import S3Service
+from app.utils.cache import response_cache
+from app.utils.client_pool import client_pool
+
+REGION = 'us-west-2'
+ACCOUNT_ID = '123456789012'
+SECRET_KEY = 'benchmark-secret'
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# ECS services are spread over clusters of at most this many services
+SERVICES_PER_CLUSTER = 1000
+# Objects listed per bucket when sizes come from listing
+OBJECTS_PER_BUCKET = 20
+
+# Page sizes of the stand-in, matching the AWS maximums
+LIST_METRICS_PAGE_SIZE = 500
+LIST_CLUSTERS_PAGE_SIZE = 100
+LIST_SERVICES_PAGE_SIZE = 100
+LIST_OBJECTS_PAGE_SIZE = 1000
+
+
+class SyntheticAccount:
+    """Deterministic S3, EC2 and ECS inventory of a given size"""
+
+    def __init__(self, size):
+        self.size = size
+        creation_date = datetime(2024, 1, 1)
+
+        self.buckets = [{'Name': f'bench-bucket-{i:05d}', 'CreationDate': creation_date} for i in range(size)]
+        self.bucket_index = {bucket['Name']: i for i, bucket in enumerate(self.buckets)}
+
+        self.volumes = [
+            {
+                'VolumeId': f'vol-{i:017x}',
+                'Size': 8 + i % 500,
+                'VolumeType': ('gp3', 'gp2', 'io2')[i % 3],
+                'State': 'in-use' if i % 4 else 'available',
+                'Iops': 3000,
+                'Throughput': 125,
+                'AvailabilityZone': f'{REGION}{"abc"[i % 3]}',
+                'Encrypted': i % 5 != 0,
+                'Attachments': [{'InstanceId': f'i-{i:017x}', 'Device': '/dev/xvda'}] if i % 4 else []
+            }
+            for i in range(size)
+        ]
+
+        cluster_count = max(1, -(-size // SERVICES_PER_CLUSTER))
+        self.clusters = {}
+        for c in range(cluster_count):
+            arn = f'arn:aws:ecs:{REGION}:{ACCOUNT_ID}:cluster/bench-cluster-{c:03d}'
+            services = [
+                {
+                    'serviceName': f'bench-service-{s:05d}',
+                    'serviceArn': f'arn:aws:ecs:{REGION}:{ACCOUNT_ID}:service/bench-cluster-{c:03d}/bench-service-{s:05d}',
+                    'status': 'ACTIVE',
+                    'desiredCount': 2,
+                    # Every tenth service is short of tasks
+                    'runningCount': 1 if s % 10 == 0 else 2,
+                    'pendingCount': 0,
+                    'deployments': [{'status': 'PRIMARY'}]
+                }
+                for s in range(c, size, cluster_count)
+            ]
+            self.clusters[arn] = {
+                'cluster': {
+                    'clusterArn': arn,
+                    'clusterName': f'bench-cluster-{c:03d}',
+                    'status': 'ACTIVE',
+                    'registeredContainerInstancesCount': 0,
+                    'runningTasksCount': sum(service['runningCount'] for service in services),
+                    'pendingTasksCount': 0,
+                    'activeServicesCount': len(services)
+                },
+                'services': services,
+                'service_index': {service['serviceArn']: service for service in services}
+            }
+
+        # CloudWatch storage metrics: size and object count for every bucket
+        self.metrics = {
+            'BucketSizeBytes': [
+                {'Namespace': 'AWS/S3', 'MetricName': 'BucketSizeBytes', 'Dimensions': [
+                    {'Name': 'BucketName', 'Value': bucket['Name']},
+                    {'Name': 'StorageType', 'Value': 'StandardStorage'}
+                ]}
+                for bucket in self.buckets
+            ],
+            'NumberOfObjects': [
+                {'Namespace': 'AWS/S3', 'MetricName': 'NumberOfObjects', 'Dimensions': [
+                    {'Name': 'BucketName', 'Value': bucket['Name']},
+                    {'Name': 'StorageType', 'Value': 'AllStorageTypes'}
+                ]}
+                for bucket in self.buckets
+            ]
+        }
+
+    def cluster(self, name_or_arn):
+        if name_or_arn in self.clusters:
+            return self.clusters[name_or_arn]
+        arn = f'arn:aws:ecs:{REGION}:{ACCOUNT_ID}:cluster/{name_or_arn}'
+        return self.clusters.get(arn)
+
+
+def _page(items, token, page_size):
+    """Slice one page out of items; tokens are plain offsets"""
+    start = int(token or 0)
+    end = start + page_size
+    return items[start:end], (str(end) if end < len(items) else None)
+
+
+def _error(code, message, status_code=400):
+    return status_code, {'Error': {'Code': code, 'Message': message}}
+
+
+class FakeAWS:
+    """
+    In-process stand-in for the AWS APIs used by the service layer
+
+    Hooks into botocore's before-parameter-build and before-call events, the
+    same mechanism as botocore.stub.Stubber, but answers from a synthetic
+    account so calls may arrive in any order and from any thread.
+    """
+
+    def __init__(self, account, latency=0.0):
+        self.account = account
+        self.latency = latency
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def install(self):
+        # Unique IDs are global to an emitter, so each event needs its own
+        client_pool.register_event_handler('before-parameter-build', self._capture_params, 'bench-scale-params')
+        client_pool.register_event_handler('before-call', self._respond, 'bench-scale-respond')
+
+    def uninstall(self):
+        client_pool.unregister_event_handler('before-parameter-build', 'bench-scale-params')
+        client_pool.unregister_event_handler('before-call', 'bench-scale-respond')
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls = Counter()
+
+    @staticmethod
+    def _capture_params(params, context, **kwargs):
+        # before-call only sees the serialized request, so keep the API parameters
+        context['bench_params'] = dict(params)
+
+    def _respond(self, model, context, **kwargs):
+        service = model.service_model.service_name
+        operation = model.name
+        with self._lock:
+            self.calls[f'{service}.{operation}'] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        handler = getattr(self, f'_{service}_{operation}', None)
+        if handler is None:
+            status_code, parsed = 200, {}
+        else:
+            result = handler(context.get('bench_params', {}))
+            status_code, parsed = result if isinstance(result, tuple) else (200, result)
+        parsed.setdefault('ResponseMetadata', {'HTTPStatusCode': status_code})
+        return AWSResponse(None, status_code, {}, None), parsed
+
+    # STS and EC2
+
+    def _sts_GetCallerIdentity(self, params):
+        return {'Account': ACCOUNT_ID, 'Arn': f'arn:aws:iam::{ACCOUNT_ID}:user/benchmark'}
+
+    def _ec2_DescribeVolumes(self, params):
+        if 'MaxResults' not in params:
+            # Without MaxResults EC2 returns every volume at once
+            return {'Volumes': self.account.volumes}
+        volumes, token = _page(self.account.volumes, params.get('NextToken'), params['MaxResults'])
+        return {'Volumes': volumes, 'NextToken': token} if token else {'Volumes': volumes}
+
+    # S3
+
+    def _s3_ListBuckets(self, params):
+        return {'Buckets': self.account.buckets, 'Owner': {'ID': 'owner'}}
+
+    def _s3_GetBucketLocation(self, params):
+        return {'LocationConstraint': REGION}
+
+    def _s3_GetBucketVersioning(self, params):
+        index = self.account.bucket_index.get(params.get('Bucket'), 0)
+        return {'Status': 'Enabled'} if index % 2 else {}
+
+    def _s3_GetPublicAccessBlock(self, params):
+        return {'PublicAccessBlockConfiguration': {
+            'BlockPublicAcls': True, 'IgnorePublicAcls': True,
+            'BlockPublicPolicy': True, 'RestrictPublicBuckets': True
+        }}
+
+    def _s3_GetBucketEncryption(self, params):
+        index = self.account.bucket_index.get(params.get('Bucket'), 0)
+        if index % 3 == 0:
+            return _error('ServerSideEncryptionConfigurationNotFoundError', 'No encryption', 404)
+        return {'ServerSideEncryptionConfiguration': {
+            'Rules': [{'ApplyServerSideEncryptionByDefault': {'SSEAlgorithm': 'AES256'}}]
+        }}
+
+    def _s3_GetBucketLifecycleConfiguration(self, params):
+        return _error('NoSuchLifecycleConfiguration', 'No lifecycle configuration', 404)
+
+    def _s3_ListObjectsV2(self, params):
+        objects = [
+            {'Key': f'object-{i:04d}', 'Size': 1024 * (i + 1), 'StorageClass': 'STANDARD'}
+            for i in range(OBJECTS_PER_BUCKET)
+        ]
+        page, token = _page(objects, params.get('ContinuationToken'), params.get('MaxKeys', LIST_OBJECTS_PAGE_SIZE))
+        response = {'Contents': page, 'KeyCount': len(page), 'IsTruncated': token is not None}
+        if token:
+            response['NextContinuationToken'] = token
+        return response
+
+    # CloudWatch
+
+    def _cloudwatch_ListMetrics(self, params):
+        metrics = self.account.metrics.get(params.get('MetricName'), [])
+        page, token = _page(metrics, params.get('NextToken'), LIST_METRICS_PAGE_SIZE)
+        return {'Metrics': page, 'NextToken': token} if token else {'Metrics': page}
+
+    def _cloudwatch_GetMetricData(self, params):
+        results = []
+        for query in params.get('MetricDataQueries', []):
+            metric = query['MetricStat']['Metric']
+            dimensions = {dimension['Name']: dimension['Value'] for dimension in metric['Dimensions']}
+            if 'BucketName' in dimensions:
+                index = self.account.bucket_index.get(dimensions['BucketName'], 0)
+                value = float(1000 + index) if metric['MetricName'] == 'NumberOfObjects' else float(1024 ** 2 * (index + 1))
+            else:
+                value = 1.0
+            results.append({
+                'Id': query['Id'],
+                'Timestamps': [datetime.utcnow() - timedelta(days=1)],
+                'Values': [value],
+                'StatusCode': 'Complete'
+            })
+        return {'MetricDataResults': results}
+
+    # ECS
+
+    def _ecs_ListClusters(self, params):
+        arns, token = _page(list(self.account.clusters), params.get('nextToken'),
+                            params.get('maxResults', LIST_CLUSTERS_PAGE_SIZE))
+        return {'clusterArns': arns, 'nextToken': token} if token else {'clusterArns': arns}
+
+    def _ecs_DescribeClusters(self, params):
+        clusters = [self.account.cluster(name) for name in params.get('clusters', [])]
+        return {'clusters': [entry['cluster'] for entry in clusters if entry], 'failures': []}
+
+    def _ecs_ListServices(self, params):
+        cluster = self.account.cluster(params.get('cluster', 'default'))
+        if cluster is None:
+            return _error('ClusterNotFoundException', 'Cluster not found.')
+        arns, token = _page([service['serviceArn'] for service in cluster['services']], params.get('nextToken'),
+                            params.get('maxResults', LIST_SERVICES_PAGE_SIZE))
+        return {'serviceArns': arns, 'nextToken': token} if token else {'serviceArns': arns}
+
+    def _ecs_DescribeServices(self, params):
+        cluster = self.account.cluster(params.get('cluster', 'default'))
+        if cluster is None:
+            return _error('ClusterNotFoundException', 'Cluster not found.')
+        services = [cluster['service_index'][arn] for arn in params.get('services', []) if arn in cluster['service_index']]
+        return {'services': services, 'failures': []}
+
+
+def endpoints(account):
+    """
+    Service-layer endpoints to measure
+
+    Each entry maps a name to a function taking fresh credentials and returning
+    a zero-argument callable; services are built before the clock starts.
+    """
+    first_bucket = account.buckets[0]['Name']
+    largest_cluster = max(account.clusters, key=lambda arn: len(account.clusters[arn]['services']))
+
+    def bind(service_class, method, *args):
+        def build(access_key):
+            service = service_class(access_key, SECRET_KEY, REGION)
+            return lambda: getattr(service, method)(*args)
+        return build
+
+    return {
+        's3.list_buckets': bind(S3Service, 'list_buckets'),
+        's3.get_bucket_details': bind(S3Service, 'get_bucket_details', first_bucket),
+        'ecs.list_clusters': bind(ECSService, 'list_clusters'),
+        'ecs.list_services': bind(ECSService, 'list_services', largest_cluster),
+        'ebs.list_volumes': bind(EBSService, 'list_volumes'),
+        'dashboard.summary': bind(DashboardService, 'get_summary')
+    }
+
+
+_run_ids = itertools.count()
+
+
+def fresh_access_key():
+    """A new access key per run keeps every credential-scoped cache cold"""
+    return f'AKIABENCH{next(_run_ids):011d}'
+
+
+def describe_outcome(result):
+    """Summarize what an endpoint returned, so broken runs stand out"""
+    if isinstance(result, dict) and 'error' in result:
+        return {'error': result['error']}
+    outcome = {}
+    if isinstance(result, dict):
+        for key in ('buckets', 'volumes', 'clusters', 'services'):
+            if isinstance(result.get(key), list):
+                outcome[f'{key}_returned'] = len(result[key])
+        if 'sections' in result:
+            outcome['sections'] = {name: section['status'] for name, section in result['sections'].items()}
+    return outcome
+
+
+def measure(fake, build, measure_memory):
+    """Run one endpoint with cold caches, then again under tracemalloc"""
+    response_cache.clear()
+    call = build(fresh_access_key())
+    fake.reset_calls()
+    start = time.perf_counter()
+    result = call()
+    wall_ms = (time.perf_counter() - start) * 1000
+    stats = {
+        'wall_ms': round(wall_ms, 1),
+        'aws_calls': dict(sorted(fake.calls.items())),
+        'aws_calls_total': sum(fake.calls.values()),
+        'outcome': describe_outcome(result)
+    }
+
+    if measure_memory:
+        response_cache.clear()
+        call = build(fresh_access_key())
+        del result
+        tracemalloc.start()
+        try:
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        stats['peak_memory_kib'] = round(peak / 1024, 1)
+
+    return stats
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results, baseline):
+    """Print the change of wall time, call count and peak memory against a baseline run"""
+    print(f"\nCompared with {baseline.get('commit', '?')} ({baseline.get('created_at', '?')})")
+    print(f"{'scale':>6} {'endpoint':<24} {'wall':>10} {'calls':>10} {'memory':>10}")
+    for scale, scale_results in results['scales'].items():
+        for name, stats in scale_results.items():
+            before = baseline.get('scales', {}).get(scale, {}).get(name)
+            if before is None:
+                continue
+
+            def delta(metric):
+                if metric not in stats or not before.get(metric):
+                    return 'n/a'
+                return f"{(stats[metric] - before[metric]) / before[metric] * 100:+.1f}%"
+
+            print(f"{scale:>6} {name:<24} {delta('wall_ms'):>10} {delta('aws_calls_total'):>10} "
+                  f"{delta('peak_memory_kib'):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', default='10,1000,10000',
+                        help='Comma-separated numbers of buckets, volumes and services')
+    parser.add_argument('--latency-ms', type=float, default=0,
+                        help='Simulated latency of every AWS call')
+    parser.add_argument('--output', help='Where to write the JSON results')
+    parser.add_argument('--compare', help='Earlier JSON results to compare with')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc run')
+    args = parser.parse_args()
+
+    # Keep the per-call logging out of the measurements; errors end up in the results
+    logging.disable(logging.CRITICAL)
+
+    commit = git_commit()
+    results = {
+        'benchmark': 'service_scale',
+        'commit': commit,
+        'created_at': datetime.utcnow().isoformat() + 'Z',
+        'python': platform.python_version(),
+        'settings': {
+            'latency_ms': args.latency_ms,
+            's3_size_source': Config.S3_SIZE_SOURCE,
+            'aws_executor_max_workers': Config.AWS_EXECUTOR_MAX_WORKERS,
+            's3_bucket_concurrency': Config.S3_BUCKET_CONCURRENCY,
+            'ecs_cluster_concurrency': Config.ECS_CLUSTER_CONCURRENCY,
+            'ecs_describe_concurrency': Config.ECS_DESCRIBE_CONCURRENCY
+        },
+        'scales': {}
+    }
+
+    print(f"{'scale':>6} {'endpoint':<24} {'wall ms':>10} {'calls':>8} {'peak KiB':>10}")
+    for scale in (int(value) for value in args.scales.split(',')):
+        account = SyntheticAccount(scale)
+        fake = FakeAWS(account, latency=args.latency_ms / 1000)
+        fake.install()
+        try:
+            scale_results = {}
+            for name, build in endpoints(account).items():
+                stats = measure(fake, build, measure_memory=not args.no_memory)
+                scale_results[name] = stats
+                print(f"{scale:>6} {name:<24} {stats['wall_ms']:>10.1f} {stats['aws_calls_total']:>8} "
+                      f"{stats.get('peak_memory_kib', float('nan')):>10.1f}"
+                      + (f"  {stats['outcome']['error']}" if 'error' in stats['outcome'] else ''))
+            results['scales'][str(scale)] = scale_results
+        finally:
+            fake.uninstall()
+        client_pool.clear()
+
+    output = args.output or os.path.join(RESULTS_DIR, f'service_scale-{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    sys.exit(main())